@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional
 
 from src.dashboardtool.config import DashboardConfig, DEFAULT_CONFIG
 
+if TYPE_CHECKING:  # pragma: no cover - nur für Typprüfungen
+    from src.dashboardtool.autosave import AutosaveScheduler
+
 
 @dataclass(frozen=True)
 class ModuleAction:
@@ -121,12 +126,52 @@ class DashboardModule:
     identifier: str = "base"
     display_name: str = "Basis Modul"
     description: str = "Grundfunktionen"
+    autosave_scheduler: AutosaveScheduler | None = None
+    _dirty: bool = False
+    _render_counter: int = 0
+    render_deadline_seconds: float | None = None
+    """Frist für das Rendern in der App (None = `dashboard_render_deadline_seconds`)."""
 
     def __init__(self, context: Optional[ModuleContext] = None) -> None:
         self.context = context or ModuleContext()
         self.layout_spec = self.context.config.standards
         self.storage_directory = self.context.ensure_storage_dir(self.identifier)
 
+    @property
+    def dirty(self) -> bool:
+        """True, solange Änderungen noch nicht gespeichert sind."""
+
+        return self._dirty
+
+    def mark_dirty(self) -> None:
+        """Merkt ungespeicherte Änderungen vor und meldet sie dem Autosave-Planer."""
+
+        self._dirty = True
+        if self.autosave_scheduler is not None:
+            self.autosave_scheduler.notify_change(self)
+
+    def mark_clean(self) -> None:
+        """Setzt die Markierung nach einem erfolgreichen Speichern zurück."""
+
+        self._dirty = False
+
+    def render_version(self) -> Hashable | None:
+        """Kennung des Darstellungsstands für den Kachel-Cache der App.
+
+        Solange sich der Wert nicht ändert, darf `DashboardApp` die zuletzt
+        gerenderte Kachel wiederverwenden. None (Standard) heißt: Die Kachel
+        hängt von Dingen ab, die das Modul nicht verfolgt, und wird jedes Mal
+        neu erzeugt. Module mit eigenem Zustand liefern z.B. einen Zähler,
+        der bei jeder Änderung steigt (siehe `bump_render_version`).
+        """
+
+        return None
+
+    def bump_render_version(self) -> None:
+        """Meldet, dass sich die Darstellung geändert hat."""
+
+        self._render_counter += 1
+
     def _default_theme(self) -> Dict[str, str]:
         """Wählt ein Basisfarbschema als Fallback."""
 
@@ -139,7 +184,12 @@ class DashboardModule:
         return {}
 
     def render(self) -> Dict[str, Any]:
-        """Erzeugt strukturierte Daten für die GUI-Schicht."""
+        """Erzeugt strukturierte Daten für die GUI-Schicht.
+
+        Darf auch als ``async def`` geschrieben werden (z.B. für entfernte
+        Statusabfragen); `render_dashboard_tile` führt die Koroutine dann in
+        einer eigenen Ereignisschleife aus.
+        """
 
         raise NotImplementedError("Module müssen die render-Methode überschreiben.")
 
@@ -260,7 +310,7 @@ class DashboardModule:
     def render_dashboard_tile(self) -> Dict[str, Any]:
         """Reichert das Render-Ergebnis mit Metadaten an."""
 
-        payload = dict(self.render())
+        payload = dict(self._render_payload())
         validation = self._validate_payload(payload)
         fallback_theme = self._default_theme()
         theme = payload.get("theme")
@@ -291,8 +341,27 @@ class DashboardModule:
             ),
         }
 
+    def _render_payload(self) -> Dict[str, Any]:
+        result = self.render()
+        if not inspect.isawaitable(result):
+            return result
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_await(result))
+        if inspect.iscoroutine(result):
+            result.close()  # Warnung "never awaited" vermeiden
+        raise RuntimeError(
+            f"Modul '{self.identifier}' rendert asynchron, aber es läuft bereits "
+            "eine Ereignisschleife. Bitte dashboard_render_mode='threads' nutzen."
+        )
+
     def autosave(self) -> None:
         """Standard-Autosave, kann überschrieben werden."""
 
         # Hier würde die konkrete Speicherlogik eingebunden werden.
         pass
+
+
+async def _await(awaitable: Any) -> Any:
+    return await awaitable
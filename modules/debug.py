@@ -3,12 +3,130 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+import threading
+import weakref
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Sequence
 
 from modules.base import DashboardModule
-from src.dashboardtool.logging import LOG_LEVELS, LogBuffer
+from src.dashboardtool.logcoalesce import CoalescedSink, LogCoalescer
+from src.dashboardtool.logfiles import (
+    LogFileWriter,
+    LogRotationPolicy,
+    copy_log_history,
+    iter_log_files,
+    iter_log_lines_reversed,
+    list_log_segments,
+    log_created_path,
+    log_index_path,
+    read_log_file,
+    remove_log_segments,
+)
+from src.dashboardtool.loghandler import LogBufferHandler
+from src.dashboardtool.logrates import LogRateAggregator
+from src.dashboardtool.logscan import scan_time_range
+from src.dashboardtool.logsearch import LogSearchIndex, scan_entries
+from src.dashboardtool.logging import (
+    LOG_FILE_FORMATS,
+    LOG_LEVELS,
+    BaseLogBuffer,
+    BinaryLogEncoder,
+    LogEntry,
+    LogIngestor,
+    binary_log_complete_length,
+    create_log_buffer,
+    decode_binary_log,
+    level_severity,
+)
+
+_LOG_FILE_NAMES = {"jsonl": "debug.log", "binary": "debug.logb"}
+
+
+def _parse_moment(value: datetime | str | None) -> datetime | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError as exc:
+            raise ValueError(
+                "Ungültiger Zeitpunkt. Erwartet wird ISO-Format, "
+                "z.B. 2024-05-01T14:02:00"
+            ) from exc
+    if value.tzinfo is not None:
+        # Logeinträge tragen UTC ohne Zeitzonenangabe.
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _in_range(moment: datetime, low: datetime | None, high: datetime | None) -> bool:
+    return (low is None or moment >= low) and (high is None or moment <= high)
+
+
+def _entry_sink(
+    writer: LogFileWriter, encoder: BinaryLogEncoder | None
+) -> Callable[[LogEntry], None]:
+    """Schreibfunktion für Einträge im gewählten Dateiformat.
+
+    Hält bewusst keinen Verweis auf das Modul, damit der Aufnahme-Thread es
+    nicht am Leben hält.
+    """
+
+    if encoder is None:
+        return lambda entry: writer.write(entry.json_line)
+    lock = threading.Lock()
+
+    def write_binary(entry: LogEntry) -> None:
+        # Kodieren und Einreihen gemeinsam sperren, damit eine neue Quelle
+        # in der Datei vor ihrer ersten Verwendung steht.
+        with lock:
+            writer.write(encoder.encode(entry))
+
+    return write_binary
+
+
+def _coalesced_sink(
+    buffer: BaseLogBuffer,
+    ingestor: LogIngestor | None,
+    write_entry: Callable[[LogEntry], None],
+) -> CoalescedSink:
+    """Ziel des Coalescers: überträgt eine (zusammengefasste) Meldung.
+
+    Hält wie `_entry_sink` keinen Verweis auf das Modul, damit der
+    Finalizer des Coalescers es nicht am Leben hält.
+    """
+
+    def append(
+        message: str,
+        *,
+        level: str,
+        source: str,
+        timestamp: datetime,
+        repeat_count: int = 1,
+        first_timestamp: datetime | None = None,
+    ) -> None:
+        if ingestor is not None:
+            ingestor.submit(
+                message,
+                level=level,
+                source=source,
+                timestamp=timestamp,
+                repeat_count=repeat_count,
+                first_timestamp=first_timestamp,
+            )
+            return
+        entry = buffer.add(
+            message,
+            level=level,
+            source=source,
+            timestamp=timestamp,
+            repeat_count=repeat_count,
+            first_timestamp=first_timestamp,
+        )
+        write_entry(entry)
+
+    return append
 
 
 class DebugModule(DashboardModule):
@@ -19,46 +137,134 @@ class DebugModule(DashboardModule):
     def __init__(
         self,
         *,
-        buffer: LogBuffer | None = None,
+        buffer: BaseLogBuffer | None = None,
         max_entries: int = 250,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
         self.buffer = (
-            buffer if buffer is not None else LogBuffer(max_entries=max_entries)
+            buffer
+            if buffer is not None
+            else create_log_buffer(
+                max_entries=max_entries, layout=self.context.config.log_buffer_layout
+            )
+        )
+        config = self.context.config
+        self.search_index = (
+            LogSearchIndex(self.buffer) if config.log_search_index else None
+        )
+        self.rate_aggregator = (
+            LogRateAggregator(self.buffer) if config.log_rate_aggregates else None
+        )
+        self.theme = config.get_theme("monochrome")
+        if config.log_file_format not in LOG_FILE_FORMATS:
+            raise ValueError(
+                "Unbekanntes Logdateiformat. Erlaubt sind: "
+                + ", ".join(LOG_FILE_FORMATS)
+            )
+        self.log_format = config.log_file_format
+        self.log_file: Path = self.context.ensure_log_file(
+            _LOG_FILE_NAMES[self.log_format]
         )
-        self.theme = self.context.config.get_theme("monochrome")
-        self.log_file: Path = self.context.ensure_log_file("debug.log")
+        encoder = BinaryLogEncoder() if self.log_format == "binary" else None
+        self.writer = LogFileWriter(
+            self.log_file,
+            max_batch_lines=config.log_batch_max_lines,
+            max_batch_bytes=config.log_batch_max_bytes,
+            max_delay_seconds=config.log_batch_max_delay_seconds,
+            durability=config.log_durability,
+            rotation=LogRotationPolicy(
+                max_bytes=config.log_rotation_max_bytes,
+                max_segments=config.log_rotation_max_segments,
+                max_age_seconds=config.log_rotation_max_age_seconds,
+                compress=config.log_rotation_compress,
+            ),
+            preamble=encoder.preamble if encoder is not None else None,
+            complete_length=(
+                binary_log_complete_length if encoder is not None else None
+            ),
+        )
+        self._write_entry = _entry_sink(self.writer, encoder)
+        self.log_handlers: List[LogBufferHandler] = []
         self._loaded_entries = self._load_existing_entries()
+        self.ingestor: LogIngestor | None = None
+        if config.log_ingestion == "background":
+            self.ingestor = LogIngestor(self.buffer, sinks=[self._write_entry])
+        elif config.log_ingestion != "sync":
+            raise ValueError(
+                "Unbekannter Aufnahmemodus. Erlaubt sind: sync, background"
+            )
+        self.coalescer: LogCoalescer | None = None
+        if config.log_coalesce_window_seconds > 0:
+            self.coalescer = LogCoalescer(
+                _coalesced_sink(self.buffer, self.ingestor, self._write_entry),
+                window_seconds=config.log_coalesce_window_seconds,
+                mode=config.log_coalesce_mode,
+            )
+            # Offene Serien auch beim Beenden des Programms ausschreiben; läuft
+            # vor den Finalizern von Writer und Ingestor (später angelegt).
+            weakref.finalize(self, self.coalescer.flush)
 
     def _load_existing_entries(self) -> int:
-        """Liest bereits vorhandene Logdaten für Selbstheilung ein."""
+        """Liest die jüngsten vorhandenen Logdaten für Selbstheilung ein.
 
-        if not self.log_file.exists():
-            return 0
-        loaded = 0
-        for line in self.log_file.read_text(encoding="utf-8").splitlines():
-            if not line.strip():
-                continue
+        Die Datei (und bei Bedarf ihre archivierten Segmente) wird vom Ende
+        her gelesen; es werden nur so viele Zeilen dekodiert, wie der Puffer
+        aufnehmen kann.
+        """
+
+        if self.log_format == "binary":
+            return self._load_binary_entries()
+        capacity = self.buffer.max_entries
+        restored: List[Dict[str, Any]] = []
+        for line in iter_log_lines_reversed(self.log_file):
+            if len(restored) >= capacity:
+                break
             try:
                 payload = json.loads(line)
             except json.JSONDecodeError:
                 continue
-            message = str(payload.get("message", "Unbekannte Meldung"))
-            level = str(payload.get("level", "info"))
-            source = str(payload.get("source", "dashboard"))
-            timestamp_str = payload.get("timestamp")
-            timestamp = None
-            if isinstance(timestamp_str, str):
-                try:
-                    timestamp = datetime.fromisoformat(timestamp_str)
-                except ValueError:
-                    timestamp = None
+            if not isinstance(payload, dict):
+                continue
+            level = str(payload.get("level", "info")).lower()
+            if level not in LOG_LEVELS:
+                continue
+            payload["level"] = level
+            restored.append(payload)
+        self._restore(LogEntry.from_dict(payload) for payload in reversed(restored))
+        return len(restored)
+
+    def _restore(self, entries: Iterable[LogEntry]) -> None:
+        for entry in entries:
             self.buffer.add(
-                message=message, level=level, source=source, timestamp=timestamp
+                message=entry.message,
+                level=entry.level,
+                source=entry.source,
+                timestamp=entry.timestamp,
+                repeat_count=entry.repeat_count,
+                first_timestamp=entry.first_timestamp,
             )
-            loaded += 1
-        return loaded
+
+    def _load_binary_entries(self) -> int:
+        """Wie `_load_existing_entries`, aber für Dateien im Binärformat.
+
+        Binärdateien lassen sich nur vorwärts lesen; gelesen werden daher
+        ganze Dateien, von der neuesten an, bis der Puffer gefüllt wäre.
+        """
+
+        capacity = self.buffer.max_entries
+        chunks: List[List[LogEntry]] = []
+        collected = 0
+        for file in reversed(list(iter_log_files(self.log_file))):
+            if collected >= capacity:
+                break
+            entries = _decode_leniently(read_log_file(file))
+            chunks.append(entries)
+            collected += len(entries)
+        restored = [entry for chunk in reversed(chunks) for entry in chunk]
+        restored = restored[-capacity:] if capacity < len(restored) else restored
+        self._restore(restored)
+        return len(restored)
 
     def log_event(
         self,
@@ -66,32 +272,276 @@ class DebugModule(DashboardModule):
         *,
         level: str = "info",
         source: str = "dashboard",
-    ) -> Dict[str, str]:
-        """Fügt einen Logeintrag hinzu und schreibt ihn auf die Festplatte."""
+        timestamp: datetime | None = None,
+    ) -> Dict[str, Any]:
+        """Fügt einen Logeintrag hinzu und schreibt ihn auf die Festplatte.
+
+        Im Aufnahmemodus ``background`` wird der Eintrag nur eingereiht; Puffer
+        und Datei werden vom Hintergrund-Thread aktualisiert. Ist das
+        Zusammenfassen aktiv (``log_coalesce_window_seconds``), landen gleiche
+        Meldungen als ein Eintrag mit ``repeat_count`` im Puffer, sobald ihre
+        Serie endet.
+        """
 
-        entry = self.buffer.add(message=message, level=level, source=source)
-        self._append_to_file(entry.to_dict())
+        if self.coalescer is not None:
+            entry = LogEntry(
+                timestamp=timestamp or datetime.utcnow(),
+                level=LOG_LEVELS[level_severity(level)],
+                message=message,
+                source=source,
+            )
+            self.coalescer.submit(
+                message, level=entry.level, source=source, timestamp=entry.timestamp
+            )
+            return entry.to_dict()
+        if self.ingestor is not None:
+            entry = LogEntry(
+                timestamp=timestamp or datetime.utcnow(),
+                level=LOG_LEVELS[level_severity(level)],
+                message=message,
+                source=source,
+            )
+            self.ingestor.submit(
+                message, level=entry.level, source=source, timestamp=entry.timestamp
+            )
+            return entry.to_dict()
+        entry = self.buffer.add(
+            message=message, level=level, source=source, timestamp=timestamp
+        )
+        self._write_entry(entry)
         return entry.to_dict()
 
-    def _append_to_file(self, payload: Dict[str, str]) -> None:
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
-        with self.log_file.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    def _open_runs(self) -> List[LogEntry]:
+        # Offene Serien zeigen, ohne sie zu beenden: Das tun nur der
+        # Zeitgeber, eine andere Meldung oder `close()`.
+        return self.coalescer.snapshot() if self.coalescer is not None else []
+
+    def create_log_handler(self, **options: Any) -> LogBufferHandler:
+        """Erzeugt einen `logging.Handler`, der in dieses Modul protokolliert.
+
+        `options` werden an `LogBufferHandler` weitergereicht (Ratenlimits,
+        Debug-Stichprobe). Die Zähler verworfener Meldungen erscheinen im
+        Status der Kachel. Anmelden z.B. mit
+        ``logging.getLogger().addHandler(module.create_log_handler())``.
+        """
+
+        handler = LogBufferHandler(self.log_event, **options)
+        self.log_handlers.append(handler)
+        return handler
+
+    def flush(self) -> None:
+        """Überträgt eingereihte Einträge und schreibt gepufferte Logzeilen.
+
+        Offene Serien des Coalescers bleiben offen; sie landen in der Datei,
+        sobald sie enden.
+        """
+
+        if self.ingestor is not None:
+            self.ingestor.flush()
+        self.writer.flush()
 
-    def get_recent(self, limit: int | None = None) -> List[Dict[str, str]]:
-        """Liefert die jüngsten Einträge, optional begrenzt."""
+    def close(self) -> None:
+        """Schreibt ausstehende Zeilen und gibt die Logdatei frei."""
 
-        entries = self.buffer.as_dicts()
+        if self.coalescer is not None:
+            self.coalescer.flush()
+        if self.ingestor is not None:
+            self.ingestor.close()
+        self.writer.close()
+
+    def get_recent(
+        self,
+        limit: int | None = None,
+        minimum_level: str | None = None,
+        *,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Liefert die jüngsten Einträge, optional begrenzt und nach Stufe gefiltert.
+
+        Mit `start`/`end` (``datetime`` oder ISO-Text) wird nur ein Zeitfenster
+        geliefert, z.B. um in einen Störfall hineinzuzoomen. Noch offene Serien
+        gleicher Meldungen stehen am Ende.
+        """
+
+        low, high = _parse_moment(start), _parse_moment(end)
+        minimum = level_severity(minimum_level) if minimum_level else 0
+        if low is not None or high is not None:
+            entries = [
+                entry.to_dict()
+                for entry in self.buffer.between(low, high)
+                if entry.severity >= minimum
+            ]
+        elif minimum_level is None:
+            entries = self.buffer.as_dicts()
+        else:
+            entries = [
+                entry.to_dict() for entry in self.buffer.filter_by_level(minimum_level)
+            ]
+        entries.extend(
+            entry.to_dict()
+            for entry in self._open_runs()
+            if entry.severity >= minimum and _in_range(entry.timestamp, low, high)
+        )
         if limit is None or limit >= len(entries):
             return entries
         return entries[-limit:]
 
+    def search(
+        self,
+        query: str,
+        *,
+        minimum_level: str | None = None,
+        source: str | None = None,
+        limit: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Volltextsuche in den Meldungen, z.B. ``timeout req-42`` oder ``time*``."""
+
+        if self.search_index is not None:
+            found = self.search_index.search(
+                query, minimum_level=minimum_level, source=source, limit=limit
+            )
+        else:
+            found = scan_entries(
+                self.buffer.entries(),
+                query,
+                minimum_level=minimum_level,
+                source=source,
+            )
+        found.extend(
+            scan_entries(
+                self._open_runs(), query, minimum_level=minimum_level, source=source
+            )
+        )
+        if limit is not None:
+            found = found[-limit:] if limit > 0 else []
+        return [entry.to_dict() for entry in found]
+
+    def since(self, cursor: int = 0, limit: int | None = None) -> Dict[str, Any]:
+        """Liefert nur neue Einträge seit `cursor` für den Abfrage-Stream.
+
+        Offene Serien haben noch keine Sequenznummer; sie stehen vorläufig
+        unter ``pending`` und kommen als Eintrag, sobald sie enden.
+        """
+
+        return {
+            **self.buffer.since(cursor, limit).to_dict(),
+            "pending": [entry.to_dict() for entry in self._open_runs()],
+        }
+
+    def history(
+        self,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+        *,
+        limit: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Einträge eines Zeitraums aus Logdatei und Archiven (nicht nur dem Puffer).
+
+        Über den Zeitindex der Dateien werden nur die passenden Bereiche
+        gelesen; bei `limit` werden die jüngsten Treffer geliefert. Dateien
+        im Binärformat werden vollständig, aber ohne JSON-Dekodierung gelesen.
+        Noch offene Serien stehen wie bei `get_recent` am Ende.
+        """
+
+        self.flush()
+        low, high = _parse_moment(start), _parse_moment(end)
+        found: List[Dict[str, Any]] = []
+        if self.log_format == "binary":
+            for file in list(iter_log_files(self.log_file)):
+                found.extend(
+                    entry.to_dict()
+                    for entry in _decode_leniently(read_log_file(file))
+                    if _in_range(entry.timestamp, low, high)
+                )
+        else:
+            for line in scan_time_range(
+                self.log_file, low, high, stride=self.context.config.log_index_stride
+            ):
+                try:
+                    payload = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(payload, dict):
+                    found.append(payload)
+        found.extend(
+            entry.to_dict()
+            for entry in self._open_runs()
+            if _in_range(entry.timestamp, low, high)
+        )
+        if limit is not None:
+            found = found[-limit:] if limit > 0 else []
+        return found
+
+    def rates(self, window: str = "1m") -> Dict[str, Any]:
+        """Laufende Zählungen je Stufe und Quelle im Zeitfenster ("1s", "1m", "1h").
+
+        Liefert Summen und die Zählungen je Fach für Ratendiagramme; ohne
+        Aggregator (``log_rate_aggregates=False``) ein leeres Ergebnis. Offene
+        Serien zählen erst, wenn sie enden.
+        """
+
+        if self.rate_aggregator is None:
+            return {"window": window, "levels": {}, "sources": {}, "series": []}
+        return {
+            **self.rate_aggregator.totals(window),
+            "series": self.rate_aggregator.series(window),
+        }
+
     def clear_events(self) -> None:
-        """Leert das Protokoll und entfernt die Datei."""
+        """Leert das Protokoll und entfernt die Datei samt Archiven."""
 
+        if self.coalescer is not None:
+            self.coalescer.discard()
+        if self.ingestor is not None:
+            self.ingestor.flush()
         self.buffer.clear()
+        self.bump_render_version()
+        self.writer.discard()
         if self.log_file.exists():
             self.log_file.unlink()
+        log_index_path(self.log_file).unlink(missing_ok=True)
+        log_created_path(self.log_file).unlink(missing_ok=True)
+        remove_log_segments(self.log_file)
+
+    def log_segments(self) -> List[Path]:
+        """Archivierte Logsegmente ("Segment": Teilstück der Logdatei)."""
+
+        return list_log_segments(self.log_file)
+
+    def render_version(self) -> Hashable:
+        """Stand aus Puffer-Sequenz, Logdatei, verworfenen Meldungen und Raten.
+
+        Die Sequenznummer des Puffers erfasst auch Einträge, die ein
+        Hintergrund-Thread nachträgt; `log_event` muss dafür nichts zählen.
+        Offene Serien ändern den Stand über ihre Anzahl und die Zahl
+        zusammengefasster Meldungen. Die Ratenfenster verschieben sich mit der
+        Zeit; der Stand des Aggregators ändert sich aber nur, wenn dabei
+        Zählungen wegfallen.
+        """
+
+        return (
+            self._render_counter,
+            self.buffer.last_sequence,
+            (
+                (self.coalescer.pending, self.coalescer.folded)
+                if self.coalescer is not None
+                else None
+            ),
+            self.writer.pending_lines,
+            self.log_file.exists(),
+            self._dropped_records(),
+            (
+                self.rate_aggregator.version()
+                if self.rate_aggregator is not None
+                else None
+            ),
+        )
+
+    def _dropped_records(self) -> int:
+        return sum(
+            sum(handler.stats()["dropped"].values()) for handler in self.log_handlers
+        )
 
     def render(self) -> Dict[str, Any]:
         """Bereitet Daten für die GUI auf."""
@@ -104,13 +554,25 @@ class DebugModule(DashboardModule):
             "entries": entries,
             "log_levels": list(LOG_LEVELS),
             "log_file": str(self.log_file),
+            "log_format": self.log_format,
             "loaded_entries": self._loaded_entries,
             "keyboard_shortcuts": self.context.config.standards.keyboard_shortcuts,
             "breakpoints": self.context.config.responsive_profile.as_dicts(),
             "status": {
                 "loaded_entries": self._loaded_entries,
                 "current_entries": len(entries),
+                "level_counts": self.buffer.level_counts(),
                 "log_file_exists": self.log_file.exists(),
+                "archived_segments": len(self.log_segments()),
+                "coalesced_records": (
+                    self.coalescer.folded if self.coalescer is not None else 0
+                ),
+                "dropped_records": self._dropped_records(),
+                "rates": (
+                    self.rate_aggregator.summary()
+                    if self.rate_aggregator is not None
+                    else {}
+                ),
             },
             "toolbar": [
                 {
@@ -138,7 +600,19 @@ class DebugModule(DashboardModule):
                 "endpoint": "/api/debug/logs",
                 "method": "GET",
                 "poll_interval_seconds": 5,
-                "available_filters": {"levels": list(LOG_LEVELS)},
+                "cursor": self.buffer.last_sequence,
+                "cursor_parameter": "since",
+                "available_filters": {
+                    "levels": list(LOG_LEVELS),
+                    "search": True,
+                    "time_range": True,
+                },
+                "rates_endpoint": "/api/debug/rates",
+                "rate_windows": (
+                    self.rate_aggregator.windows
+                    if self.rate_aggregator is not None
+                    else []
+                ),
             },
             "tips": [
                 "Nutze die Filter, um Warnungen (Warnungen: Hinweise) schneller zu finden.",
@@ -147,15 +621,24 @@ class DebugModule(DashboardModule):
         }
 
     def export_snapshot(self, destination: Path) -> Path:
-        """Schreibt die aktuelle Logliste als JSON-Zeilen-Datei."""
+        """Schreibt die aktuelle Logliste (samt offener Serien) als JSON-Zeilen."""
 
+        lines = self.buffer.json_lines()
+        lines.extend(entry.json_line for entry in self._open_runs())
         destination.parent.mkdir(parents=True, exist_ok=True)
-        destination.write_text(
-            "\n".join(
-                json.dumps(entry, ensure_ascii=False) for entry in self.get_recent()
-            ),
-            encoding="utf-8",
-        )
+        destination.write_bytes(b"".join(lines).removesuffix(b"\n"))
+        return destination
+
+    def export_history(self, destination: Path) -> Path:
+        """Schreibt alle archivierten Segmente und die aktive Datei zusammen."""
+
+        # Eine Ausfuhr soll alles enthalten: offene Serien werden hier beendet.
+        if self.coalescer is not None:
+            self.coalescer.flush()
+        self.flush()
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with destination.open("wb") as handle:
+            copy_log_history(self.log_file, handle)
         return destination
 
     @staticmethod
@@ -165,4 +648,16 @@ class DebugModule(DashboardModule):
         return LOG_LEVELS
 
 
+def _decode_leniently(data: bytes) -> List[LogEntry]:
+    """Dekodiert eine Binärdatei bis zum ersten unlesbaren Datensatz."""
+
+    entries: List[LogEntry] = []
+    try:
+        for entry in decode_binary_log(data):
+            entries.append(entry)
+    except ValueError:
+        pass
+    return entries
+
+
 __all__ = ["DebugModule"]
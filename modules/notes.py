@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
-import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
 
 from modules.base import DashboardModule
+from src.dashboardtool.notesearch import (
+    NoteSearchIndex,
+    search_index_path,
+    search_notes,
+    store_fingerprint,
+)
+from src.dashboardtool.storage import create_note_store
 
 
 class NotesModule(DashboardModule):
@@ -27,17 +35,45 @@ class NotesModule(DashboardModule):
             if storage_file is not None
             else self.storage_directory / "notes.json"
         )
-        self._storage = storage_backend if storage_backend is not None else {}
+        config = self.context.config
+        self._store = create_note_store(
+            config.notes_storage,
+            self.storage_file,
+            notes=storage_backend,
+            compact_bytes=config.notes_journal_compact_bytes,
+            shards=config.notes_shard_count,
+            cache_shards=config.notes_shard_cache,
+        )
+        # Schützt Speicherstand und Store; der Autosave-Planer speichert aus
+        # einem Hintergrund-Thread.
+        self._lock = threading.RLock()
+        # Der Suchindex wird erst bei der ersten Suche oder Änderung geladen.
+        self.search_index = (
+            NoteSearchIndex(search_index_path(self.storage_file))
+            if config.notes_search_index
+            else None
+        )
         self._last_saved: datetime | None = None
         self._autosave_log: List[str] = []
+        # Vorheriger Stand je geänderter Notiz, solange eine Transaktion läuft.
+        self._undo: Dict[str, Dict[str, Any] | None] | None = None
         self._load_from_disk()
 
+    def render_version(self) -> int:
+        """Steigt bei jedem Schreiben, Löschen und Speichern."""
+
+        return self._render_counter
+
     def render(self) -> Dict[str, Any]:
         theme = self.context.config.get_theme("aurora")
+        # Stand unter der Sperre lesen: Die App kann in Threads rendern.
+        with self._lock:
+            saved_at = self._last_saved
+            entries = len(self._store)
+            autosave_log = list(self._autosave_log[-5:])
+            note_ids = self.list_note_ids()
         last_saved = (
-            self._last_saved.replace(microsecond=0).isoformat() + "Z"
-            if self._last_saved
-            else None
+            saved_at.replace(microsecond=0).isoformat() + "Z" if saved_at else None
         )
         return {
             "component": "notes",
@@ -49,8 +85,8 @@ class NotesModule(DashboardModule):
             "keyboard_shortcuts": self.context.config.standards.keyboard_shortcuts,
             "status": {
                 "last_saved": last_saved,
-                "entries": len(self._storage),
-                "autosave_log": list(self._autosave_log[-5:]),
+                "entries": entries,
+                "autosave_log": autosave_log,
             },
             "toolbar": [
                 {
@@ -66,80 +102,235 @@ class NotesModule(DashboardModule):
                     "shortcut": "CTRL+ALT+N",
                 },
             ],
-            "notes_index": self.list_note_ids(),
+            "notes_index": note_ids,
         }
 
     def write(self, note_id: str, content: str) -> None:
-        if not note_id:
-            raise ValueError(
-                'Die Notiz benötigt eine Kennung ("Kennung": eindeutige ID).'
-            )
+        _require_id(note_id)
+        entry = {"content": content, "timestamp": datetime.utcnow().isoformat()}
+        with self._lock:
+            self._stage(note_id, entry)
+            self._persist(f"'{note_id}' gespeichert")
+
+    def delete(self, note_id: str) -> bool:
+        """Entfernt eine Notiz; False, wenn es sie nicht gab."""
+
+        with self._lock:
+            removed = self._stage(note_id, None)
+            if removed:
+                self._persist(f"'{note_id}' gelöscht")
+            return removed
+
+    def write_many(self, notes: Mapping[str, str] | Iterable[Tuple[str, str]]) -> int:
+        """Schreibt viele Notizen und speichert nur einmal (siehe `transaction`).
+
+        Alle Notizen bekommen denselben Zeitstempel. Liefert die Anzahl.
+        """
+
+        items = list(notes.items() if isinstance(notes, Mapping) else notes)
+        for note_id, _ in items:
+            _require_id(note_id)
         timestamp = datetime.utcnow().isoformat()
-        self._storage[note_id] = {"content": content, "timestamp": timestamp}
-        self._last_saved = datetime.utcnow()
-        self._autosave_log.append(
-            f"{self._last_saved.replace(microsecond=0).isoformat()}Z: '{note_id}' gespeichert"
-        )
-        self._flush_to_disk()
+        with self.transaction():
+            for note_id, content in items:
+                self._stage(note_id, {"content": content, "timestamp": timestamp})
+        return len(items)
+
+    def delete_many(self, note_ids: Iterable[str]) -> int:
+        """Entfernt mehrere Notizen mit einem Speichervorgang; liefert die Anzahl."""
+
+        with self.transaction():
+            return sum(1 for note_id in note_ids if self._stage(note_id, None))
+
+    @contextmanager
+    def transaction(self) -> Iterator[NotesModule]:
+        """Bündelt Änderungen: Alles wird erst am Ende einmal gespeichert.
+
+        ``write``/``delete`` im Block ändern den Stand sofort (Lesen und Suche
+        sehen ihn), geschrieben wird aber erst beim Verlassen – bzw. mit
+        Autosave-Planer beim nächsten Autosave. Bei einer Ausnahme wird der
+        vorherige Stand wiederhergestellt ("Rollback"). Der Block hält die
+        Modulsperre; ein Autosave aus dem Hintergrund wartet also, bis er
+        fertig ist. Verschachtelte Blöcke gehören zum äußeren.
+        """
+
+        with self._lock:
+            if self._undo is not None:
+                yield self
+                return
+            self._undo = {}
+            try:
+                yield self
+            except BaseException:
+                self._rollback(self._undo)
+                raise
+            finally:
+                changed = len(self._undo)
+                self._undo = None
+            if changed:
+                self._persist(f"{changed} Notizen in einem Vorgang gespeichert")
+
+    def close(self) -> None:
+        """Schreibt ausstehende Daten und gibt Dateien frei."""
+
+        with self._lock:
+            self._store.close()
+            self._save_search_index()
+            self.mark_clean()
 
     def autosave(self) -> None:
-        self._last_saved = datetime.utcnow()
-        self._autosave_log.append(
-            f"{self._last_saved.replace(microsecond=0).isoformat()}Z: Autosave ausgeführt"
-        )
-        self._flush_to_disk()
+        with self._lock:
+            self.bump_render_version()
+            self._last_saved = datetime.utcnow()
+            self._autosave_log.append(
+                f"{self._last_saved.replace(microsecond=0).isoformat()}Z: Autosave ausgeführt"
+            )
+            self._flush_to_disk()
 
     @property
-    def storage(self) -> Dict[str, Any]:
-        return self._storage
+    def storage(self) -> Mapping[str, Any]:
+        """Alle Notizen (bei ``sqlite``/``sharded`` eine Sicht auf den Store)."""
+
+        return self._store.notes
 
     def read(self, note_id: str) -> Dict[str, Any] | None:
         """Liest eine gespeicherte Notiz aus (oder gibt None zurück)."""
 
-        return self._storage.get(note_id)
+        return self._store.get(note_id)
 
     def list_note_ids(self) -> list[str]:
         """Gibt verfügbare Notiz-IDs sortiert zurück."""
 
-        return sorted(self._storage)
+        return self._store.ids()
+
+    def search(self, query: str, *, limit: int = 20) -> List[Dict[str, Any]]:
+        """Volltextsuche über alle Notizen, beste Treffer zuerst.
+
+        Jeder Treffer enthält ``id``, ``score``, ``timestamp``, einen
+        Textauszug (``snippet``) und die Fundstellen darin (``highlights``).
+        Begriffe ab drei Zeichen finden auch Wortteile.
+        """
+
+        with self._lock:
+            index = self._loaded_search_index()
+            if index is None:
+                # Ohne dauerhaften Index: einmalig über alle Notizen aufbauen.
+                index = NoteSearchIndex()
+                index.rebuild(
+                    (note_id, str(entry.get("content", "")))
+                    for note_id, entry in self._store.items()
+                )
+            return search_notes(index, self._store, query, limit=limit)
+
+    # ------------------------------------------------------------------
+    # Änderungen
+    # ------------------------------------------------------------------
+    def _stage(self, note_id: str, entry: Dict[str, Any] | None) -> bool:
+        """Ändert Store und Suchindex vorläufig; False, wenn nichts zu löschen war."""
+
+        index = self.search_index
+        indexed = index is not None and index.loaded
+        previous = (
+            self._store.get(note_id) if indexed or self._undo is not None else None
+        )
+        if index is not None and not indexed:
+            # Nicht laden, nur vormerken: `open` liest die Notiz später nach.
+            index.mark_stale(note_id, self._store)
+        if not self._store.stage(note_id, entry):
+            return False
+        self.bump_render_version()
+        if self._undo is not None and note_id not in self._undo:
+            self._undo[note_id] = previous
+        if indexed:
+            index.update(
+                note_id,
+                str(entry.get("content", "")) if entry is not None else None,
+                previous=str(previous.get("content", "")) if previous else None,
+            )
+        return True
+
+    def _persist(self, message: str) -> None:
+        """Speichert Vorgemerktes sofort – außer in Transaktionen oder mit Planer."""
+
+        if self._undo is not None:
+            return  # `transaction` speichert beim Verlassen.
+        self.bump_render_version()
+        if self.autosave_scheduler is not None:
+            # Der Planer speichert gebündelt (siehe `autosave`).
+            self.mark_dirty()
+            return
+        self._last_saved = datetime.utcnow()
+        self._autosave_log.append(
+            f"{self._last_saved.replace(microsecond=0).isoformat()}Z: {message}"
+        )
+        try:
+            self._store.flush()
+            self._save_search_index(compact=False)
+        except Exception as exc:  # pragma: no cover - Schreibschutz
+            self._autosave_log.append(f"Fehler beim Speichern: {exc}")
+
+    def _rollback(self, undo: Dict[str, Dict[str, Any] | None]) -> None:
+        index = self.search_index
+        self.bump_render_version()
+        for note_id, previous in undo.items():
+            current = self._store.get(note_id)
+            self._store.stage(note_id, previous)
+            if index is not None and index.loaded:
+                index.update(
+                    note_id,
+                    str(previous.get("content", "")) if previous else None,
+                    previous=str(current.get("content", "")) if current else None,
+                )
 
     # ------------------------------------------------------------------
     # Persistenzschicht
     # ------------------------------------------------------------------
     def _load_from_disk(self) -> None:
-        """Lädt vorhandene Notizen aus der JSON-Datei."""
+        """Öffnet den Speicher bzw. lädt Notizen (je nach `notes_storage`)."""
 
         try:
-            if self.storage_file.exists():
-                raw = json.loads(self.storage_file.read_text(encoding="utf-8"))
-                if isinstance(raw, dict):
-                    self._storage.update(raw)
-                    timestamps = [
-                        datetime.fromisoformat(entry["timestamp"])
-                        for entry in self._storage.values()
-                        if isinstance(entry, dict) and "timestamp" in entry
-                    ]
-                    if timestamps:
-                        self._last_saved = max(timestamps)
+            self._store.load()
+            latest = self._store.latest_timestamp()
+            if latest is not None:
+                self._last_saved = datetime.fromisoformat(latest)
         except Exception as exc:  # pragma: no cover - Schutz vor Dateifehlern
             self._autosave_log.append(f"Fehler beim Laden: {exc}")
 
     def _flush_to_disk(self) -> None:
-        """Speichert Notizen dauerhaft im JSON-Format."""
+        """Speichert Notizen dauerhaft (je nach `notes_storage`)."""
 
         try:
-            self.storage_file.parent.mkdir(parents=True, exist_ok=True)
-            serializable = {
-                note_id: {
-                    "content": entry.get("content", ""),
-                    "timestamp": entry.get("timestamp", datetime.utcnow().isoformat()),
-                }
-                for note_id, entry in self._storage.items()
-                if isinstance(entry, dict)
-            }
-            self.storage_file.write_text(
-                json.dumps(serializable, indent=2, ensure_ascii=False),
-                encoding="utf-8",
-            )
+            self._store.flush()
+            self._save_search_index()
         except Exception as exc:  # pragma: no cover - Schreibschutz
             self._autosave_log.append(f"Fehler beim Speichern: {exc}")
+
+    # ------------------------------------------------------------------
+    # Suchindex
+    # ------------------------------------------------------------------
+    def _loaded_search_index(self) -> NoteSearchIndex | None:
+        index = self.search_index
+        if index is not None and not index.loaded and not index.open(self._store):
+            # Neu aufgebaut: gleich sichern, damit der nächste Start ihn hat.
+            index.save(store_fingerprint(self._store))
+        return index
+
+    def _save_search_index(self, *, compact: bool = True) -> None:
+        """Sichert den Index mit dem Stand des Stores (nur nach Änderungen).
+
+        Ohne `compact` werden nur geänderte Kennungen angehängt (siehe
+        `NoteSearchIndex.save_changes`); das passt zu jedem Speichern.
+        """
+
+        index = self.search_index
+        if index is None:
+            return
+        if compact and index.loaded and index.dirty:
+            index.save(store_fingerprint(self._store))
+        elif index.has_unsaved_changes:
+            index.save_changes(store_fingerprint(self._store))
+
+
+def _require_id(note_id: str) -> None:
+    if not note_id:
+        raise ValueError('Die Notiz benötigt eine Kennung ("Kennung": eindeutige ID).')
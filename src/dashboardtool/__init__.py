@@ -9,9 +9,15 @@ from .config import (
     ResponsiveBreakpoint,
     ResponsiveLayoutProfile,
 )
-from .themes import THEME_PRESETS, contrast_ratio, validate_theme_accessibility
+from .themes import (
+    THEME_PRESETS,
+    contrast_matrix,
+    contrast_ratio,
+    validate_theme_accessibility,
+    validate_theme_catalog,
+)
 from .layout import LayoutSpec, DEFAULT_LAYOUT
-from .logging import LOG_LEVELS, LogBuffer, LogEntry
+from .logging import LOG_LEVELS, ColumnarLogBuffer, LogBuffer, LogEntry, LogFeed
 from .gui import DashboardApp
 
 __all__ = [
@@ -20,12 +26,16 @@ __all__ = [
     "ResponsiveBreakpoint",
     "ResponsiveLayoutProfile",
     "THEME_PRESETS",
+    "contrast_matrix",
     "contrast_ratio",
     "validate_theme_accessibility",
+    "validate_theme_catalog",
     "LayoutSpec",
     "DEFAULT_LAYOUT",
     "LOG_LEVELS",
     "LogEntry",
     "LogBuffer",
+    "ColumnarLogBuffer",
+    "LogFeed",
     "DashboardApp",
 ]
@@ -0,0 +1,267 @@
+"""Gemeinsamer Autosave-Planer für alle Module ("Autosave": automatisches Speichern).
+
+Module melden Änderungen über `DashboardModule.mark_dirty()`. Der Planer
+entscheidet anhand der Auslöser aus `DashboardConfig.autosave_triggers`, wann
+gespeichert wird:
+
+* ``field_change`` – kurz nach einer Änderung; schnelle Folgen von Änderungen
+  (z.B. Tippen) werden zu einem Speichervorgang gebündelt ("Entprellen").
+* ``timer`` – regelmäßig alle `autosave_interval_minutes` Minuten.
+* ``on_exit`` – beim Beenden des Programms (auch bei SIGTERM).
+
+Gespeichert werden nur Module mit ungespeicherten Änderungen.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import signal
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover - nur für Typprüfungen
+    from modules.base import DashboardModule
+
+    from .config import DashboardConfig
+
+AUTOSAVE_TRIGGERS: tuple[str, ...] = ("field_change", "timer", "on_exit")
+
+
+class AutosaveScheduler:
+    """Plant Speichervorgänge für angemeldete Module.
+
+    Nach einer Änderung wird `debounce_seconds` gewartet; jede weitere
+    Änderung verschiebt den Termin, höchstens aber bis `max_delay_seconds`
+    nach der ersten. Zeitgesteuerte Durchläufe und das Entprellen laufen in
+    einem Hintergrund-Thread (`start`); `run_pending` erledigt fällige
+    Aufgaben auch ohne Thread, etwa in Tests mit eigener Uhr.
+
+    `autosave()` der Module wird aus dem Hintergrund-Thread gerufen; Module
+    mit eigenem Zustand schützen diesen daher mit einer Sperre. Fehler beim
+    Speichern werden in `errors` gesammelt, das Modul bleibt dann als
+    geändert markiert.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float = 600.0,
+        debounce_seconds: float = 2.0,
+        max_delay_seconds: float | None = None,
+        triggers: Sequence[str] = AUTOSAVE_TRIGGERS,
+        clock: Callable[[], float] = time.monotonic,
+        exit_hooks: bool = True,
+    ) -> None:
+        unknown = [trigger for trigger in triggers if trigger not in AUTOSAVE_TRIGGERS]
+        if unknown:
+            raise ValueError(
+                "Unbekannter Autosave-Auslöser. Erlaubt sind: "
+                + ", ".join(AUTOSAVE_TRIGGERS)
+            )
+        if debounce_seconds < 0:
+            raise ValueError("debounce_seconds darf nicht negativ sein.")
+        self.interval_seconds = interval_seconds
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = (
+            max_delay_seconds
+            if max_delay_seconds is not None
+            else max(debounce_seconds * 5, debounce_seconds)
+        )
+        self.triggers = tuple(triggers)
+        self._clock = clock
+        self._modules: List[DashboardModule] = []
+        self._condition = threading.Condition(threading.RLock())
+        self._change_due: float | None = None
+        self._change_limit: float | None = None
+        self._timer_due = (
+            clock() + interval_seconds
+            if "timer" in self.triggers and interval_seconds > 0
+            else None
+        )
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._previous_handlers: Dict[int, Any] = {}
+        self._hooks_installed = False
+        self._exit_hooks = exit_hooks and "on_exit" in self.triggers
+        self.errors: List[BaseException] = []
+        self.saves = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_config(cls, config: DashboardConfig, **options: Any) -> AutosaveScheduler:
+        """Planer mit Intervall und Auslösern aus der Konfiguration."""
+
+        return cls(
+            interval_seconds=max(0, config.autosave_interval_minutes) * 60,
+            triggers=config.autosave_triggers,
+            **options,
+        )
+
+    @property
+    def modules(self) -> List[DashboardModule]:
+        return list(self._modules)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def register(self, module: DashboardModule) -> None:
+        """Meldet ein Modul an; Änderungen werden ab jetzt hier gemeldet."""
+
+        with self._condition:
+            if module not in self._modules:
+                self._modules.append(module)
+            module.autosave_scheduler = self
+        if self._exit_hooks and not self._hooks_installed:
+            self._install_exit_hooks()
+
+    def unregister(self, module: DashboardModule) -> None:
+        with self._condition:
+            if module in self._modules:
+                self._modules.remove(module)
+            if module.autosave_scheduler is self:
+                module.autosave_scheduler = None
+
+    def notify_change(self, module: DashboardModule) -> None:
+        """Wird von `mark_dirty` gerufen; plant bei ``field_change`` ein Speichern."""
+
+        if "field_change" not in self.triggers:
+            return  # Timer oder Programmende übernehmen.
+        with self._condition:
+            now = self._clock()
+            if self._change_limit is None:
+                self._change_limit = now + self.max_delay_seconds
+            self._change_due = min(now + self.debounce_seconds, self._change_limit)
+            self._condition.notify()
+
+    def run_pending(self) -> int:
+        """Führt fällige Speichervorgänge aus; liefert die Zahl gespeicherter Module."""
+
+        with self._condition:
+            now = self._clock()
+            due = False
+            if self._change_due is not None and now >= self._change_due:
+                self._change_due = self._change_limit = None
+                due = True
+            if self._timer_due is not None and now >= self._timer_due:
+                self._timer_due = now + self.interval_seconds
+                due = True
+        return self.flush() if due else 0
+
+    def flush(self) -> int:
+        """Speichert alle Module mit ungespeicherten Änderungen."""
+
+        with self._condition:
+            modules = list(self._modules)
+            self._change_due = self._change_limit = None
+        saved = 0
+        for module in modules:
+            if not module.dirty:
+                self.skipped += 1
+                continue
+            # Vor dem Speichern zurücksetzen: Änderungen während `autosave`
+            # markieren das Modul erneut und gehen nicht verloren.
+            module.mark_clean()
+            try:
+                module.autosave()
+            except Exception as exc:
+                module.mark_dirty()
+                self.errors.append(exc)
+                continue
+            saved += 1
+        self.saves += saved
+        return saved
+
+    def start(self) -> None:
+        """Startet den Hintergrund-Thread für Timer und Entprellen."""
+
+        if self.running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="dashboardtool-autosave", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, *, flush: bool = True) -> None:
+        """Beendet den Thread (und speichert auf Wunsch ein letztes Mal)."""
+
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._remove_exit_hooks()
+        if flush:
+            self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                deadlines = [
+                    due
+                    for due in (self._change_due, self._timer_due)
+                    if due is not None
+                ]
+                timeout = (
+                    max(0.0, min(deadlines) - self._clock()) if deadlines else None
+                )
+                self._condition.wait(timeout)
+                if self._stopping:
+                    return
+            self.run_pending()
+
+    # ------------------------------------------------------------------
+    # Speichern beim Programmende
+    # ------------------------------------------------------------------
+    def _install_exit_hooks(self) -> None:
+        self._hooks_installed = True
+        atexit.register(self._flush_on_exit)
+        for signum in (signal.SIGTERM, getattr(signal, "SIGHUP", None)):
+            if signum is None:
+                continue
+            try:
+                previous = signal.signal(signum, self._handle_signal)
+            except ValueError:
+                continue  # Signale lassen sich nur im Hauptthread setzen.
+            # None: Der Handler wurde nicht aus Python gesetzt. Zurücksetzen
+            # lässt er sich nicht; das Standardverhalten kommt ihm am nächsten.
+            self._previous_handlers[signum] = (
+                signal.SIG_DFL if previous is None else previous
+            )
+
+    def _remove_exit_hooks(self) -> None:
+        if not self._hooks_installed:
+            return
+        self._hooks_installed = False
+        atexit.unregister(self._flush_on_exit)
+        for signum, previous in self._previous_handlers.items():
+            try:
+                signal.signal(signum, previous)
+            except (ValueError, TypeError):  # pragma: no cover - z.B. Nebenthread
+                pass
+        self._previous_handlers.clear()
+
+    def _flush_on_exit(self) -> None:
+        try:
+            self.flush()
+        except Exception as exc:  # pragma: no cover - Programmende nicht blockieren
+            self.errors.append(exc)
+
+    def _handle_signal(self, signum: int, frame: Any) -> None:
+        self._flush_on_exit()
+        previous = self._previous_handlers.get(signum)
+        self._remove_exit_hooks()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous != signal.SIG_IGN:
+            # Standardverhalten: mit dem ursprünglichen Handler erneut auslösen.
+            os.kill(os.getpid(), signum)
+
+
+__all__ = ["AUTOSAVE_TRIGGERS", "AutosaveScheduler"]
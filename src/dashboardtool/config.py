@@ -99,8 +99,32 @@ class DashboardConfig:
     autosave_triggers: List[str] = field(
         default_factory=lambda: ["field_change", "timer", "on_exit"]
     )
+    notes_storage: str = "json"
+    notes_journal_compact_bytes: int = 1024 * 1024
+    notes_shard_count: int = 64
+    notes_shard_cache: int = 8
+    notes_search_index: bool = True
     log_directory: Path = Path("var/log/dashboardtool")
+    log_buffer_layout: str = "deque"
+    log_ingestion: str = "sync"
+    log_search_index: bool = False
+    log_rate_aggregates: bool = False
+    log_coalesce_window_seconds: float = 0.0
+    log_coalesce_mode: str = "consecutive"
+    log_batch_max_lines: int = 1
+    log_batch_max_bytes: int = 64 * 1024
+    log_batch_max_delay_seconds: float = 1.0
+    log_durability: str = "flush"
+    log_rotation_max_bytes: int = 10 * 1024 * 1024
+    log_rotation_max_segments: int = 5
+    log_rotation_max_age_seconds: float = 24 * 60 * 60
+    log_rotation_compress: bool = True
+    log_index_stride: int = 256
+    log_file_format: str = "jsonl"
     default_timezone: str = "Europe/Berlin"
+    dashboard_render_mode: str = "sequential"
+    dashboard_render_deadline_seconds: float = 2.0
+    dashboard_render_workers: int = 4
 
     def get_theme(self, name: str) -> Dict[str, str]:
         """Liefert ein Farbthema oder wirft einen beschreibenden Fehler."""
@@ -0,0 +1,197 @@
+"""Änderungen zwischen zwei Dashboard-Modellen ("Diff": Unterschied).
+
+Jeder Abschnitt des Modells (``header``, ``modules``, ``themes`` …) bekommt
+einen Inhalts-Hash ("Hash": kurzer Fingerabdruck des Inhalts); aus allen
+Abschnitts-Hashes entsteht der Fingerabdruck des ganzen Modells. Ein Client,
+der einen früheren Fingerabdruck kennt, bekommt nur die Änderungen – als
+Patch nach RFC 6902 ("JSON Patch": Liste von add/remove/replace-Schritten)
+oder als geänderte Abschnitte.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from typing import Any, Dict, List, Mapping, Tuple
+
+Patch = List[Dict[str, Any]]
+
+
+def canonical_json(value: Any) -> str:
+    """Eindeutige JSON-Darstellung (sortierte Schlüssel, ohne Leerraum)."""
+
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+
+
+def content_hash(value: Any) -> str:
+    """Stabiler Hash eines JSON-Werts (gleicher Inhalt = gleicher Hash)."""
+
+    return _digest(canonical_json(value))
+
+
+def model_fingerprint(section_hashes: Mapping[str, str]) -> str:
+    """Fingerabdruck eines Modells aus seinen Abschnitts-Hashes."""
+
+    return _digest(canonical_json(dict(section_hashes)))
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SectionHasher:
+    """Berechnet Abschnitts-Hashes und merkt sich Hashes unveränderter Objekte.
+
+    Objekte, die seit dem letzten Aufruf dieselben geblieben sind (etwa
+    wiederverwendete Modulkacheln), werden nicht erneut serialisiert. Das
+    setzt voraus, dass solche Objekte nicht verändert werden. Listen werden
+    elementweise gehasht, damit eine geänderte Kachel nicht alle anderen neu
+    berechnen lässt.
+    """
+
+    def __init__(self) -> None:
+        self._memo: Dict[int, Tuple[Any, str]] = {}
+
+    def hashes(self, model: Mapping[str, Any]) -> Dict[str, str]:
+        previous, self._memo = self._memo, {}
+        return {name: self._hash(value, previous) for name, value in model.items()}
+
+    def _hash(self, value: Any, previous: Dict[int, Tuple[Any, str]]) -> str:
+        known = previous.get(id(value))
+        if known is not None and known[0] is value:
+            digest = known[1]
+        elif isinstance(value, list):
+            digest = _digest(
+                "list:" + ",".join(self._hash(item, previous) for item in value)
+            )
+        else:
+            digest = content_hash(value)
+        if isinstance(value, (dict, list)):
+            self._memo[id(value)] = (value, digest)
+        return digest
+
+
+# ----------------------------------------------------------------------
+# JSON Patch (RFC 6902)
+# ----------------------------------------------------------------------
+def _pointer(parent: str, key: str | int) -> str:
+    return parent + "/" + str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _same(old: Any, new: Any) -> bool:
+    # True == 1 in Python, in JSON aber nicht; daher auch den Typ vergleichen.
+    return old is new or (type(old) is type(new) and old == new)
+
+
+def json_patch(old: Any, new: Any, path: str = "") -> Patch:
+    """Schritte, die `old` in `new` überführen (``add``/``remove``/``replace``).
+
+    Wörterbücher und Listen werden rekursiv verglichen; Listen Platz für
+    Platz, verlängerte Listen bekommen ``add`` am Ende, verkürzte ``remove``
+    von hinten.
+    """
+
+    if _same(old, new):
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch: Patch = []
+        for key in old:
+            if key not in new:
+                patch.append({"op": "remove", "path": _pointer(path, key)})
+        for key, value in new.items():
+            if key not in old:
+                patch.append({"op": "add", "path": _pointer(path, key), "value": value})
+            else:
+                patch.extend(json_patch(old[key], value, _pointer(path, key)))
+        return patch
+    if isinstance(old, list) and isinstance(new, list):
+        patch = []
+        shared = min(len(old), len(new))
+        for index in range(shared):
+            patch.extend(json_patch(old[index], new[index], _pointer(path, index)))
+        for index in range(shared, len(new)):
+            patch.append(
+                {"op": "add", "path": _pointer(path, index), "value": new[index]}
+            )
+        for index in range(len(old) - 1, shared - 1, -1):
+            patch.append({"op": "remove", "path": _pointer(path, index)})
+        return patch
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, patch: Patch) -> Any:
+    """Wendet einen Patch auf eine Kopie von `document` an (für Clients und Tests)."""
+
+    result = copy.deepcopy(document)
+    for operation in patch:
+        op = operation.get("op")
+        path = operation.get("path", "")
+        if op not in ("add", "remove", "replace"):
+            raise ValueError(f"Nicht unterstützte Patch-Operation: {op!r}")
+        if path == "":
+            if op == "remove":
+                raise ValueError("Das ganze Dokument kann nicht entfernt werden.")
+            result = copy.deepcopy(operation["value"])
+            continue
+        *parents, last = [
+            part.replace("~1", "/").replace("~0", "~") for part in path[1:].split("/")
+        ]
+        target = result
+        for part in parents:
+            target = target[int(part)] if isinstance(target, list) else target[part]
+        if isinstance(target, list):
+            index = len(target) if last == "-" else int(last)
+            if op == "add":
+                target.insert(index, copy.deepcopy(operation["value"]))
+            elif op == "remove":
+                del target[index]
+            else:
+                target[index] = copy.deepcopy(operation["value"])
+        elif op == "remove":
+            del target[last]
+        else:
+            if op == "replace" and last not in target:
+                raise ValueError(f"Pfad existiert nicht: {path}")
+            target[last] = copy.deepcopy(operation["value"])
+    return result
+
+
+def section_patch(
+    old_model: Mapping[str, Any],
+    new_model: Mapping[str, Any],
+    changed: List[str],
+) -> Patch:
+    """JSON Patch nur für die geänderten Abschnitte."""
+
+    patch: Patch = []
+    for name in changed:
+        path = _pointer("", name)
+        if name not in new_model:
+            patch.append({"op": "remove", "path": path})
+        elif name not in old_model:
+            patch.append({"op": "add", "path": path, "value": new_model[name]})
+        else:
+            patch.extend(json_patch(old_model[name], new_model[name], path))
+    return patch
+
+
+def changed_sections(old: Mapping[str, str], new: Mapping[str, str]) -> List[str]:
+    """Abschnitte mit anderem Hash, neue und entfallene eingeschlossen."""
+
+    names = list(new) + [name for name in old if name not in new]
+    return [name for name in names if old.get(name) != new.get(name)]
+
+
+__all__ = [
+    "SectionHasher",
+    "apply_patch",
+    "canonical_json",
+    "changed_sections",
+    "content_hash",
+    "json_patch",
+    "model_fingerprint",
+    "section_patch",
+]
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, Hashable, List, Sequence, Tuple
 
 try:
     from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
@@ -12,12 +15,17 @@ except ImportError:  # pragma: no cover - nur für sehr alte Python-Versionen
     ZoneInfo = None  # type: ignore
     ZoneInfoNotFoundError = Exception  # type: ignore
 
-from modules.base import DashboardModule
+from modules.base import DashboardModule, ModuleValidationResult
 
+from .autosave import AutosaveScheduler
 from .config import DashboardConfig, DEFAULT_CONFIG
+from .diff import SectionHasher, changed_sections, model_fingerprint, section_patch
 from .layout import DEFAULT_LAYOUT, LayoutSpec
 from .themes import validate_theme_accessibility
 
+RENDER_MODES: tuple[str, ...] = ("sequential", "threads")
+DIFF_STYLES: tuple[str, ...] = ("patch", "sections")
+
 
 @dataclass(frozen=True)
 class SidebarItem:
@@ -39,9 +47,39 @@ class SidebarItem:
         return data
 
 
+@dataclass(frozen=True)
+class _CachedTile:
+    """Gerenderte Kachel samt daraus abgeleiteter Teile (Sidebar, Hinweise)."""
+
+    version: Hashable | None
+    tile: Dict[str, Any]
+    sidebar_item: Dict[str, str]
+    recovery_actions: List[str]
+
+
 @dataclass
 class DashboardApp:
-    """Fasst Module, Layout und Statusinformationen für die GUI zusammen."""
+    """Fasst Module, Layout und Statusinformationen für die GUI zusammen.
+
+    Mit `cache_tiles` wird jede Modulkachel nur neu gerendert, wenn sich die
+    `render_version()` des Moduls geändert hat; Sidebar-Eintrag und
+    Selbstheilungs-Hinweise der Kachel werden mit ihr zwischengespeichert.
+    Wiederverwendete Kacheln sind dieselben Objekte wie beim letzten
+    Aufruf und dürfen daher nicht verändert werden.
+
+    Mit ``dashboard_render_mode="threads"`` rendern die Module gleichzeitig
+    in einem Thread-Pool. Jedes Modul hat eine Frist
+    (`DashboardModule.render_deadline_seconds` bzw.
+    ``dashboard_render_deadline_seconds``); wer sie verpasst, erscheint mit
+    seiner letzten Kachel, in `validation` als veraltet ("stale") markiert,
+    und rendert im Hintergrund weiter. Ein `render()` dauert so höchstens
+    so lange wie die längste Frist. Zeiten je Modul stehen unter
+    ``status.render``.
+
+    `render_diff` liefert statt des ganzen Modells nur die Änderungen seit
+    einem früheren Fingerabdruck; die letzten `diff_history` Modelle werden
+    dafür aufbewahrt.
+    """
 
     modules: Sequence[DashboardModule]
     config: DashboardConfig = DEFAULT_CONFIG
@@ -49,10 +87,33 @@ class DashboardApp:
     title: str = "DashboardTool"
     subtitle: str = "Modulares Kontrollzentrum mit Hilfe-Overlays für Einsteiger"
     active_theme: str = "aurora"
+    autosave: AutosaveScheduler | None = None
+    cache_tiles: bool = True
+    diff_history: int = 8
+    _tile_cache: Dict[str, _CachedTile] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _tile_stats: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _render_report: Dict[str, Any] = field(default_factory=dict, init=False, repr=False)
+    _inflight: Dict[str, Future] = field(default_factory=dict, init=False, repr=False)
+    _executor: ThreadPoolExecutor | None = field(default=None, init=False, repr=False)
+    _history: OrderedDict[str, Tuple[Dict[str, Any], Dict[str, str]]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _hasher: SectionHasher = field(
+        default_factory=SectionHasher, init=False, repr=False
+    )
 
     def __post_init__(self) -> None:
+        if self.config.dashboard_render_mode not in RENDER_MODES:
+            raise ValueError(
+                "Unbekannter Render-Modus. Erlaubt sind: " + ", ".join(RENDER_MODES)
+            )
         self.modules = list(self.modules)
         self._ensure_unique_identifiers()
+        if self.autosave is not None:
+            for module in self.modules:
+                self.autosave.register(module)
 
     # ------------------------------------------------------------------
     # Öffentliche API
@@ -61,8 +122,9 @@ class DashboardApp:
         """Erzeugt eine leicht verständliche Darstellung für das Frontend."""
 
         now = self._current_time()
-        module_tiles = [module.render_dashboard_tile() for module in self.modules]
-        sidebar = self._build_sidebar(module_tiles)
+        cached = self._module_tiles()
+        module_tiles = [entry.tile for entry in cached]
+        sidebar = self._build_sidebar(cached)
         theme_report = self._theme_report()
         layout_variables = self.layout.to_css_with_breakpoints(
             self.config.responsive_profile
@@ -82,9 +144,252 @@ class DashboardApp:
             "validation": validation_summary,
             "keyboard_navigation": self._keyboard_navigation(sidebar["items"]),
             "notifications": self._notifications(),
-            "self_healing": self._self_healing(module_tiles),
+            "self_healing": self._self_healing(cached),
         }
 
+    def render_diff(
+        self, since: str | None = None, *, style: str = "patch"
+    ) -> Dict[str, Any]:
+        """Rendert und liefert nur die Änderungen seit dem Fingerabdruck `since`.
+
+        Das Ergebnis enthält immer ``fingerprint`` (für den nächsten Aufruf)
+        und ``sections`` (Hash je Abschnitt). Ist `since` unbekannt oder
+        leer, steht das ganze Modell unter ``full``. Sonst stehen die
+        geänderten Abschnitte unter ``changed_sections`` und die Änderungen
+        je nach `style`:
+
+        * ``"patch"``: ``patch`` als JSON Patch nach RFC 6902
+          (siehe `src.dashboardtool.diff.apply_patch`).
+        * ``"sections"``: ``delta`` mit dem neuen Inhalt jedes geänderten
+          Abschnitts und ``removed_sections``.
+        """
+
+        if style not in DIFF_STYLES:
+            raise ValueError(
+                "Unbekannter Diff-Stil. Erlaubt sind: " + ", ".join(DIFF_STYLES)
+            )
+        model = self.render()
+        hashes = self._hasher.hashes(model)
+        fingerprint = model_fingerprint(hashes)
+        result: Dict[str, Any] = {
+            "fingerprint": fingerprint,
+            "base": since,
+            "sections": hashes,
+        }
+        previous = self._history.get(since) if since else None
+        self._history[fingerprint] = (model, hashes)
+        self._history.move_to_end(fingerprint)
+        while len(self._history) > max(self.diff_history, 1):
+            self._history.popitem(last=False)
+        if previous is None:
+            result["base"] = None
+            result["full"] = model
+            return result
+        old_model, old_hashes = previous
+        changed = changed_sections(old_hashes, hashes)
+        result["changed_sections"] = changed
+        if style == "patch":
+            result["patch"] = section_patch(old_model, model, changed)
+        else:
+            result["delta"] = {name: model[name] for name in changed if name in model}
+            result["removed_sections"] = [name for name in changed if name not in model]
+        return result
+
+    def invalidate_tiles(self, identifier: str | None = None) -> None:
+        """Verwirft zwischengespeicherte Kacheln (alle oder die eines Moduls)."""
+
+        if identifier is None:
+            self._tile_cache.clear()
+        else:
+            self._tile_cache.pop(identifier, None)
+
+    def close(self) -> None:
+        """Beendet den Thread-Pool; laufende Renderaufrufe werden nicht abgewartet."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._inflight.clear()
+
+    # ------------------------------------------------------------------
+    # Kachel-Cache und Rendern der Module
+    # ------------------------------------------------------------------
+    def _module_tiles(self) -> List[_CachedTile]:
+        begin = time.perf_counter()
+        tiles: Dict[str, _CachedTile] = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+        pending: List[Tuple[DashboardModule, Hashable | None]] = []
+        for module in self.modules:
+            self._collect_finished(module.identifier)
+            version = module.render_version() if self.cache_tiles else None
+            entry = self._tile_cache.get(module.identifier)
+            if version is not None and entry is not None and entry.version == version:
+                tiles[module.identifier] = entry
+                timings[module.identifier] = {"source": "cached", "ms": 0.0}
+            else:
+                pending.append((module, version))
+        if self.config.dashboard_render_mode == "threads":
+            self._render_concurrently(pending, tiles, timings)
+        else:
+            for module, version in pending:
+                entry, seconds = self._timed_build(module, version)
+                tiles[module.identifier] = self._remember_tile(module, entry)
+                timings[module.identifier] = {
+                    "source": "rendered",
+                    "ms": round(seconds * 1000, 3),
+                }
+        sources = [timing["source"] for timing in timings.values()]
+        self._tile_stats = {
+            "rendered": sources.count("rendered"),
+            "reused": sources.count("cached"),
+        }
+        self._render_report = {
+            "mode": self.config.dashboard_render_mode,
+            "total_ms": round((time.perf_counter() - begin) * 1000, 3),
+            "modules": timings,
+        }
+        return [tiles[module.identifier] for module in self.modules]
+
+    def _render_concurrently(
+        self,
+        pending: Sequence[Tuple[DashboardModule, Hashable | None]],
+        tiles: Dict[str, _CachedTile],
+        timings: Dict[str, Dict[str, Any]],
+    ) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, self.config.dashboard_render_workers),
+                thread_name_prefix="dashboardtool-render",
+            )
+        start = time.perf_counter()
+        waiting: List[Tuple[float, DashboardModule, Future]] = []
+        for module, version in pending:
+            # Ein noch laufender Aufruf (Frist verpasst) wird nicht verdoppelt.
+            future = self._inflight.get(module.identifier)
+            if future is None:
+                future = self._executor.submit(self._timed_build, module, version)
+                self._inflight[module.identifier] = future
+            waiting.append((self._deadline_for(module), module, future))
+        # Alle laufen parallel; gewartet wird jeweils bis zur eigenen Frist.
+        for deadline, module, future in sorted(waiting, key=lambda item: item[0]):
+            remaining = deadline - (time.perf_counter() - start)
+            # Nicht `result(timeout=...)`: Dessen TimeoutError ließe sich nicht
+            # von einem TimeoutError aus `render()` selbst unterscheiden.
+            done, _ = wait([future], timeout=max(0.0, remaining))
+            if not done:
+                known = module.identifier in self._tile_cache
+                tiles[module.identifier] = self._stale_tile(module, deadline)
+                timings[module.identifier] = {
+                    "source": "stale" if known else "placeholder",
+                    "ms": round((time.perf_counter() - start) * 1000, 3),
+                    "deadline_ms": round(deadline * 1000, 3),
+                }
+                continue
+            self._inflight.pop(module.identifier, None)
+            # Fehler beim Rendern kommen wie beim Rendern nacheinander durch.
+            entry, seconds = future.result()
+            tiles[module.identifier] = self._remember_tile(module, entry)
+            timings[module.identifier] = {
+                "source": "rendered",
+                "ms": round(seconds * 1000, 3),
+                "deadline_ms": round(deadline * 1000, 3),
+            }
+
+    def _collect_finished(self, identifier: str) -> None:
+        """Übernimmt das Ergebnis eines verspäteten Renderaufrufs in den Cache."""
+
+        future = self._inflight.get(identifier)
+        if future is None or not future.done():
+            return
+        del self._inflight[identifier]
+        if future.cancelled() or future.exception() is not None:
+            return  # Beim nächsten Rendern tritt der Fehler erneut auf.
+        entry, _ = future.result()
+        self._tile_cache[identifier] = entry
+
+    def _deadline_for(self, module: DashboardModule) -> float:
+        if module.render_deadline_seconds is not None:
+            return module.render_deadline_seconds
+        return self.config.dashboard_render_deadline_seconds
+
+    def _timed_build(
+        self, module: DashboardModule, version: Hashable | None
+    ) -> Tuple[_CachedTile, float]:
+        start = time.perf_counter()
+        entry = self._build_tile(module, version)
+        return entry, time.perf_counter() - start
+
+    def _remember_tile(
+        self, module: DashboardModule, entry: _CachedTile
+    ) -> _CachedTile:
+        # Auch Kacheln ohne Version bleiben als letzter guter Stand erhalten.
+        self._tile_cache[module.identifier] = entry
+        return entry
+
+    def _stale_tile(self, module: DashboardModule, deadline: float) -> _CachedTile:
+        """Letzte gute Kachel (oder Platzhalter), als veraltet markiert."""
+
+        message = (
+            f"Modul '{module.display_name}' hat nicht innerhalb von {deadline:g} s "
+            "geantwortet; angezeigt wird der letzte bekannte Stand."
+        )
+        last = self._tile_cache.get(module.identifier)
+        if last is not None:
+            tile = last.tile
+            validation = dict(tile["validation"])
+            validation["warnings"] = [*validation.get("warnings", []), message]
+        else:
+            tile = {
+                "identifier": module.identifier,
+                "display_name": module.display_name,
+                "description": module.description,
+                "component": module.identifier,
+                "payload": {},
+                "actions": [],
+                "layout": module.layout_defaults(),
+                "shortcuts": {},
+                "storage_directory": str(module.storage_directory),
+            }
+            validation = ModuleValidationResult(
+                warnings=[message],
+                solutions=[
+                    "Das Modul lädt noch. Die Anzeige aktualisiert sich beim "
+                    "nächsten Abruf automatisch."
+                ],
+            ).to_dict()
+        validation["stale"] = True
+        tile = {**tile, "validation": validation, "stale": True}
+        return _CachedTile(
+            version=None,
+            tile=tile,
+            sidebar_item=(
+                last.sidebar_item
+                if last is not None
+                else SidebarItem(
+                    identifier=module.identifier,
+                    label=module.display_name,
+                    description=module.description,
+                ).to_dict()
+            ),
+            recovery_actions=self._recovery_actions(tile),
+        )
+
+    def _build_tile(
+        self, module: DashboardModule, version: Hashable | None
+    ) -> _CachedTile:
+        tile = module.render_dashboard_tile()
+        return _CachedTile(
+            version=version,
+            tile=tile,
+            sidebar_item=SidebarItem(
+                identifier=tile["identifier"],
+                label=tile["display_name"],
+                description=tile["description"],
+                shortcut=tile.get("shortcuts", {}).get("focus"),
+            ).to_dict(),
+            recovery_actions=self._recovery_actions(tile),
+        )
+
     # ------------------------------------------------------------------
     # Aufbau einzelner Abschnitte
     # ------------------------------------------------------------------
@@ -118,23 +423,19 @@ class DashboardApp:
                 "interval_minutes": self.config.autosave_interval_minutes,
                 "triggers": self.config.autosave_triggers,
                 "next_run_hint": next_run_hint,  # Laienhinweis
+                "unsaved_modules": [
+                    module.identifier for module in self.modules if module.dirty
+                ],
             },
+            "tile_cache": dict(self._tile_stats),
+            "render": self._render_report,
             "storage_directories": storage_directories,
             "module_count": len(module_tiles),
         }
 
-    def _build_sidebar(self, module_tiles: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
-        items = [
-            SidebarItem(
-                identifier=tile["identifier"],
-                label=tile["display_name"],
-                description=tile["description"],
-                shortcut=tile.get("shortcuts", {}).get("focus"),
-            ).to_dict()
-            for tile in module_tiles
-        ]
+    def _build_sidebar(self, module_tiles: Sequence[_CachedTile]) -> Dict[str, Any]:
         return {
-            "items": items,
+            "items": [entry.sidebar_item for entry in module_tiles],
             "collapsible": True,
             "initial_state": {
                 "collapsed": False,
@@ -208,25 +509,34 @@ class DashboardApp:
         has_errors = any(not result["is_valid"] for result in module_results.values())
         return {
             "modules": module_results,
+            "stale_modules": [
+                identifier
+                for identifier, result in module_results.items()
+                if result.get("stale")
+            ],
             "has_errors": has_errors,
             "error_count": error_count,
             "warning_count": warning_count,
         }
 
-    def _self_healing(self, module_tiles: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
-        recovery_actions: List[str] = []
-        for tile in module_tiles:
-            validation = tile["validation"]
-            if not validation["is_valid"]:
-                recovery_actions.append(
-                    f"Modul '{tile['display_name']}' meldet fehlende Felder."
-                )
-                recovery_actions.extend(validation.get("solutions", []))
-            elif validation.get("warnings"):
-                recovery_actions.append(
-                    f"Modul '{tile['display_name']}' hat Hinweise zur Optimierung."
-                )
-                recovery_actions.extend(validation.get("solutions", []))
+    def _recovery_actions(self, tile: Dict[str, Any]) -> List[str]:
+        validation = tile["validation"]
+        if not validation["is_valid"]:
+            return [
+                f"Modul '{tile['display_name']}' meldet fehlende Felder.",
+                *validation.get("solutions", []),
+            ]
+        if validation.get("warnings"):
+            return [
+                f"Modul '{tile['display_name']}' hat Hinweise zur Optimierung.",
+                *validation.get("solutions", []),
+            ]
+        return []
+
+    def _self_healing(self, module_tiles: Sequence[_CachedTile]) -> Dict[str, Any]:
+        recovery_actions = [
+            action for entry in module_tiles for action in entry.recovery_actions
+        ]
         deduped_actions: List[str] = []
         seen: set[str] = set()
         for action in recovery_actions:
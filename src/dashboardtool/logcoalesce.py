@@ -0,0 +1,216 @@
+"""Zusammenfassen wiederholter Logmeldungen ("Coalescing": Verschmelzen).
+
+Fällt eine Abhängigkeit aus, kommt dieselbe Meldung oft tausendfach pro
+Minute. Jede Kopie belegt einen Platz im Ringpuffer, verdrängt nützliche
+Einträge und kostet einen Schreibvorgang. Der `LogCoalescer` sitzt vor dem
+Puffer und fasst gleiche Meldungen (gleiche Stufe, Quelle und Meldung) zu
+einem Eintrag mit Wiederholungszahl sowie erstem und letztem Zeitpunkt
+zusammen ("wiederholt N-mal").
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from .logging import LOG_LEVELS, LogEntry, level_severity
+
+COALESCE_MODES: tuple[str, ...] = ("consecutive", "window")
+
+CoalescedSink = Callable[..., Any]
+"""Ziel wie `BaseLogBuffer.add`: ``sink(message, level=..., source=...,
+timestamp=..., repeat_count=..., first_timestamp=...)``."""
+
+
+class _Run:
+    """Offene Serie: erster und letzter Zeitpunkt, Anzahl, Beginn (Uhr)."""
+
+    __slots__ = ("first", "last", "count", "started")
+
+    def __init__(self, moment: datetime, started: float) -> None:
+        self.first = moment
+        self.last = moment
+        self.count = 1
+        self.started = started
+
+
+class LogCoalescer:
+    """Sammelt gleiche Meldungen und reicht sie als einen Eintrag weiter.
+
+    Im Modus ``consecutive`` wird nur die Serie direkt aufeinanderfolgender
+    Meldungen gesammelt; eine andere Meldung schreibt sie sofort aus. Im
+    Modus ``window`` laufen bis zu `max_pending` Serien nebeneinander, so dass
+    auch abwechselnde Meldungen zusammengefasst werden; ist kein Platz mehr
+    frei, wird die älteste Serie ausgeschrieben. In beiden Modi endet eine
+    Serie spätestens `window_seconds` nach ihrer ersten Meldung. Geprüft wird
+    bei jeder neuen Meldung, bei `poll()` und – solange Serien offen sind –
+    durch einen Zeitgeber ("Timer"), damit auch die letzte Serie ohne
+    Folgemeldung ausgeschrieben wird. `flush()` schreibt alle offenen Serien
+    aus; `snapshot()` zeigt sie, ohne sie zu beenden.
+
+    Einzelne Meldungen werden unverändert weitergereicht (Anzahl 1). Der
+    Zeitstempel einer Serie ist der ihrer letzten Meldung. `sink` wird unter
+    der Sperre des Coalescers aufgerufen, damit die Reihenfolge erhalten
+    bleibt.
+    """
+
+    def __init__(
+        self,
+        sink: CoalescedSink,
+        *,
+        window_seconds: float = 5.0,
+        mode: str = "consecutive",
+        max_pending: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if window_seconds <= 0:
+            raise ValueError("window_seconds muss größer als 0 sein.")
+        if mode not in COALESCE_MODES:
+            raise ValueError(
+                "Unbekannter Zusammenfassungsmodus. Erlaubt sind: "
+                + ", ".join(COALESCE_MODES)
+            )
+        if max_pending <= 0:
+            raise ValueError("max_pending muss größer als 0 sein.")
+        self.sink = sink
+        self.window_seconds = window_seconds
+        self.mode = mode
+        self.max_pending = 1 if mode == "consecutive" else max_pending
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Schlüssel: (Schweregrad, Quelle, Meldung); Einfügereihenfolge ist
+        # zugleich die Reihenfolge der Serienanfänge.
+        self._runs: Dict[Tuple[int, str, str], _Run] = {}
+        self._timer: threading.Timer | None = None
+        self.folded = 0
+
+    @property
+    def pending(self) -> int:
+        """Anzahl offener Serien."""
+
+        return len(self._runs)
+
+    def submit(
+        self,
+        message: str,
+        level: str = "info",
+        source: str = "dashboard",
+        timestamp: datetime | None = None,
+    ) -> bool:
+        """Nimmt eine Meldung auf; True, wenn sie in eine offene Serie fiel."""
+
+        key = (level_severity(level), source, message)
+        moment = timestamp or datetime.utcnow()
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            run = self._runs.get(key)
+            if run is not None:
+                run.count += 1
+                if moment > run.last:
+                    run.last = moment
+                elif moment < run.first:
+                    run.first = moment
+                self.folded += 1
+                return True
+            while len(self._runs) >= self.max_pending:
+                self._emit(next(iter(self._runs)))
+            self._runs[key] = _Run(moment, now)
+            if self._timer is None:
+                self._schedule(now)
+            return False
+
+    def snapshot(self) -> List[LogEntry]:
+        """Offene Serien als Einträge (ohne Sequenznummer), älteste zuerst.
+
+        Die Serien bleiben offen; so können Abfragen sie anzeigen, ohne das
+        Zusammenfassen zu unterbrechen.
+        """
+
+        with self._lock:
+            return [
+                LogEntry(
+                    timestamp=run.last,
+                    level=LOG_LEVELS[severity],
+                    message=message,
+                    source=source,
+                    repeat_count=run.count,
+                    first_timestamp=run.first if run.count > 1 else None,
+                )
+                for (severity, source, message), run in self._runs.items()
+            ]
+
+    def poll(self) -> int:
+        """Schreibt abgelaufene Serien aus; liefert deren Anzahl."""
+
+        with self._lock:
+            return self._expire(self._clock())
+
+    def flush(self) -> int:
+        """Schreibt alle offenen Serien aus; liefert deren Anzahl."""
+
+        with self._lock:
+            self._cancel_timer()
+            count = len(self._runs)
+            while self._runs:
+                self._emit(next(iter(self._runs)))
+            return count
+
+    def discard(self) -> None:
+        """Verwirft offene Serien, ohne sie auszuschreiben."""
+
+        with self._lock:
+            self._cancel_timer()
+            self._runs.clear()
+
+    def _schedule(self, now: float) -> None:
+        # Der Zeitgeber wartet bis zum Ende der ältesten offenen Serie.
+        oldest = next(iter(self._runs.values()))
+        delay = max(0.0, oldest.started + self.window_seconds - now)
+        timer = threading.Timer(delay, self._expire_when_due)
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _expire_when_due(self) -> None:
+        with self._lock:
+            if self._timer is not threading.current_thread():
+                return  # inzwischen abgebrochen oder neu geplant
+            self._timer = None
+            now = self._clock()
+            self._expire(now)
+            if self._runs:
+                self._schedule(now)
+
+    def _expire(self, now: float) -> int:
+        deadline = now - self.window_seconds
+        emitted = 0
+        while self._runs:
+            key, run = next(iter(self._runs.items()))
+            if run.started > deadline:
+                break
+            self._emit(key)
+            emitted += 1
+        return emitted
+
+    def _emit(self, key: Tuple[int, str, str]) -> None:
+        run = self._runs.pop(key)
+        severity, source, message = key
+        self.sink(
+            message,
+            level=LOG_LEVELS[severity],
+            source=source,
+            timestamp=run.last,
+            repeat_count=run.count,
+            first_timestamp=run.first if run.count > 1 else None,
+        )
+
+
+__all__ = ["COALESCE_MODES", "LogCoalescer"]
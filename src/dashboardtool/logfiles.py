@@ -0,0 +1,529 @@
+"""Dateizugriffe für Logdateien ("Logdatei": Textdatei mit Meldungen)."""
+
+from __future__ import annotations
+
+import gzip
+import os
+import re
+import shutil
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Set
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DURABILITY_MODES: tuple[str, ...] = ("none", "flush", "fsync")
+
+
+def iter_lines_reversed(
+    path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Liefert die Zeilen einer Datei vom Dateiende rückwärts.
+
+    Die Datei wird blockweise von hinten gelesen, sodass nur so viel Inhalt
+    dekodiert wird, wie der Aufrufer tatsächlich abruft.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size muss größer als 0 sein.")
+    with path.open("rb") as handle:
+        position = handle.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            handle.seek(position)
+            block = handle.read(read_size) + remainder
+            lines = block.split(b"\n")
+            # Das erste Stück kann unvollständig sein und wird mit dem nächsten
+            # (weiter vorne liegenden) Block zusammengesetzt.
+            remainder = lines[0]
+            for raw in reversed(lines[1:]):
+                if raw.strip():
+                    yield raw.decode("utf-8", errors="replace")
+        if remainder.strip():
+            yield remainder.decode("utf-8", errors="replace")
+
+
+@dataclass(frozen=True)
+class LogRotationPolicy:
+    """Regeln für das Aufteilen einer Logdatei in Segmente ("Rotation").
+
+    Die aktive Datei wird geschlossen und archiviert, sobald sie `max_bytes`
+    überschreiten würde oder älter als `max_age_seconds` ist (ein Wert von 0
+    schaltet die jeweilige Grenze ab). Es bleiben höchstens `max_segments`
+    Archive erhalten; sie werden auf Wunsch im Hintergrund mit gzip gepackt.
+    """
+
+    max_bytes: int = 0
+    max_segments: int = 5
+    max_age_seconds: float = 0.0
+    compress: bool = True
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.max_age_seconds > 0
+
+    def should_rotate(self, size: int, age_seconds: float, incoming: int) -> bool:
+        """Prüft, ob vor dem Schreiben von `incoming` Bytes rotiert werden muss."""
+
+        if size <= 0:
+            return False
+        if self.max_bytes > 0 and size + incoming > self.max_bytes:
+            return True
+        return self.max_age_seconds > 0 and age_seconds >= self.max_age_seconds
+
+
+def _segment_number(path: Path, segment: Path) -> int | None:
+    match = re.fullmatch(re.escape(path.name) + r"\.(\d+)(\.gz)?", segment.name)
+    return int(match.group(1)) if match else None
+
+
+def log_index_path(path: Path) -> Path:
+    """Beidatei mit dem Zeitindex einer Logdatei oder eines Segments.
+
+    Gepackte und entpackte Fassung eines Segments teilen sich eine Beidatei.
+    """
+
+    return path.with_name(path.name.removesuffix(".gz") + ".idx")
+
+
+def log_created_path(path: Path) -> Path:
+    """Beidatei mit dem Anlagezeitpunkt der aktiven Logdatei (Unix-Zeit)."""
+
+    return path.with_name(path.name + ".created")
+
+
+def _log_started_at(path: Path, size: int) -> float:
+    """Anlagezeitpunkt der Logdatei – auch über Neustarts des Programms hinweg.
+
+    Eine neue (leere) Datei bekommt die Beidatei `log_created_path`. Fehlt
+    sie bei einer bestehenden Datei, gilt die Anlagezeit laut Dateisystem
+    (sofern bekannt), sonst die letzte Änderung.
+    """
+
+    marker = log_created_path(path)
+    if size == 0:
+        now = time.time()
+        try:
+            marker.write_text(repr(now), encoding="utf-8")
+        except OSError:  # pragma: no cover - Schreibschutz
+            pass
+        return now
+    try:
+        return float(marker.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        stat = path.stat()
+        return getattr(stat, "st_birthtime", stat.st_mtime)
+
+
+def list_log_segments(path: Path) -> List[Path]:
+    """Liefert archivierte Segmente einer Logdatei, älteste zuerst.
+
+    Liegt ein Segment (z.B. während der Komprimierung) sowohl entpackt als
+    auch gepackt vor, wird nur die gepackte Fassung geliefert.
+    """
+
+    if not path.parent.exists():
+        return []
+    by_number: dict[int, Path] = {}
+    for candidate in path.parent.glob(path.name + ".*"):
+        number = _segment_number(path, candidate)
+        if number is None:
+            continue
+        known = by_number.get(number)
+        if known is None or candidate.suffix == ".gz":
+            by_number[number] = candidate
+    return [by_number[number] for number in sorted(by_number)]
+
+
+def remove_log_segments(path: Path) -> None:
+    """Entfernt alle archivierten Segmente einer Logdatei."""
+
+    wait_for_compression()
+    for segment in list_log_segments(path):
+        _remove_segment(segment)
+
+
+def _remove_segment(segment: Path) -> None:
+    segment.unlink(missing_ok=True)
+    segment.with_name(segment.name.removesuffix(".gz")).unlink(missing_ok=True)
+    log_index_path(segment).unlink(missing_ok=True)
+
+
+_compression_lock = threading.Lock()
+_compression_executor: ThreadPoolExecutor | None = None
+_compression_jobs: Set[Future] = set()
+
+
+def _compress_segment(segment: Path) -> None:
+    target = segment.with_name(segment.name + ".gz")
+    temporary = segment.with_name(segment.name + ".gz.tmp")
+    try:
+        with segment.open("rb") as source, gzip.open(temporary, "wb") as packed:
+            shutil.copyfileobj(source, packed)
+        os.replace(temporary, target)
+        segment.unlink(missing_ok=True)
+    except FileNotFoundError:
+        # Segment wurde inzwischen aufgeräumt (z.B. durch clear_events).
+        temporary.unlink(missing_ok=True)
+
+
+def _prune_segments(path: Path, max_segments: int) -> None:
+    segments = list_log_segments(path)
+    for old in segments[: max(0, len(segments) - max_segments)]:
+        _remove_segment(old)
+
+
+def _archive_segment(path: Path, segment: Path, policy: LogRotationPolicy) -> None:
+    _compress_segment(segment)
+    _prune_segments(path, policy.max_segments)
+
+
+def _schedule_archiving(path: Path, segment: Path, policy: LogRotationPolicy) -> None:
+    # Ein einzelner Hintergrund-Thread arbeitet die Aufträge der Reihe nach ab,
+    # dadurch kommen sich Komprimieren und Aufräumen nie in die Quere.
+    global _compression_executor
+    with _compression_lock:
+        if _compression_executor is None:
+            _compression_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="dashboardtool-log-gzip"
+            )
+        job = _compression_executor.submit(_archive_segment, path, segment, policy)
+        _compression_jobs.add(job)
+    job.add_done_callback(_compression_jobs.discard)
+
+
+def wait_for_compression() -> None:
+    """Wartet, bis alle laufenden Hintergrund-Komprimierungen fertig sind."""
+
+    with _compression_lock:
+        jobs = list(_compression_jobs)
+    for job in jobs:
+        job.result()
+
+
+def rotate_log_file(path: Path, policy: LogRotationPolicy) -> Path | None:
+    """Archiviert die aktive Logdatei als neues Segment und räumt alte auf."""
+
+    if not path.exists():
+        return None
+    segments = list_log_segments(path)
+    numbers = [_segment_number(path, segment) or 0 for segment in segments]
+    segment = path.with_name(f"{path.name}.{max(numbers, default=0) + 1}")
+    os.replace(path, segment)
+    # Der Zeitindex wandert mit, er bleibt für das Segment gültig.
+    if log_index_path(path).exists():
+        os.replace(log_index_path(path), log_index_path(segment))
+    if policy.max_segments <= 0:
+        _remove_segment(segment)
+        return None
+    if policy.compress:
+        _schedule_archiving(path, segment, policy)
+    else:
+        _prune_segments(path, policy.max_segments)
+    return segment
+
+
+def read_log_file(path: Path) -> bytes:
+    """Liest eine Logdatei oder ein Segment vollständig (gzip wird entpackt).
+
+    Fehlt ein entpacktes Segment, weil es gerade im Hintergrund gepackt wurde,
+    wird die gepackte Fassung gelesen; fehlen beide, ist das Ergebnis leer.
+    """
+
+    if not path.exists() and path.suffix != ".gz":
+        path = path.with_name(path.name + ".gz")
+    opener = gzip.open if path.suffix == ".gz" else open
+    try:
+        with opener(path, "rb") as handle:
+            return handle.read()
+    except FileNotFoundError:
+        return b""
+
+
+def _read_segment_lines(segment: Path) -> List[str]:
+    data = read_log_file(segment)
+    return [
+        raw.decode("utf-8", errors="replace")
+        for raw in data.split(b"\n")
+        if raw.strip()
+    ]
+
+
+def iter_log_lines_reversed(path: Path) -> Iterator[str]:
+    """Liefert Zeilen der aktiven Datei und ihrer Segmente, neueste zuerst.
+
+    Archivierte Segmente werden erst gelesen, wenn der Aufrufer über die
+    aktive Datei hinaus weitere Zeilen anfordert.
+    """
+
+    if path.exists():
+        yield from iter_lines_reversed(path)
+    for segment in reversed(list_log_segments(path)):
+        if segment.suffix != ".gz":
+            try:
+                yield from iter_lines_reversed(segment)
+                continue
+            except FileNotFoundError:
+                pass  # Wurde inzwischen gepackt.
+        yield from reversed(_read_segment_lines(segment))
+
+
+def iter_log_files(path: Path) -> Iterator[Path]:
+    """Liefert alle Segmente und zuletzt die aktive Datei in zeitlicher Folge."""
+
+    yield from list_log_segments(path)
+    if path.exists():
+        yield path
+
+
+def copy_log_history(path: Path, destination: BinaryIO) -> None:
+    """Schreibt alle Segmente und die aktive Datei entpackt in `destination`."""
+
+    for segment in iter_log_files(path):
+        opener = gzip.open if segment.suffix == ".gz" else open
+        try:
+            with opener(segment, "rb") as handle:
+                shutil.copyfileobj(handle, destination)
+        except FileNotFoundError:
+            continue
+
+
+class _WriterState:
+    """Offener Dateizugriff und wartende Zeilen eines `LogFileWriter`.
+
+    Liegt in einem eigenen Objekt, damit beim Beenden des Programms noch
+    ausstehende Zeilen geschrieben werden können, ohne den Writer selbst
+    am Leben zu halten.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        durability: str,
+        rotation: LogRotationPolicy | None,
+        preamble: Callable[[], bytes] | None = None,
+        complete_length: Callable[[bytes], int] | None = None,
+    ) -> None:
+        self.path = path
+        self.durability = durability
+        self.rotation = rotation
+        self.preamble = preamble
+        self.complete_length = complete_length
+        self.handle: BinaryIO | None = None
+        self.size = 0
+        self.started_at = 0.0
+        self.pending: List[bytes] = []
+        self.pending_bytes = 0
+
+    def open(self) -> BinaryIO:
+        if self.handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.handle = self.path.open("ab")
+            self.size = self.handle.tell()
+            if self.size and self.complete_length is not None:
+                self._cut_torn_tail(self.handle)
+            # Das Alter zählt ab Anlage der Datei, nicht ab dem Öffnen.
+            self.started_at = _log_started_at(self.path, self.size)
+        return self.handle
+
+    def _cut_torn_tail(self, handle: BinaryIO) -> None:
+        # Abgebrochenen Datensatz abschneiden, sonst hinge der nächste an.
+        assert self.complete_length is not None
+        complete = self.complete_length(self.path.read_bytes())
+        if complete < self.size:
+            handle.truncate(complete)
+            self.size = complete
+
+    def write_pending(self) -> None:
+        if not self.pending:
+            return
+        handle = self.open()
+        rotation = self.rotation
+        if rotation is not None and rotation.should_rotate(
+            self.size, time.time() - self.started_at, self.pending_bytes
+        ):
+            handle.close()
+            self.handle = None
+            rotate_log_file(self.path, rotation)
+            handle = self.open()
+        if self.size == 0 and self.preamble is not None:
+            header = self.preamble()
+            handle.write(header)
+            self.size += len(header)
+        handle.write(b"".join(self.pending))
+        self.size += self.pending_bytes
+        self.pending.clear()
+        self.pending_bytes = 0
+        if self.durability != "none":
+            self.handle.flush()
+        if self.durability == "fsync":
+            os.fsync(self.handle.fileno())
+
+    def close(self) -> None:
+        try:
+            self.write_pending()
+        finally:
+            if self.handle is not None:
+                self.handle.close()
+                self.handle = None
+
+
+class LogFileWriter:
+    """Langlebiger, gepufferter Schreiber für Logdateien.
+
+    Zeilen werden gesammelt und gemeinsam geschrieben ("Group Commit"), sobald
+    `max_batch_lines` oder `max_batch_bytes` erreicht sind oder die älteste
+    wartende Zeile älter als `max_delay_seconds` ist. `durability` legt fest,
+    wie sicher ein geschriebener Block ist:
+
+    - ``none``: nur in den Dateipuffer von Python schreiben,
+    - ``flush``: an das Betriebssystem übergeben,
+    - ``fsync``: zusätzlich auf den Datenträger zwingen.
+
+    `preamble` liefert bei Bedarf einen Dateikopf, der vor die ersten Daten
+    jeder neuen (leeren) Datei geschrieben wird, auch nach einer Rotation.
+    `complete_length` nennt für den Inhalt einer bestehenden Datei die Länge
+    der vollständigen Datensätze; ein abgebrochener Rest am Ende (Absturz
+    beim Schreiben) wird beim Öffnen abgeschnitten.
+
+    Die Frist `max_delay_seconds` überwacht ein Zeitgeber ("Timer"): Kommt
+    keine weitere Zeile, werden wartende Zeilen spätestens dann geschrieben.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_batch_lines: int = 1,
+        max_batch_bytes: int = 64 * 1024,
+        max_delay_seconds: float = 1.0,
+        durability: str = "flush",
+        rotation: LogRotationPolicy | None = None,
+        preamble: Callable[[], bytes] | None = None,
+        complete_length: Callable[[bytes], int] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                "Unbekannter Haltbarkeitsmodus. Erlaubt sind: "
+                + ", ".join(DURABILITY_MODES)
+            )
+        if max_batch_lines <= 0 or max_batch_bytes <= 0:
+            raise ValueError("Batch-Grenzen müssen größer als 0 sein.")
+        self.path = Path(path)
+        self.max_batch_lines = max_batch_lines
+        self.max_batch_bytes = max_batch_bytes
+        self.max_delay_seconds = max(0.0, max_delay_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._oldest_pending: float | None = None
+        self._timer: threading.Timer | None = None
+        if rotation is not None and not rotation.enabled:
+            rotation = None
+        self._state = _WriterState(
+            self.path, durability, rotation, preamble, complete_length
+        )
+        self._finalizer = weakref.finalize(self, self._state.close)
+
+    @property
+    def durability(self) -> str:
+        return self._state.durability
+
+    @property
+    def pending_lines(self) -> int:
+        """Anzahl der Zeilen, die noch nicht geschrieben wurden."""
+
+        return len(self._state.pending)
+
+    def write(self, data: bytes) -> None:
+        """Reiht eine fertig kodierte Zeile ein und schreibt bei Bedarf."""
+
+        with self._lock:
+            state = self._state
+            now = self._clock()
+            if self._oldest_pending is None:
+                self._oldest_pending = now
+            state.pending.append(data)
+            state.pending_bytes += len(data)
+            if (
+                len(state.pending) >= self.max_batch_lines
+                or state.pending_bytes >= self.max_batch_bytes
+                or now - self._oldest_pending >= self.max_delay_seconds
+            ):
+                self._write_batch()
+            elif self._timer is None:
+                self._start_timer()
+
+    def flush(self) -> None:
+        """Schreibt alle wartenden Zeilen sofort."""
+
+        with self._lock:
+            self._write_batch()
+
+    def close(self) -> None:
+        """Schreibt ausstehende Zeilen und schließt die Datei."""
+
+        with self._lock:
+            self._cancel_timer()
+            self._state.close()
+            self._oldest_pending = None
+
+    def discard(self) -> None:
+        """Verwirft wartende Zeilen und schließt die Datei (z.B. vor dem Löschen)."""
+
+        with self._lock:
+            self._state.pending.clear()
+            self._state.pending_bytes = 0
+            self._cancel_timer()
+            self._state.close()
+            self._oldest_pending = None
+
+    def _write_batch(self) -> None:
+        self._cancel_timer()
+        self._state.write_pending()
+        self._oldest_pending = None
+
+    def _start_timer(self) -> None:
+        timer = threading.Timer(self.max_delay_seconds, self._write_when_due)
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write_when_due(self) -> None:
+        with self._lock:
+            if self._timer is not threading.current_thread():
+                return  # inzwischen geschrieben oder neu geplant
+            self._timer = None
+            try:
+                self._write_batch()
+            except OSError:  # pragma: no cover - nächster Versuch beim Schreiben
+                pass
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "DURABILITY_MODES",
+    "LogFileWriter",
+    "LogRotationPolicy",
+    "copy_log_history",
+    "iter_lines_reversed",
+    "iter_log_files",
+    "iter_log_lines_reversed",
+    "list_log_segments",
+    "log_created_path",
+    "log_index_path",
+    "read_log_file",
+    "remove_log_segments",
+    "rotate_log_file",
+    "wait_for_compression",
+]
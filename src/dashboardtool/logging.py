@@ -2,42 +2,248 @@
 
 from __future__ import annotations
 
+import heapq
 import json
+import math
+import struct
+import threading
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import deque
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Deque, Dict, Iterable, List
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from itertools import islice
+from operator import attrgetter
+from queue import Empty, SimpleQueue
+from typing import Any, Callable, Deque, Dict, Iterator, List, Sequence, Tuple
 
 LOG_LEVELS: tuple[str, ...] = ("debug", "info", "warning", "error", "critical")
+LEVEL_SEVERITY: Dict[str, int] = {
+    level: index for index, level in enumerate(LOG_LEVELS)
+}
+"""Ordnet jeder Log-Stufe eine kleine Ganzzahl zu ("Schweregrad": 0 = debug)."""
+
+
+def level_severity(level: str) -> int:
+    """Wandelt eine Log-Stufe in ihren Schweregrad um."""
+
+    severity = LEVEL_SEVERITY.get(level)
+    if severity is None:
+        severity = LEVEL_SEVERITY.get(level.lower())
+        if severity is None:
+            raise ValueError(
+                "Unbekannte Log-Stufe. Erlaubt sind: " + ", ".join(LOG_LEVELS)
+            )
+    return severity
 
 
 @dataclass(frozen=True)
 class LogEntry:
-    """Ein einzelner Logeintrag mit Zeitstempel."""
+    """Ein einzelner Logeintrag mit Zeitstempel.
+
+    Fasst der Eintrag eine Serie gleicher Meldungen zusammen (siehe
+    `logcoalesce`), nennt `repeat_count` deren Anzahl und `first_timestamp`
+    den Zeitpunkt der ersten; `timestamp` ist dann der der letzten Meldung.
+    """
 
     timestamp: datetime
     level: str
     message: str
     source: str
+    sequence: int = field(default=0, compare=False)
+    repeat_count: int = 1
+    first_timestamp: datetime | None = None
 
-    def to_dict(self) -> Dict[str, str]:
-        """Konvertiert den Eintrag in eine speicherbare Darstellung."""
+    @property
+    def severity(self) -> int:
+        """Schweregrad der Stufe als Ganzzahl (siehe `LEVEL_SEVERITY`)."""
 
-        return {
+        return LEVEL_SEVERITY[self.level]
+
+    @cached_property
+    def _payload(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
             "timestamp": self.timestamp.replace(microsecond=0).isoformat(),
             "level": self.level,
             "message": self.message,
             "source": self.source,
         }
+        if self.repeat_count > 1:
+            # Nur bei Serien, damit einzelne Zeilen so kurz bleiben wie bisher.
+            payload["repeat_count"] = self.repeat_count
+            first = self.first_timestamp or self.timestamp
+            payload["first_timestamp"] = first.replace(microsecond=0).isoformat()
+        return payload
+
+    @cached_property
+    def json_line(self) -> bytes:
+        """Fertig kodierte JSON-Zeile (UTF-8, mit Zeilenumbruch) für Dateien.
+
+        Wird beim ersten Zugriff erzeugt und danach wiederverwendet, ebenso
+        wie die Darstellung aus `to_dict`.
+        """
+
+        return (json.dumps(self._payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Konvertiert den Eintrag in eine speicherbare Darstellung (als Kopie)."""
 
+        return dict(self._payload)
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "LogEntry":
+        """Baut einen Eintrag aus einer gespeicherten Darstellung (siehe `to_dict`).
+
+        Fehlende Felder werden ergänzt, ein unlesbarer Zeitstempel durch die
+        aktuelle Zeit ersetzt; eine unbekannte Stufe löst ValueError aus.
+        """
+
+        level = LOG_LEVELS[level_severity(str(payload.get("level", "info")))]
+        repeat_count = payload.get("repeat_count", 1)
+        if not isinstance(repeat_count, int) or repeat_count < 1:
+            repeat_count = 1
+        return cls(
+            timestamp=_parse_timestamp(payload.get("timestamp")) or datetime.utcnow(),
+            level=level,
+            message=str(payload.get("message", "Unbekannte Meldung")),
+            source=str(payload.get("source", "dashboard")),
+            repeat_count=repeat_count,
+            first_timestamp=(
+                _parse_timestamp(payload.get("first_timestamp"))
+                if repeat_count > 1
+                else None
+            ),
+        )
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class LogFeed:
+    """Ergebnis einer Cursor-Abfrage ("Cursor": Lesezeichen im Protokoll)."""
+
+    entries: List[LogEntry]
+    cursor: int
+    truncated: bool = False
+    has_more: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "entries": [
+                {**entry._payload, "sequence": entry.sequence} for entry in self.entries
+            ],
+            "cursor": self.cursor,
+            "truncated": self.truncated,
+            "has_more": self.has_more,
+        }
 
-class LogBuffer:
-    """Begrenzt wachsendes Protokoll mit Komfortfunktionen."""
+
+class LogBufferListener:
+    """Empfängt Änderungen eines Logpuffers (z.B. für Such- oder Zählindizes).
+
+    Alle Methoden werden unter der Sperre des Puffers aufgerufen und sollten
+    daher schnell sein.
+    """
+
+    def on_add(self, entry: LogEntry) -> None:
+        """Ein Eintrag wurde hinzugefügt."""
+
+    def on_evict(self, entry: LogEntry) -> None:
+        """Ein Eintrag ist aus dem Ring herausgefallen."""
+
+    def on_clear(self) -> None:
+        """Der Puffer wurde geleert."""
+
+
+class BaseLogBuffer:
+    """Gemeinsame Schnittstelle aller Logpuffer-Varianten.
+
+    Unterklassen legen nur fest, wie Einträge gespeichert werden
+    (`_store`, `_newest`, `_filter`, `_reset`); Zählungen, Cursor-Abfragen
+    und Exporte bauen darauf auf. Alle öffentlichen Methoden sind durch eine
+    Sperre ("Lock") geschützt und dürfen aus mehreren Threads genutzt werden;
+    Lesezugriffe liefern stets eine in sich stimmige Momentaufnahme.
+
+    Für Zeitraum-Abfragen (`between`) führt die Basisklasse eine Zeitspalte
+    (Sekunden seit 1970, UTC) im selben Ring mit. Daneben steht der bisher
+    höchste Zeitstempel ("Hochwassermarke"), der auch bei Nachzüglern nie
+    sinkt und daher per Binärsuche durchsucht werden kann. Einträge, deren
+    Zeitstempel älter als die Marke ist ("Nachzügler", etwa beim Einlesen
+    alter Dateien), werden zusätzlich in einer eigenen Liste geführt.
+    """
 
     def __init__(self, max_entries: int = 100) -> None:
         if max_entries <= 0:
             raise ValueError("max_entries muss größer als 0 sein.")
-        self._entries: Deque[LogEntry] = deque(maxlen=max_entries)
+        self._max_entries = max_entries
+        self._next_sequence = 1
+        self._lock = threading.RLock()
+        self._listeners: List[LogBufferListener] = []
+        self._timestamps = array("d", bytes(8 * max_entries))
+        self._high_water = array("d", bytes(8 * max_entries))
+        self._late = array("b", bytes(max_entries))
+        self._late_sequences: Deque[int] = deque()
+        self._latest = -math.inf
+
+    @property
+    def max_entries(self) -> int:
+        """Maximale Anzahl an Einträgen im Ringpuffer."""
+
+        return self._max_entries
+
+    @property
+    def last_sequence(self) -> int:
+        """Laufnummer des zuletzt hinzugefügten Eintrags (0 = noch keiner)."""
+
+        return self._next_sequence - 1
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Sperre, um mehrere Aufrufe als eine Einheit auszuführen."""
+
+        return self._lock
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def add_listener(self, listener: LogBufferListener) -> None:
+        """Meldet einen Beobachter an und spielt vorhandene Einträge nach."""
+
+        with self._lock:
+            for entry in self._newest(len(self)):
+                listener.on_add(entry)
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: LogBufferListener) -> None:
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def get(self, sequence: int) -> LogEntry | None:
+        """Liefert den Eintrag mit der Laufnummer oder None, falls verdrängt."""
+
+        with self._lock:
+            first = self._next_sequence - len(self)
+            if sequence < first or sequence >= self._next_sequence:
+                return None
+            return self._at(sequence - first)
+
+    def peek(self, sequence: int) -> Tuple[int, str] | None:
+        """Schweregrad und Quelle eines Eintrags, ohne ihn vollständig zu laden."""
+
+        with self._lock:
+            first = self._next_sequence - len(self)
+            if sequence < first or sequence >= self._next_sequence:
+                return None
+            return self._peek_at(sequence - first)
 
     def add(
         self,
@@ -45,53 +251,783 @@ class LogBuffer:
         level: str = "info",
         source: str = "dashboard",
         timestamp: datetime | None = None,
+        *,
+        repeat_count: int = 1,
+        first_timestamp: datetime | None = None,
     ) -> LogEntry:
-        level_normalized = level.lower()
-        if level_normalized not in LOG_LEVELS:
-            raise ValueError(
-                "Unbekannte Log-Stufe. Erlaubt sind: " + ", ".join(LOG_LEVELS)
+        severity = level_severity(level)
+        if repeat_count < 1:
+            raise ValueError("repeat_count muss mindestens 1 sein.")
+        moment = timestamp or datetime.utcnow()
+        with self._lock:
+            entry = LogEntry(
+                timestamp=moment,
+                level=LOG_LEVELS[severity],
+                message=message,
+                source=source,
+                sequence=self._next_sequence,
+                repeat_count=repeat_count,
+                first_timestamp=first_timestamp if repeat_count > 1 else None,
             )
-        entry = LogEntry(
-            timestamp=timestamp or datetime.utcnow(),
-            level=level_normalized,
-            message=message,
-            source=source,
-        )
-        self._entries.append(entry)
+            listeners = self._listeners
+            slot = (entry.sequence - 1) % self._max_entries
+            if len(self) == self._max_entries:
+                if listeners:
+                    evicted = self._at(0)
+                    for listener in listeners:
+                        listener.on_evict(evicted)
+                if self._late[slot]:
+                    self._late_sequences.popleft()
+            self._store(entry, severity)
+            self._record_time(slot, entry)
+            self._next_sequence += 1
+            for listener in listeners:
+                listener.on_add(entry)
         return entry
 
     def entries(self) -> List[LogEntry]:
         """Gibt aktuelle Einträge als Liste zurück."""
 
-        return list(self._entries)
+        with self._lock:
+            return self._newest(len(self))
 
-    def as_dicts(self) -> List[Dict[str, str]]:
+    def as_dicts(self) -> List[Dict[str, Any]]:
         """Gibt Einträge als JSON-kompatible Objekte zurück."""
 
-        return [entry.to_dict() for entry in self._entries]
+        return [entry.to_dict() for entry in self.entries()]
 
     def filter_by_level(self, minimum_level: str) -> List[LogEntry]:
         """Filtert Einträge nach Mindeststufe."""
 
-        minimum = minimum_level.lower()
-        if minimum not in LOG_LEVELS:
-            raise ValueError(
-                "Unbekannte Log-Stufe. Erlaubt sind: " + ", ".join(LOG_LEVELS)
-            )
-        allowed: Iterable[str] = LOG_LEVELS[LOG_LEVELS.index(minimum) :]
-        return [entry for entry in self._entries if entry.level in allowed]
+        return self.filter_by_severity(level_severity(minimum_level))
+
+    def filter_by_severity(self, minimum: int) -> List[LogEntry]:
+        """Filtert Einträge nach Mindest-Schweregrad."""
+
+        with self._lock:
+            if minimum <= 0:
+                return self._newest(len(self))
+            return self._filter(minimum)
+
+    def count_by_level(self, level: str) -> int:
+        """Anzahl der Einträge genau dieser Stufe."""
+
+        return self._severity_counts()[level_severity(level)]
+
+    def count_at_least(self, minimum_level: str) -> int:
+        """Anzahl der Einträge ab der angegebenen Stufe."""
+
+        return sum(self._severity_counts()[level_severity(minimum_level) :])
+
+    def level_counts(self) -> Dict[str, int]:
+        """Anzahl der Einträge je Stufe."""
+
+        return dict(zip(LOG_LEVELS, self._severity_counts()))
+
+    def since(self, cursor: int, limit: int | None = None) -> LogFeed:
+        """Liefert nur Einträge, die nach `cursor` hinzugekommen sind.
+
+        Der Cursor ist die Laufnummer des zuletzt gesehenen Eintrags. Liegt er
+        vor dem ältesten Eintrag im Ring (oder hinter dem neuesten, etwa nach
+        einem Neustart), wird `truncated` gesetzt und ab dem ältesten
+        vorhandenen Eintrag geliefert.
+        """
+
+        with self._lock:
+            last = self.last_sequence
+            first = last - len(self) + 1
+            truncated = cursor < first - 1 or cursor > last
+            start = first if truncated else cursor + 1
+            fresh = self._newest(last - start + 1)
+        has_more = limit is not None and len(fresh) > max(0, limit)
+        if has_more:
+            fresh = fresh[: max(0, limit)]
+        next_cursor = fresh[-1].sequence if fresh else max(start - 1, 0)
+        return LogFeed(
+            entries=fresh, cursor=next_cursor, truncated=truncated, has_more=has_more
+        )
+
+    def between(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        *,
+        limit: int | None = None,
+    ) -> List[LogEntry]:
+        """Einträge mit Zeitstempel von `start` bis `end` (beide einschließlich).
+
+        Fehlt eine Grenze, ist der Zeitraum auf dieser Seite offen. Das
+        Ergebnis steht in Einfügereihenfolge; bei `limit` werden die jüngsten
+        Treffer geliefert. Ohne Nachzügler kostet die Suche nur zwei
+        Binärsuchen plus das Kopieren der Treffer.
+        """
+
+        low = _to_epoch(start) if start is not None else -math.inf
+        high = _to_epoch(end) if end is not None else math.inf
+        if low > high or (limit is not None and limit <= 0):
+            return []
+        with self._lock:
+            first = self._next_sequence - len(self)
+            sequences = self._sequences_between(first, low, high)
+            if limit is not None:
+                sequences = sequences[-limit:]
+            return [self._at(sequence - first) for sequence in sequences]
 
     def clear(self) -> None:
         """Leert den Zwischenspeicher."""
 
-        self._entries.clear()
+        with self._lock:
+            self._reset()
+            self._late_sequences.clear()
+            self._latest = -math.inf
+            for listener in self._listeners:
+                listener.on_clear()
+
+    def json_lines(self) -> List[bytes]:
+        """Kodierte JSON-Zeilen aller Einträge (siehe `LogEntry.json_line`)."""
+
+        return [entry.json_line for entry in self.entries()]
 
     def export_json_lines(self) -> str:
         """Gibt alle Einträge als JSON-Zeilen zurück."""
 
-        return "\n".join(
-            json.dumps(entry.to_dict(), ensure_ascii=False) for entry in self._entries
+        return b"".join(self.json_lines()).decode("utf-8").removesuffix("\n")
+
+    def _record_time(self, slot: int, entry: LogEntry) -> None:
+        moment = _to_epoch(entry.timestamp)
+        if moment < self._latest:
+            self._late[slot] = 1
+            self._late_sequences.append(entry.sequence)
+        else:
+            self._late[slot] = 0
+            self._latest = moment
+        self._timestamps[slot] = moment
+        self._high_water[slot] = self._latest
+
+    def _sequences_between(self, first: int, low: float, high: float) -> Sequence[int]:
+        """Laufnummern im Zeitraum (unter der Sperre rufen).
+
+        Pünktliche Einträge tragen genau die Hochwassermarke als Zeitstempel;
+        die Binärsuche über die Marke liefert daher den Bereich, in dem sie
+        liegen. Nachzügler werden einzeln geprüft.
+        """
+
+        size = len(self)
+        offset = first - 1
+        marks = _RingColumn(self._high_water, offset)
+        lower = bisect_left(marks, low, 0, size)
+        upper = bisect_right(marks, high, lower, size)
+        if not self._late_sequences:
+            return range(first + lower, first + upper)
+        times = self._timestamps
+        capacity = self._max_entries
+        inside = [
+            first + index
+            for index in range(lower, upper)
+            if low <= times[(offset + index) % capacity] <= high
+        ]
+        stragglers = [
+            sequence
+            for sequence in self._late_sequences
+            if not first + lower <= sequence < first + upper
+            and low <= times[(sequence - 1) % capacity] <= high
+        ]
+        if not stragglers:
+            return inside
+        return list(heapq.merge(inside, stragglers))
+
+    # ------------------------------------------------------------------
+    # Speicherprimitive der Unterklassen (werden unter der Sperre gerufen)
+    # ------------------------------------------------------------------
+    def _store(self, entry: LogEntry, severity: int) -> None:
+        raise NotImplementedError
+
+    def _newest(self, count: int) -> List[LogEntry]:
+        """Die jüngsten `count` Einträge in Einfügereihenfolge."""
+
+        raise NotImplementedError
+
+    def _at(self, index: int) -> LogEntry:
+        """Eintrag an Position `index` (0 = ältester Eintrag im Ring)."""
+
+        raise NotImplementedError
+
+    def _peek_at(self, index: int) -> Tuple[int, str]:
+        entry = self._at(index)
+        return entry.severity, entry.source
+
+    def _filter(self, minimum: int) -> List[LogEntry]:
+        raise NotImplementedError
+
+    def _reset(self) -> None:
+        raise NotImplementedError
+
+    def _severity_counts(self) -> List[int]:
+        raise NotImplementedError
+
+
+class LogBuffer(BaseLogBuffer):
+    """Begrenzt wachsendes Protokoll mit Komfortfunktionen.
+
+    Neben dem Ringpuffer hält der Puffer pro Schweregrad eine eigene Liste
+    ("Index") in Einfügereihenfolge. Zählungen und Filter wie "Warnung und
+    höher" müssen dadurch nicht mehr alle Einträge durchsuchen.
+    """
+
+    def __init__(self, max_entries: int = 100) -> None:
+        super().__init__(max_entries)
+        self._entries: Deque[LogEntry] = deque(maxlen=max_entries)
+        self._by_level: Tuple[Deque[LogEntry], ...] = tuple(deque() for _ in LOG_LEVELS)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> List[LogEntry]:
+        """Gibt aktuelle Einträge als Liste zurück."""
+
+        with self._lock:
+            return list(self._entries)
+
+    def _store(self, entry: LogEntry, severity: int) -> None:
+        entries = self._entries
+        if len(entries) == entries.maxlen:
+            self._by_level[entries[0].severity].popleft()
+        entries.append(entry)
+        self._by_level[severity].append(entry)
+
+    def _filter(self, minimum: int) -> List[LogEntry]:
+        indexes = [index for index in self._by_level[minimum:] if index]
+        if not indexes:
+            return []
+        if len(indexes) == 1:
+            return list(indexes[0])
+        return list(heapq.merge(*indexes, key=_sequence_of))
+
+    def _reset(self) -> None:
+        self._entries.clear()
+        for index in self._by_level:
+            index.clear()
+
+    def _at(self, index: int) -> LogEntry:
+        return self._entries[index]
+
+    def _newest(self, count: int) -> List[LogEntry]:
+        fresh = list(islice(reversed(self._entries), max(0, count)))
+        fresh.reverse()
+        return fresh
+
+    def _severity_counts(self) -> List[int]:
+        with self._lock:
+            return [len(index) for index in self._by_level]
+
+
+class ColumnarLogBuffer(BaseLogBuffer):
+    """Speichersparender Ringpuffer in Spaltenform ("columnar").
+
+    Statt eines Objekts pro Eintrag liegen Zeitstempel (Sekunden seit 1970,
+    UTC), Schweregrade und Quellen-Kennungen in kompakten `array`-Spalten;
+    Quellnamen werden nur einmal gespeichert ("interniert"). `LogEntry`-Objekte
+    entstehen erst beim Lesen. Zeitstempel mit Zeitzone werden dabei als
+    UTC ohne Zeitzonenangabe zurückgegeben.
+    """
+
+    def __init__(self, max_entries: int = 100) -> None:
+        super().__init__(max_entries)
+        # Die Zeitspalte `_timestamps` stellt bereits die Basisklasse bereit.
+        self._levels = array("b", bytes(max_entries))
+        self._sources = array("i", bytes(4 * max_entries))
+        self._messages: List[str | None] = [None] * max_entries
+        # Kodierte JSON-Zeilen, erst bei Bedarf gefüllt (siehe `json_lines`).
+        self._lines: List[bytes | None] = [None] * max_entries
+        # Serien sind selten: Fach → (Anzahl, erster Zeitpunkt) nur bei Bedarf.
+        self._repeats: Dict[int, Tuple[int, datetime | None]] = {}
+        self._source_ids: Dict[str, int] = {}
+        self._source_names: List[str] = []
+        self._counts = [0] * len(LOG_LEVELS)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _store(self, entry: LogEntry, severity: int) -> None:
+        slot = (entry.sequence - 1) % self._max_entries
+        if self._size == self._max_entries:
+            self._counts[self._levels[slot]] -= 1
+        else:
+            self._size += 1
+        source_id = self._source_ids.get(entry.source)
+        if source_id is None:
+            source_id = self._source_ids[entry.source] = len(self._source_names)
+            self._source_names.append(entry.source)
+        self._levels[slot] = severity
+        self._sources[slot] = source_id
+        self._messages[slot] = entry.message
+        self._lines[slot] = None
+        if entry.repeat_count > 1:
+            self._repeats[slot] = (entry.repeat_count, entry.first_timestamp)
+        elif self._repeats:
+            self._repeats.pop(slot, None)
+        self._counts[severity] += 1
+
+    def _filter(self, minimum: int) -> List[LogEntry]:
+        levels = self._levels
+        capacity = self._max_entries
+        return [
+            self._entry_at(sequence)
+            for sequence in self._sequences()
+            if levels[(sequence - 1) % capacity] >= minimum
+        ]
+
+    def json_lines(self) -> List[bytes]:
+        """Kodierte JSON-Zeilen; einmal kodierte Zeilen werden wiederverwendet."""
+
+        with self._lock:
+            lines = self._lines
+            capacity = self._max_entries
+            encoded: List[bytes] = []
+            for sequence in self._sequences():
+                slot = (sequence - 1) % capacity
+                line = lines[slot]
+                if line is None:
+                    line = lines[slot] = self._entry_at(sequence).json_line
+                encoded.append(line)
+            return encoded
+
+    def _reset(self) -> None:
+        self._messages = [None] * self._max_entries
+        self._lines = [None] * self._max_entries
+        self._repeats.clear()
+        self._counts = [0] * len(LOG_LEVELS)
+        self._size = 0
+
+    def _sequences(self) -> range:
+        return range(self._next_sequence - self._size, self._next_sequence)
+
+    def _entry_at(self, sequence: int) -> LogEntry:
+        slot = (sequence - 1) % self._max_entries
+        repeat_count, first_timestamp = self._repeats.get(slot, (1, None))
+        return LogEntry(
+            timestamp=_EPOCH + timedelta(seconds=self._timestamps[slot]),
+            level=LOG_LEVELS[self._levels[slot]],
+            message=self._messages[slot] or "",
+            source=self._source_names[self._sources[slot]],
+            sequence=sequence,
+            repeat_count=repeat_count,
+            first_timestamp=first_timestamp,
+        )
+
+    def _at(self, index: int) -> LogEntry:
+        return self._entry_at(self._next_sequence - self._size + index)
+
+    def _peek_at(self, index: int) -> Tuple[int, str]:
+        slot = (self._next_sequence - self._size + index - 1) % self._max_entries
+        return self._levels[slot], self._source_names[self._sources[slot]]
+
+    def _newest(self, count: int) -> List[LogEntry]:
+        count = min(max(0, count), self._size)
+        return [
+            self._entry_at(sequence)
+            for sequence in range(self._next_sequence - count, self._next_sequence)
+        ]
+
+    def _severity_counts(self) -> List[int]:
+        with self._lock:
+            return list(self._counts)
+
+
+LogSink = Callable[[LogEntry], None]
+
+
+class LogIngestor:
+    """Nimmt Logeinträge aus vielen Threads entgegen ("Ingestion": Aufnahme).
+
+    Erzeuger-Threads legen Einträge nur in eine Warteschlange und warten nie
+    auf den Puffer. Ein einzelner Hintergrund-Thread überträgt die Einträge
+    blockweise in den Puffer und reicht sie danach an die `sinks` weiter
+    (z.B. den Datei-Writer). `flush()` wartet, bis alles übertragen ist.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        buffer: BaseLogBuffer,
+        *,
+        sinks: Sequence[LogSink] = (),
+        batch_size: int = 512,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size muss größer als 0 sein.")
+        self.buffer = buffer
+        self.sinks: List[LogSink] = list(sinks)
+        self.batch_size = batch_size
+        self._queue: SimpleQueue[Any] = SimpleQueue()
+        self._errors: List[BaseException] = []
+        # Der Thread erhält nur die Bausteine, nicht den Ingestor selbst; so
+        # kann dieser freigegeben werden und den Thread dabei beenden.
+        self._thread = threading.Thread(
+            target=LogIngestor._run,
+            args=(self._queue, buffer, self.sinks, batch_size, self._errors),
+            name="dashboardtool-log-ingest",
+            daemon=True,
+        )
+        self._thread.start()
+        self._finalizer = weakref.finalize(
+            self, LogIngestor._shutdown, self._queue, self._thread
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def submit(
+        self,
+        message: str,
+        level: str = "info",
+        source: str = "dashboard",
+        timestamp: datetime | None = None,
+        *,
+        repeat_count: int = 1,
+        first_timestamp: datetime | None = None,
+    ) -> None:
+        """Reiht einen Eintrag ein; ungültige Angaben fallen sofort auf."""
+
+        severity = level_severity(level)
+        if repeat_count < 1:
+            raise ValueError("repeat_count muss mindestens 1 sein.")
+        if not self.running:
+            raise RuntimeError("Die Log-Aufnahme wurde bereits beendet.")
+        self._queue.put(
+            (
+                message,
+                LOG_LEVELS[severity],
+                source,
+                timestamp or datetime.utcnow(),
+                repeat_count,
+                first_timestamp,
+            )
+        )
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wartet, bis alle bisher eingereihten Einträge übertragen sind."""
+
+        if not self.running:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Überträgt ausstehende Einträge und beendet den Hintergrund-Thread."""
+
+        self._finalizer()
+
+    def take_errors(self) -> List[BaseException]:
+        """Liefert (und leert) Fehler, die beim Weiterreichen auftraten."""
+
+        errors = list(self._errors)
+        del self._errors[: len(errors)]
+        return errors
+
+    @staticmethod
+    def _shutdown(queue: SimpleQueue[Any], thread: threading.Thread) -> None:
+        if not thread.is_alive():
+            return
+        queue.put(LogIngestor._STOP)
+        if thread is not threading.current_thread():
+            thread.join()
+
+    @staticmethod
+    def _run(
+        queue: SimpleQueue[Any],
+        buffer: BaseLogBuffer,
+        sinks: List[LogSink],
+        batch_size: int,
+        errors: List[BaseException],
+    ) -> None:
+        while True:
+            batch = [queue.get()]
+            while len(batch) < batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except Empty:
+                    break
+            added: List[LogEntry] = []
+            markers: List[threading.Event] = []
+            stop = False
+            with buffer.lock:
+                for item in batch:
+                    if item is LogIngestor._STOP:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        markers.append(item)
+                    else:
+                        message, level, source, timestamp, repeats, first = item
+                        try:
+                            entry = buffer.add(
+                                message,
+                                level=level,
+                                source=source,
+                                timestamp=timestamp,
+                                repeat_count=repeats,
+                                first_timestamp=first,
+                            )
+                        except Exception as exc:
+                            # Ein fehlerhafter Eintrag darf die Aufnahme nicht
+                            # beenden, sonst warteten `flush`-Aufrufe ewig.
+                            errors.append(exc)
+                        else:
+                            added.append(entry)
+            for entry in added:
+                for sink in sinks:
+                    try:
+                        sink(entry)
+                    except Exception as exc:  # pragma: no cover - Schutz der Aufnahme
+                        errors.append(exc)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+
+LOG_BUFFER_LAYOUTS: tuple[str, ...] = ("deque", "columnar")
+
+
+def create_log_buffer(max_entries: int = 100, layout: str = "deque") -> BaseLogBuffer:
+    """Erzeugt einen Logpuffer in der gewünschten Speicherform."""
+
+    if layout == "deque":
+        return LogBuffer(max_entries=max_entries)
+    if layout == "columnar":
+        return ColumnarLogBuffer(max_entries=max_entries)
+    raise ValueError(
+        "Unbekannte Puffer-Form. Erlaubt sind: " + ", ".join(LOG_BUFFER_LAYOUTS)
+    )
+
+
+LOG_FILE_FORMATS: tuple[str, ...] = ("jsonl", "binary")
+
+BINARY_LOG_MAGIC = b"DLOG\x01"
+"""Dateikennung am Anfang jeder Datei im Binärformat (mit Versionsbyte)."""
+
+_RECORD_PREFIX = struct.Struct("<IB")
+_ENTRY_HEADER = struct.Struct("<qBI")
+_REPEAT_HEADER = struct.Struct("<qBIIq")
+_SOURCE_HEADER = struct.Struct("<I")
+_KIND_SOURCE = 0
+_KIND_ENTRY = 1
+_KIND_REPEAT = 2
+
+
+class BinaryLogEncoder:
+    """Schreibseite des kompakten Binärformats für Logsegmente.
+
+    Jeder Datensatz beginnt mit seiner Länge (4 Byte) und seiner Art (1 Byte).
+    Ein Eintrag besteht aus einem festen Kopf – Zeitstempel in Mikrosekunden
+    seit 1970 (UTC), Stufe als Byte, Kennung der Quelle – und der Meldung als
+    UTF-8. Quellnamen werden nur einmal als eigener Datensatz abgelegt
+    ("interniert") und danach über ihre Kennung angesprochen. Zusammengefasste
+    Serien sind eine eigene Datensatzart, deren Kopf zusätzlich Anzahl und
+    ersten Zeitpunkt trägt.
+
+    Eine neue Datei beginnt mit `preamble()`: Dateikennung plus alle bisher
+    vergebenen Quellen, damit auch nach einer Rotation jede Kennung in der
+    Datei selbst erklärt ist. Nicht threadsicher; Aufrufer schützen Kodieren
+    und Schreiben gemeinsam mit einer Sperre, damit Quellen vor ihrer ersten
+    Verwendung in der Datei stehen.
+    """
+
+    def __init__(self) -> None:
+        self._source_ids: Dict[str, int] = {}
+
+    def preamble(self) -> bytes:
+        """Dateikennung und Quellentabelle für den Anfang einer neuen Datei."""
+
+        return BINARY_LOG_MAGIC + b"".join(
+            _source_record(source_id, name)
+            for name, source_id in self._source_ids.items()
+        )
+
+    def encode(self, entry: LogEntry) -> bytes:
+        """Kodiert einen Eintrag (bei neuer Quelle samt Quellen-Datensatz)."""
+
+        source_id = self._source_ids.get(entry.source)
+        declaration = b""
+        if source_id is None:
+            source_id = self._source_ids[entry.source] = len(self._source_ids)
+            declaration = _source_record(source_id, entry.source)
+        message = entry.message.encode("utf-8")
+        micros = _to_epoch_micros(entry.timestamp)
+        if entry.repeat_count > 1:
+            first = entry.first_timestamp
+            return (
+                declaration
+                + _RECORD_PREFIX.pack(_REPEAT_HEADER.size + len(message), _KIND_REPEAT)
+                + _REPEAT_HEADER.pack(
+                    micros,
+                    entry.severity,
+                    source_id,
+                    entry.repeat_count,
+                    _to_epoch_micros(first) if first is not None else micros,
+                )
+                + message
+            )
+        return (
+            declaration
+            + _RECORD_PREFIX.pack(_ENTRY_HEADER.size + len(message), _KIND_ENTRY)
+            + _ENTRY_HEADER.pack(micros, entry.severity, source_id)
+            + message
         )
 
 
-__all__ = ["LOG_LEVELS", "LogEntry", "LogBuffer"]
+def _source_record(source_id: int, name: str) -> bytes:
+    encoded = name.encode("utf-8")
+    return (
+        _RECORD_PREFIX.pack(_SOURCE_HEADER.size + len(encoded), _KIND_SOURCE)
+        + _SOURCE_HEADER.pack(source_id)
+        + encoded
+    )
+
+
+def decode_binary_log(data: bytes) -> Iterator[LogEntry]:
+    """Leseseite des Binärformats: liefert die Einträge in Dateireihenfolge.
+
+    Ein unvollständiger Datensatz am Ende (etwa nach einem Absturz während
+    des Schreibens) wird übergangen. Eine leere Datei ergibt keine Einträge;
+    fehlt die Dateikennung oder ist ein Datensatz unlesbar, folgt ValueError.
+    """
+
+    if not data:
+        return
+    if not data.startswith(BINARY_LOG_MAGIC):
+        raise ValueError("Keine Logdatei im Binärformat (Dateikennung fehlt).")
+    sources: Dict[int, str] = {}
+    # Häufig genutzte Namen lokal binden; die Schleife läuft pro Datensatz.
+    read_prefix = _RECORD_PREFIX.unpack_from
+    read_entry = _ENTRY_HEADER.unpack_from
+    prefix_size = _RECORD_PREFIX.size
+    header_size = _ENTRY_HEADER.size
+    levels = LOG_LEVELS
+    epoch = _EPOCH
+    position = len(BINARY_LOG_MAGIC)
+    end = len(data)
+    while position + prefix_size <= end:
+        length, kind = read_prefix(data, position)
+        start = position + prefix_size
+        position = start + length
+        if position > end:
+            break
+        if kind == _KIND_ENTRY:
+            micros, severity, source_id = read_entry(data, start)
+            source = sources.get(source_id)
+            if source is None or severity >= len(levels):
+                raise ValueError("Beschädigter Datensatz in der Binär-Logdatei.")
+            yield LogEntry(
+                epoch + timedelta(microseconds=micros),
+                levels[severity],
+                data[start + header_size : position].decode("utf-8"),
+                source,
+            )
+        elif kind == _KIND_REPEAT:
+            micros, severity, source_id, count, first = _REPEAT_HEADER.unpack_from(
+                data, start
+            )
+            source = sources.get(source_id)
+            if source is None or severity >= len(levels) or count < 1:
+                raise ValueError("Beschädigter Datensatz in der Binär-Logdatei.")
+            yield LogEntry(
+                epoch + timedelta(microseconds=micros),
+                levels[severity],
+                data[start + _REPEAT_HEADER.size : position].decode("utf-8"),
+                source,
+                repeat_count=count,
+                first_timestamp=(
+                    epoch + timedelta(microseconds=first) if count > 1 else None
+                ),
+            )
+        elif kind == _KIND_SOURCE:
+            (source_id,) = _SOURCE_HEADER.unpack_from(data, start)
+            sources[source_id] = data[start + _SOURCE_HEADER.size : position].decode(
+                "utf-8"
+            )
+        else:
+            raise ValueError("Unbekannte Datensatzart in der Binär-Logdatei.")
+
+
+def binary_log_complete_length(data: bytes) -> int:
+    """Länge des Anfangs von `data`, der nur aus vollständigen Datensätzen besteht.
+
+    Nach einem Absturz beim Schreiben kann eine Datei mit einem halben
+    Datensatz (oder einer halben Dateikennung) enden; dort wird abgeschnitten,
+    damit neue Datensätze sauber anschließen. Dateien ohne Dateikennung
+    bleiben unangetastet (volle Länge).
+    """
+
+    if not data.startswith(BINARY_LOG_MAGIC):
+        return 0 if BINARY_LOG_MAGIC.startswith(data) else len(data)
+    read_prefix = _RECORD_PREFIX.unpack_from
+    prefix_size = _RECORD_PREFIX.size
+    position = len(BINARY_LOG_MAGIC)
+    end = len(data)
+    while position + prefix_size <= end:
+        length, _kind = read_prefix(data, position)
+        following = position + prefix_size + length
+        if following > end:
+            break
+        position = following
+    return position
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_epoch(timestamp: datetime) -> float:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH).total_seconds()
+
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch_micros(timestamp: datetime) -> int:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+_sequence_of = attrgetter("sequence")
+
+
+class _RingColumn:
+    """Sicht auf eine Ringspalte in logischer Reihenfolge (0 = ältester)."""
+
+    __slots__ = ("column", "offset")
+
+    def __init__(self, column: array, offset: int) -> None:
+        self.column = column
+        self.offset = offset
+
+    def __getitem__(self, index: int) -> float:
+        return self.column[(self.offset + index) % len(self.column)]
+
+
+__all__ = [
+    "BINARY_LOG_MAGIC",
+    "LEVEL_SEVERITY",
+    "LOG_BUFFER_LAYOUTS",
+    "LOG_FILE_FORMATS",
+    "LOG_LEVELS",
+    "BaseLogBuffer",
+    "BinaryLogEncoder",
+    "ColumnarLogBuffer",
+    "LogEntry",
+    "LogBuffer",
+    "LogBufferListener",
+    "LogFeed",
+    "LogIngestor",
+    "binary_log_complete_length",
+    "create_log_buffer",
+    "decode_binary_log",
+    "level_severity",
+]
@@ -0,0 +1,174 @@
+"""Brücke vom Python-Modul `logging` in die Logpuffer des Dashboards.
+
+Dienste protokollieren meist über `logging.getLogger(...)`. Der
+`LogBufferHandler` reicht solche Datensätze ("records") an einen Logpuffer,
+eine Aufnahme-Warteschlange oder das Diagnosemodul weiter – ohne Formatter,
+nur mit der eigentlichen Meldung. Damit eine gesprächige Bibliothek weder
+den Ringpuffer noch den Datei-Writer überflutet, gibt es pro Logger einen
+Token-Bucket ("Token-Eimer": erlaubt `rate` Meldungen pro Sekunde mit kurzen
+Spitzen bis `burst`) und eine Stichprobe ("Sampling") für Debug-Meldungen.
+Verworfene Datensätze werden gezählt.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+from .logging import _EPOCH, LOG_LEVELS
+
+LogSinkCall = Callable[..., Any]
+"""Ziel wie `BaseLogBuffer.add` oder `LogIngestor.submit`:
+``sink(message, level=..., source=..., timestamp=...)``."""
+
+
+def map_std_level(levelno: int) -> str:
+    """Ordnet eine Stufe des `logging`-Moduls der Dashboard-Stufe zu.
+
+    Zwischenstufen (z.B. 25) fallen auf die nächstniedrigere Stufe, alles
+    unter INFO gilt als ``debug``.
+    """
+
+    return LOG_LEVELS[min(max(levelno // 10 - 1, 0), len(LOG_LEVELS) - 1)]
+
+
+class TokenBucket:
+    """Token-Bucket: füllt sich mit `rate` Marken pro Sekunde bis `capacity`."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def allow(self, now: float) -> bool:
+        """Verbraucht eine Marke, falls vorhanden."""
+
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class LogBufferHandler(logging.Handler):
+    """`logging.Handler`, der Datensätze in einen Logpuffer überträgt.
+
+    `rate_per_second` begrenzt jeden Logger einzeln (``None`` = unbegrenzt),
+    `burst` erlaubt kurze Spitzen darüber (Standard: eine Sekunde lang Rate);
+    `logger_rates` legt abweichende Grenzen für Logger und ihre Unterlogger
+    fest, z.B. ``{"urllib3": 5.0}`` oder mit eigener Spitze
+    ``{"urllib3": (5.0, 20.0)}``. `debug_sample_rate` ist der Anteil der
+    Debug-Meldungen, der übernommen wird (1.0 = alle). Prüfungen laufen vor
+    dem Zusammensetzen der Meldung, verworfene Datensätze kosten daher kaum
+    etwas. Quelle des Eintrags ist der Name des Loggers.
+    """
+
+    def __init__(
+        self,
+        sink: LogSinkCall,
+        *,
+        level: int = logging.NOTSET,
+        rate_per_second: float | None = None,
+        burst: float | None = None,
+        logger_rates: Mapping[str, float | Tuple[float, float]] | None = None,
+        debug_sample_rate: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sample: Callable[[], float] = random.random,
+    ) -> None:
+        if not 0.0 <= debug_sample_rate <= 1.0:
+            raise ValueError("debug_sample_rate muss zwischen 0 und 1 liegen.")
+        if rate_per_second is not None and rate_per_second <= 0:
+            raise ValueError("rate_per_second muss größer als 0 sein.")
+        super().__init__(level)
+        self.sink = sink
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.logger_rates = dict(logger_rates or {})
+        self.debug_sample_rate = debug_sample_rate
+        self._clock = clock
+        self._sample = sample
+        self._buckets: Dict[str, TokenBucket | None] = {}
+        self.accepted = 0
+        self.dropped: Counter[str] = Counter()
+        self.dropped_by_logger: Counter[str] = Counter()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # `Handler.handle` ruft emit bereits unter der Sperre des Handlers auf.
+        name = record.name
+        bucket = self._buckets.get(name, False)
+        if bucket is False:
+            bucket = self._buckets[name] = self._create_bucket(name)
+        level = map_std_level(record.levelno)
+        if level == "debug" and self.debug_sample_rate < 1.0:
+            if self._sample() >= self.debug_sample_rate:
+                self._drop("sampled", name)
+                return
+        if bucket is not None and not bucket.allow(self._clock()):
+            self._drop("rate_limited", name)
+            return
+        try:
+            message = record.getMessage()
+            if record.exc_info and record.exc_info[1] is not None:
+                error = record.exc_info[1]
+                message = f"{message} ({type(error).__name__}: {error})"
+            self.sink(
+                message,
+                level=level,
+                source=name,
+                timestamp=_EPOCH + timedelta(seconds=record.created),
+            )
+            self.accepted += 1
+        except Exception:
+            self.handleError(record)
+
+    def stats(self) -> Dict[str, Any]:
+        """Zählerstände: übernommen, verworfen je Grund und je Logger."""
+
+        with self.lock:
+            return {
+                "accepted": self.accepted,
+                "dropped": dict(self.dropped),
+                "dropped_by_logger": dict(self.dropped_by_logger),
+            }
+
+    def _drop(self, reason: str, name: str) -> None:
+        self.dropped[reason] += 1
+        self.dropped_by_logger[name] += 1
+
+    def _create_bucket(self, name: str) -> TokenBucket | None:
+        rate, burst = self._limits_for(name)
+        if rate is None:
+            return None
+        return TokenBucket(rate, burst, self._clock())
+
+    def _limits_for(self, name: str) -> Tuple[float | None, float]:
+        # Sucht die Grenze des Loggers oder seines nächsten Elternloggers.
+        candidate = name
+        while candidate:
+            if candidate in self.logger_rates:
+                limit = self.logger_rates[candidate]
+                if isinstance(limit, tuple):
+                    rate, burst = limit
+                    return rate, max(1.0, burst)
+                return limit, self._burst_for(limit)
+            candidate = candidate.rpartition(".")[0]
+        rate = self.rate_per_second
+        if rate is None:
+            return None, 0.0
+        return rate, self._burst_for(rate)
+
+    def _burst_for(self, rate: float) -> float:
+        return max(1.0, self.burst if self.burst is not None else rate)
+
+
+__all__ = ["LogBufferHandler", "TokenBucket", "map_std_level"]
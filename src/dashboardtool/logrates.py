@@ -0,0 +1,248 @@
+"""Laufende Zählungen je Zeitfenster ("Rate": Einträge pro Zeiteinheit)."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from .logging import (
+    LOG_LEVELS,
+    BaseLogBuffer,
+    LogBufferListener,
+    LogEntry,
+    _EPOCH,
+    _to_epoch,
+)
+
+
+@dataclass(frozen=True)
+class RateWindow:
+    """Ein Zeitfenster aus `buckets` Fächern zu je `bucket_seconds` Sekunden."""
+
+    name: str
+    bucket_seconds: int
+    buckets: int
+
+    @property
+    def span_seconds(self) -> int:
+        return self.bucket_seconds * self.buckets
+
+
+RATE_WINDOWS: Tuple[RateWindow, ...] = (
+    RateWindow("1s", 1, 60),
+    RateWindow("1m", 60, 60),
+    RateWindow("1h", 3600, 24),
+)
+"""Standardfenster: 60 Sekunden, 60 Minuten und 24 Stunden."""
+
+
+class _RateRing:
+    """Ring aus Zeitfächern mit mitgeführten Summen über alle Fächer.
+
+    Jedes Fach kennt seine Fachnummer (Sekunden seit 1970 geteilt durch die
+    Fachbreite). Trifft ein Eintrag auf ein Fach mit älterer Nummer, wird
+    dieses zuerst von den Summen abgezogen und geleert. `dropped` zählt die
+    so geleerten Fächer mit Zählungen.
+    """
+
+    __slots__ = (
+        "window",
+        "ids",
+        "levels",
+        "sources",
+        "level_totals",
+        "source_totals",
+        "dropped",
+    )
+
+    def __init__(self, window: RateWindow) -> None:
+        self.window = window
+        self.ids = [-1] * window.buckets
+        self.levels = [[0] * len(LOG_LEVELS) for _ in range(window.buckets)]
+        self.sources: List[Dict[str, List[int]]] = [{} for _ in range(window.buckets)]
+        self.level_totals = [0] * len(LOG_LEVELS)
+        self.source_totals: Dict[str, List[int]] = {}
+        self.dropped = 0
+
+    def add(self, moment: float, severity: int, source: str, count: int = 1) -> None:
+        bucket = int(moment // self.window.bucket_seconds)
+        slot = bucket % self.window.buckets
+        current = self.ids[slot]
+        if current != bucket:
+            if current > bucket:
+                return  # älter als das Fenster
+            self._drop(slot)
+            self.ids[slot] = bucket
+        self.levels[slot][severity] += count
+        self.level_totals[severity] += count
+        counts = self.sources[slot].get(source)
+        if counts is None:
+            counts = self.sources[slot][source] = [0] * len(LOG_LEVELS)
+        counts[severity] += count
+        totals = self.source_totals.get(source)
+        if totals is None:
+            totals = self.source_totals[source] = [0] * len(LOG_LEVELS)
+        totals[severity] += count
+
+    def expire(self, now: float) -> int:
+        """Entfernt Fächer, die vor dem Fenster bis `now` liegen."""
+
+        newest = int(now // self.window.bucket_seconds)
+        oldest = newest - self.window.buckets + 1
+        for slot, bucket in enumerate(self.ids):
+            if 0 <= bucket < oldest:
+                self._drop(slot)
+        return newest
+
+    def reset(self) -> None:
+        for slot in range(self.window.buckets):
+            self._drop(slot)
+
+    def _drop(self, slot: int) -> None:
+        if self.ids[slot] != -1:
+            self.dropped += 1
+        self.ids[slot] = -1
+        levels = self.levels[slot]
+        for severity, count in enumerate(levels):
+            self.level_totals[severity] -= count
+            levels[severity] = 0
+        for source, counts in self.sources[slot].items():
+            totals = self.source_totals[source]
+            for severity, count in enumerate(counts):
+                totals[severity] -= count
+            if not any(totals):
+                del self.source_totals[source]
+        self.sources[slot].clear()
+
+
+class LogRateAggregator(LogBufferListener):
+    """Zählt Einträge je Stufe und Quelle in rollierenden Zeitfenstern.
+
+    Der Aggregator hängt sich als Beobachter an einen Logpuffer; jeder neue
+    Eintrag erhöht nur wenige Zähler. Maßgeblich ist der Zeitstempel des
+    Eintrags, nicht der Zeitpunkt des Einfügens; Einträge, die älter als ein
+    Fenster sind, werden dort nicht gezählt. Verdrängte Einträge bleiben
+    gezählt, denn die Fenster beziehen sich auf die Zeit, nicht auf den
+    Ringpuffer. Zusammengefasste Serien zählen mit ihrer Wiederholungszahl,
+    und zwar im Fach ihrer letzten Meldung. Abfragen räumen abgelaufene
+    Fächer weg und kosten daher höchstens einen Durchlauf über die (wenigen)
+    Fächer.
+    """
+
+    def __init__(
+        self,
+        buffer: BaseLogBuffer,
+        *,
+        windows: Tuple[RateWindow, ...] = RATE_WINDOWS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.buffer = buffer
+        self.clock = clock
+        self._rings: Dict[str, _RateRing] = {
+            window.name: _RateRing(window) for window in windows
+        }
+        self._added = 0
+        buffer.add_listener(self)
+
+    @property
+    def windows(self) -> List[str]:
+        """Namen der geführten Zeitfenster."""
+
+        return list(self._rings)
+
+    def detach(self) -> None:
+        """Löst den Aggregator vom Puffer."""
+
+        self.buffer.remove_listener(self)
+        self.on_clear()
+
+    # ------------------------------------------------------------------
+    # Beobachter-Hooks
+    # ------------------------------------------------------------------
+    def on_add(self, entry: LogEntry) -> None:
+        self._added += 1
+        moment = _to_epoch(entry.timestamp)
+        severity = entry.severity
+        for ring in self._rings.values():
+            ring.add(moment, severity, entry.source, entry.repeat_count)
+
+    def on_clear(self) -> None:
+        for ring in self._rings.values():
+            ring.reset()
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+    def totals(self, window: str = "1m") -> Dict[str, Any]:
+        """Summen je Stufe und je Quelle (Quelle → Stufe → Anzahl) im Fenster."""
+
+        ring = self._ring(window)
+        with self.buffer.lock:
+            ring.expire(self.clock())
+            return {
+                "window": window,
+                "span_seconds": ring.window.span_seconds,
+                "levels": dict(zip(LOG_LEVELS, ring.level_totals)),
+                "sources": {
+                    source: dict(zip(LOG_LEVELS, counts))
+                    for source, counts in sorted(ring.source_totals.items())
+                },
+            }
+
+    def series(self, window: str = "1m") -> List[Dict[str, Any]]:
+        """Zählungen je Fach, ältestes zuerst – etwa für Ratendiagramme."""
+
+        ring = self._ring(window)
+        width = ring.window.bucket_seconds
+        points: List[Dict[str, Any]] = []
+        with self.buffer.lock:
+            newest = ring.expire(self.clock())
+            for bucket in range(newest - ring.window.buckets + 1, newest + 1):
+                slot = bucket % ring.window.buckets
+                counts = (
+                    ring.levels[slot]
+                    if ring.ids[slot] == bucket
+                    else [0] * len(LOG_LEVELS)
+                )
+                points.append(
+                    {
+                        "start": _bucket_start(bucket, width),
+                        "levels": dict(zip(LOG_LEVELS, counts)),
+                    }
+                )
+        return points
+
+    def version(self) -> int:
+        """Zähler, der sich nur mit den Summen ändert (etwa für Render-Caches).
+
+        Er steigt mit jedem Eintrag und mit jedem Fach, das samt Zählungen aus
+        einem Fenster fällt; bloßes Verstreichen der Zeit ändert ihn nicht.
+        """
+
+        with self.buffer.lock:
+            now = self.clock()
+            for ring in self._rings.values():
+                ring.expire(now)
+            return self._added + sum(ring.dropped for ring in self._rings.values())
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Summen je Stufe für alle Fenster (kompakt für Statusanzeigen)."""
+
+        return {name: self.totals(name)["levels"] for name in self._rings}
+
+    def _ring(self, window: str) -> _RateRing:
+        ring = self._rings.get(window)
+        if ring is None:
+            raise ValueError(
+                "Unbekanntes Zeitfenster. Erlaubt sind: " + ", ".join(self._rings)
+            )
+        return ring
+
+
+def _bucket_start(bucket: int, width: int) -> str:
+    return (_EPOCH + timedelta(seconds=bucket * width)).isoformat()
+
+
+__all__ = ["RATE_WINDOWS", "LogRateAggregator", "RateWindow"]
@@ -0,0 +1,298 @@
+"""Zeitraum-Suche in Logdateien ohne vollständiges Einlesen.
+
+Aktive Dateien und entpackte Segmente werden als Speicherabbild ("mmap")
+geöffnet; Zeilen werden als `memoryview` geliefert und nicht kopiert. Zu jeder
+Datei gehört ein dünnbesetzter Index ("sparse index") als Beidatei
+(``debug.log.idx``), der für jeden Block aus `stride` Zeilen den Byte-Versatz
+sowie den kleinsten und größten Zeitstempel festhält. Eine Abfrage wie
+"gestern 10:00–10:15" springt damit direkt an die passende Stelle.
+"""
+
+from __future__ import annotations
+
+import gzip
+import mmap
+import os
+import re
+import struct
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from .logfiles import iter_log_files, log_index_path
+from .logging import _to_epoch
+
+DEFAULT_INDEX_STRIDE = 256
+
+_TIMESTAMP_PATTERN = re.compile(rb'"timestamp"\s*:\s*"([^"]*)"')
+_MAGIC = b"DLX1"
+_HEADER = struct.Struct("<4sIQI")
+_FINGERPRINT_BYTES = 256
+
+
+def line_timestamp(line: bytes | memoryview) -> float | None:
+    """Zeitstempel einer JSON-Logzeile in Sekunden seit 1970 (UTC) oder None."""
+
+    match = _TIMESTAMP_PATTERN.search(line)
+    if match is None:
+        return None
+    try:
+        return _to_epoch(datetime.fromisoformat(match.group(1).decode("ascii")))
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[bytes | mmap.mmap]:
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            # Leere Dateien lassen sich nicht abbilden.
+            yield b""
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def iter_mapped_lines(
+    path: Path, start: int = 0, stop: int | None = None
+) -> Iterator[Tuple[int, memoryview]]:
+    """Liefert (Byte-Versatz, Zeile ohne Zeilenumbruch) ab `start`.
+
+    Die `memoryview` zeigt direkt in das Speicherabbild und ist nur bis zum
+    nächsten Schritt gültig; wer die Zeile behalten will, kopiert sie mit
+    ``bytes(line)``.
+    """
+
+    with _mapped(path) as data:
+        view = memoryview(data)
+        try:
+            end = len(data) if stop is None else min(stop, len(data))
+            position = start
+            while position < end:
+                newline = data.find(b"\n", position, end)
+                line_end = end if newline < 0 else newline
+                line = view[position:line_end]
+                try:
+                    yield position, line
+                finally:
+                    line.release()
+                position = line_end + 1
+        finally:
+            view.release()
+
+
+def _iter_packed_lines(
+    path: Path, start: int = 0, stop: int | None = None
+) -> Iterator[Tuple[int, bytes]]:
+    # gzip kann nicht abgebildet werden; gelesen wird als Datenstrom, `seek`
+    # überspringt dabei entpackte Bytes, ohne Zeilen zu zerlegen.
+    with gzip.open(path, "rb") as handle:
+        handle.seek(start)
+        position = start
+        for raw in handle:
+            if stop is not None and position >= stop:
+                break
+            yield position, raw.rstrip(b"\n")
+            position += len(raw)
+
+
+def _iter_lines(
+    path: Path, start: int = 0, stop: int | None = None
+) -> Iterator[Tuple[int, bytes | memoryview]]:
+    if path.suffix == ".gz":
+        return _iter_packed_lines(path, start, stop)
+    return iter_mapped_lines(path, start, stop)
+
+
+def _fingerprint(path: Path) -> int:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as handle:
+        return zlib.crc32(handle.read(_FINGERPRINT_BYTES))
+
+
+class LogTimeIndex:
+    """Dünnbesetzter Zeitindex einer Logdatei (Beidatei ``<datei>.idx``).
+
+    Erfasst werden nur vollständige Blöcke; die restlichen Zeilen am Dateiende
+    (weniger als `stride`) werden bei jeder Abfrage direkt gelesen. Die
+    Beidatei merkt sich eine Prüfsumme über den Dateianfang; passt sie nicht
+    mehr (etwa nach einer Rotation), wird der Index neu aufgebaut. Gepackte
+    Segmente teilen sich die Beidatei mit ihrer entpackten Fassung, da die
+    Versätze sich auf den entpackten Inhalt beziehen.
+    """
+
+    def __init__(self, path: Path, stride: int = DEFAULT_INDEX_STRIDE) -> None:
+        if stride <= 0:
+            raise ValueError("stride muss größer als 0 sein.")
+        self.path = Path(path)
+        self.stride = stride
+        self.covered = 0
+        self.fingerprint = 0
+        self.offsets = array("Q")
+        self.minimums = array("d")
+        self.maximums = array("d")
+
+    @property
+    def sidecar(self) -> Path:
+        return log_index_path(self.path)
+
+    @property
+    def blocks(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def load(cls, path: Path, stride: int = DEFAULT_INDEX_STRIDE) -> "LogTimeIndex":
+        """Liest die Beidatei, falls sie zur Datei passt; sonst leerer Index."""
+
+        index = cls(path, stride)
+        fingerprint = _fingerprint(index.path)
+        try:
+            raw = index.sidecar.read_bytes()
+        except OSError:
+            raw = b""
+        if len(raw) >= _HEADER.size:
+            magic, saved_stride, covered, saved_fingerprint = _HEADER.unpack_from(raw)
+            body = raw[_HEADER.size :]
+            size_ok = index.path.suffix == ".gz" or covered <= index.path.stat().st_size
+            if (
+                magic == _MAGIC
+                and saved_stride == stride
+                and saved_fingerprint == fingerprint
+                and size_ok
+                and len(body) % 24 == 0
+            ):
+                count = len(body) // 24
+                index.offsets.frombytes(body[: 8 * count])
+                index.minimums.frombytes(body[8 * count : 16 * count])
+                index.maximums.frombytes(body[16 * count :])
+                index.covered = covered
+        index.fingerprint = fingerprint
+        return index
+
+    def refresh(self) -> bool:
+        """Nimmt neu hinzugekommene vollständige Blöcke auf; True bei Änderung."""
+
+        limit = None if self.path.suffix == ".gz" else self.path.stat().st_size
+        block_start = self.covered
+        count = 0
+        low, high = float("inf"), float("-inf")
+        changed = False
+        for offset, line in _iter_lines(self.path, self.covered):
+            following = offset + len(line) + 1
+            if limit is not None and following > limit:
+                break  # Zeile wird gerade noch geschrieben.
+            moment = line_timestamp(line)
+            if moment is not None:
+                low = min(low, moment)
+                high = max(high, moment)
+            count += 1
+            if count == self.stride:
+                self.offsets.append(block_start)
+                self.minimums.append(low)
+                self.maximums.append(high)
+                self.covered = block_start = following
+                count = 0
+                low, high = float("inf"), float("-inf")
+                changed = True
+        return changed
+
+    def save(self) -> None:
+        """Schreibt die Beidatei (atomar über eine temporäre Datei)."""
+
+        temporary = self.sidecar.with_name(self.sidecar.name + ".tmp")
+        with temporary.open("wb") as handle:
+            handle.write(
+                _HEADER.pack(_MAGIC, self.stride, self.covered, self.fingerprint)
+            )
+            handle.write(self.offsets.tobytes())
+            handle.write(self.minimums.tobytes())
+            handle.write(self.maximums.tobytes())
+        os.replace(temporary, self.sidecar)
+
+    def byte_ranges(self, low: float, high: float) -> List[Tuple[int, int]]:
+        """Byte-Bereiche der erfassten Blöcke, die Zeilen von `low` bis `high`
+        enthalten können (benachbarte Blöcke zusammengefasst).
+
+        Über die laufenden Maxima (von vorne) und Minima (von hinten) lassen
+        sich die äußeren Grenzen per Binärsuche bestimmen, auch wenn einzelne
+        Zeilen nicht in zeitlicher Reihenfolge stehen. Dazwischen werden nur
+        Blöcke gelesen, deren eigener Zeitbereich die Abfrage berührt.
+        """
+
+        running_max = list(accumulate(self.maximums, max))
+        running_min = list(accumulate(reversed(self.minimums), min))
+        running_min.reverse()
+        first = bisect_left(running_max, low)
+        last = bisect_right(running_min, high)
+        ranges: List[Tuple[int, int]] = []
+        for block in range(first, last):
+            if self.minimums[block] > high or self.maximums[block] < low:
+                continue
+            start = self.offsets[block]
+            stop = self.offsets[block + 1] if block + 1 < self.blocks else self.covered
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((start, stop))
+        return ranges
+
+
+def scan_file_time_range(
+    path: Path,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    *,
+    stride: int = DEFAULT_INDEX_STRIDE,
+) -> Iterator[str]:
+    """Zeilen einer einzelnen Datei mit Zeitstempel von `start` bis `end`."""
+
+    path = Path(path)
+    if not path.exists() and path.suffix != ".gz":
+        # Wurde gerade im Hintergrund gepackt.
+        path = path.with_name(path.name + ".gz")
+    low = _to_epoch(start) if start is not None else float("-inf")
+    high = _to_epoch(end) if end is not None else float("inf")
+    try:
+        index = LogTimeIndex.load(path, stride)
+        if index.refresh():
+            try:
+                index.save()
+            except OSError:
+                pass  # Ohne Beidatei wird beim nächsten Mal neu aufgebaut.
+        ranges: List[Tuple[int, int | None]] = [*index.byte_ranges(low, high)]
+        ranges.append((index.covered, None))
+        for range_start, range_stop in ranges:
+            for _, line in _iter_lines(path, range_start, range_stop):
+                moment = line_timestamp(line)
+                if moment is not None and low <= moment <= high:
+                    yield bytes(line).decode("utf-8", errors="replace")
+    except FileNotFoundError:
+        return
+
+
+def scan_time_range(
+    path: Path,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    *,
+    stride: int = DEFAULT_INDEX_STRIDE,
+) -> Iterator[str]:
+    """Zeilen aller Segmente und der aktiven Datei im Zeitraum, älteste zuerst."""
+
+    for file in list(iter_log_files(Path(path))):
+        yield from scan_file_time_range(file, start, end, stride=stride)
+
+
+__all__ = [
+    "DEFAULT_INDEX_STRIDE",
+    "LogTimeIndex",
+    "iter_mapped_lines",
+    "line_timestamp",
+    "scan_file_time_range",
+    "scan_time_range",
+]
@@ -0,0 +1,241 @@
+"""Volltextsuche über Logmeldungen ("Volltextsuche": Suche in ganzen Texten)."""
+
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_left
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from .logging import BaseLogBuffer, LogBufferListener, LogEntry, level_severity
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_PREFIX_KEY_LENGTH = 3
+
+
+def tokenize(text: str) -> Set[str]:
+    """Zerlegt einen Text in kleingeschriebene Suchbegriffe."""
+
+    return set(_TOKEN_PATTERN.findall(text.lower()))
+
+
+class _Postings:
+    """Aufsteigend sortierte Laufnummern eines Suchbegriffs.
+
+    Neue Einträge haben immer die größte Laufnummer, verdrängte immer die
+    kleinste. Die Liste wächst daher nur hinten und schrumpft nur vorne;
+    `head` markiert den ersten gültigen Platz.
+    """
+
+    __slots__ = ("items", "head")
+
+    def __init__(self, sequence: int) -> None:
+        self.items: List[int] = [sequence]
+        self.head = 0
+
+    def __len__(self) -> int:
+        return len(self.items) - self.head
+
+    def append(self, sequence: int) -> None:
+        self.items.append(sequence)
+
+    def discard_oldest(self, sequence: int) -> None:
+        items = self.items
+        if self.head < len(items) and items[self.head] == sequence:
+            self.head += 1
+            if self.head > 32 and self.head * 2 > len(items):
+                del items[: self.head]
+                self.head = 0
+
+    def __contains__(self, sequence: int) -> bool:
+        items = self.items
+        position = bisect_left(items, sequence, self.head)
+        return position < len(items) and items[position] == sequence
+
+    def newest_first(self) -> Iterator[int]:
+        items = self.items
+        for position in range(len(items) - 1, self.head - 1, -1):
+            yield items[position]
+
+
+class LogSearchIndex(LogBufferListener):
+    """Invertierter Index: Suchbegriff → Laufnummern der Einträge.
+
+    Der Index hängt sich als Beobachter an einen Logpuffer und wird bei jedem
+    neuen oder verdrängten Eintrag nachgeführt. Suchanfragen bestehen aus
+    Begriffen, die alle vorkommen müssen (UND-Verknüpfung); ein `*` am Ende
+    eines Begriffs sucht nach Wortanfängen, z.B. ``time*``. Treffer werden
+    vom neuesten Eintrag aus ermittelt, sodass Abfragen mit `limit` nur so
+    viel Arbeit machen, wie Treffer gebraucht werden.
+    """
+
+    def __init__(self, buffer: BaseLogBuffer) -> None:
+        self.buffer = buffer
+        self._postings: Dict[str, _Postings] = {}
+        self._prefixes: Dict[str, Set[str]] = {}
+        buffer.add_listener(self)
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Anzahl unterschiedlicher Suchbegriffe im Index."""
+
+        return len(self._postings)
+
+    def detach(self) -> None:
+        """Löst den Index vom Puffer."""
+
+        self.buffer.remove_listener(self)
+        self.on_clear()
+
+    # ------------------------------------------------------------------
+    # Beobachter-Hooks
+    # ------------------------------------------------------------------
+    def on_add(self, entry: LogEntry) -> None:
+        postings = self._postings
+        for token in tokenize(entry.message):
+            sequences = postings.get(token)
+            if sequences is None:
+                postings[token] = _Postings(entry.sequence)
+                for length in range(1, min(len(token), _PREFIX_KEY_LENGTH) + 1):
+                    self._prefixes.setdefault(token[:length], set()).add(token)
+            else:
+                sequences.append(entry.sequence)
+
+    def on_evict(self, entry: LogEntry) -> None:
+        postings = self._postings
+        for token in tokenize(entry.message):
+            sequences = postings.get(token)
+            if sequences is None:
+                continue
+            sequences.discard_oldest(entry.sequence)
+            if not sequences:
+                del postings[token]
+                for length in range(1, min(len(token), _PREFIX_KEY_LENGTH) + 1):
+                    bucket = self._prefixes.get(token[:length])
+                    if bucket is not None:
+                        bucket.discard(token)
+                        if not bucket:
+                            del self._prefixes[token[:length]]
+
+    def on_clear(self) -> None:
+        self._postings.clear()
+        self._prefixes.clear()
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+    def matching_sequences(self, query: str) -> Set[int]:
+        """Laufnummern aller Einträge, die sämtliche Begriffe enthalten."""
+
+        with self.buffer.lock:
+            return set(self._matches(query))
+
+    def search(
+        self,
+        query: str,
+        *,
+        minimum_level: str | None = None,
+        source: str | None = None,
+        limit: int | None = None,
+    ) -> List[LogEntry]:
+        """Sucht Einträge; liefert bei `limit` die jüngsten Treffer (alt → neu)."""
+
+        minimum = level_severity(minimum_level) if minimum_level else 0
+        found: List[LogEntry] = []
+        if limit is not None and limit <= 0:
+            return found
+        with self.buffer.lock:
+            for sequence in self._matches(query):
+                if minimum or source is not None:
+                    details = self.buffer.peek(sequence)
+                    if details is None or details[0] < minimum:
+                        continue
+                    if source is not None and details[1] != source:
+                        continue
+                entry = self.buffer.get(sequence)
+                if entry is None:
+                    continue
+                found.append(entry)
+                if limit is not None and len(found) >= limit:
+                    break
+        found.reverse()
+        return found
+
+    def _matches(self, query: str) -> Iterator[int]:
+        """Passende Laufnummern, neueste zuerst (unter der Puffer-Sperre rufen)."""
+
+        clauses: List[List[_Postings]] = []
+        for term in query.split():
+            words, prefix = _split_term(term)
+            # Begriffe wie "req-42" bestehen aus mehreren Wörtern.
+            for word in words:
+                clauses.append([self._postings[word]] if word in self._postings else [])
+            if prefix is not None:
+                clauses.append(
+                    [
+                        self._postings[token]
+                        for token in self._prefixes.get(prefix[:_PREFIX_KEY_LENGTH], ())
+                        if token.startswith(prefix)
+                    ]
+                )
+        if not clauses or not all(clauses):
+            return iter(())
+        clauses.sort(key=lambda alternatives: sum(map(len, alternatives)))
+        driver, others = clauses[0], clauses[1:]
+        return (
+            sequence
+            for sequence in _newest_first(driver)
+            if all(
+                any(sequence in postings for postings in alternatives)
+                for alternatives in others
+            )
+        )
+
+
+def _newest_first(alternatives: List[_Postings]) -> Iterator[int]:
+    if len(alternatives) == 1:
+        return alternatives[0].newest_first()
+    merged = heapq.merge(
+        *(postings.newest_first() for postings in alternatives), reverse=True
+    )
+    return (sequence for sequence, _ in groupby(merged))
+
+
+def _split_term(term: str) -> Tuple[List[str], str | None]:
+    """Teilt einen Suchbegriff in ganze Wörter und einen optionalen Wortanfang."""
+
+    words = _TOKEN_PATTERN.findall(term.lower())
+    if term.endswith("*") and words:
+        return words[:-1], words[-1]
+    return words, None
+
+
+def scan_entries(
+    entries: Iterable[LogEntry],
+    query: str,
+    *,
+    minimum_level: str | None = None,
+    source: str | None = None,
+) -> List[LogEntry]:
+    """Suche ohne Index durch lineares Durchsehen (gleiche Anfragesyntax)."""
+
+    minimum = level_severity(minimum_level) if minimum_level else 0
+    terms = [_split_term(term) for term in query.split()]
+    if not terms or not all(words or prefix for words, prefix in terms):
+        return []
+    found: List[LogEntry] = []
+    for entry in entries:
+        if entry.severity < minimum or (source is not None and entry.source != source):
+            continue
+        tokens = tokenize(entry.message)
+        if all(
+            tokens.issuperset(words)
+            and (prefix is None or any(token.startswith(prefix) for token in tokens))
+            for words, prefix in terms
+        ):
+            found.append(entry)
+    return found
+
+
+__all__ = ["LogSearchIndex", "scan_entries", "tokenize"]
@@ -0,0 +1,480 @@
+"""Volltextsuche über Notizen mit Rangfolge und Textauszügen ("Snippets").
+
+Der `NoteSearchIndex` ist ein invertierter Index: Wort → Notizen mit der
+Häufigkeit des Worts. Für Teilwort-Suchen ("verbind" findet auch
+"Netzverbindung") gibt es zusätzlich einen Trigramm-Index über den
+Wortschatz ("Trigramm": Folge aus drei Zeichen): Er führt von drei Zeichen
+zu den Wörtern, die sie enthalten, nicht zu den Notizen. Eine Teilwort-Suche
+schneidet daher nur kleine Wortmengen und liest danach die Notizlisten der
+passenden Wörter.
+
+Der Index wird bei jedem Speichern nachgeführt und neben `notes.json` als
+``notes.search.json`` abgelegt, damit er beim Start nicht neu aufgebaut
+werden muss. Zwischen zwei vollständigen Sicherungen landen nur die
+Kennungen geänderter Notizen in ``notes.search.delta`` ("Delta": Liste der
+Änderungen); beim Öffnen werden genau diese Notizen neu eingelesen.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
+from typing import AbstractSet, Any, Dict, Iterable, List, Set, Tuple
+
+from .storage import NoteRecord, NoteStore, write_atomically
+
+_WORD_PATTERN = re.compile(r"\w+")
+_INDEX_VERSION = 1
+_K1 = 1.2
+_B = 0.75
+_SUBSTRING_WEIGHT = 0.5
+_SNIPPET_WIDTH = 120
+
+Fingerprint = Tuple[int, str | None]
+
+
+def note_terms(text: str) -> Counter[str]:
+    """Kleingeschriebene Wörter eines Textes mit ihrer Häufigkeit."""
+
+    return Counter(_WORD_PATTERN.findall(text.lower()))
+
+
+def search_index_path(storage_file: Path) -> Path:
+    """Ablageort des Suchindex neben der Notizdatei."""
+
+    return storage_file.with_name(storage_file.stem + ".search.json")
+
+
+def store_fingerprint(store: NoteStore) -> Fingerprint:
+    """Anzahl und jüngster Zeitstempel der Notizen, um veraltete Indizes zu erkennen."""
+
+    return len(store), store.latest_timestamp()
+
+
+def _trigrams(word: str) -> Set[str]:
+    return {word[index : index + 3] for index in range(len(word) - 2)}
+
+
+class NoteSearchIndex:
+    """Invertierter Index über Notizinhalte mit BM25-Rangfolge.
+
+    Anfragen bestehen aus Begriffen, die alle vorkommen müssen
+    (UND-Verknüpfung). Ein Begriff trifft ganze Wörter; ab drei Zeichen auch
+    Wörter, die ihn enthalten – solche Treffer zählen nur halb. Die
+    Rangfolge folgt BM25 ("Best Match 25": seltene Wörter und kurze Notizen
+    zählen mehr).
+
+    Für das Entfernen alter Wörter braucht `update` den bisherigen Inhalt;
+    der Index selbst hält keine Texte. Der Trigramm-Index entsteht erst bei
+    der ersten Teilwort-Suche und wird danach mitgeführt.
+
+    Solange der Index nicht geladen ist, merkt `mark_stale` geänderte
+    Notizen nur vor ("stale": veraltet); `open` liest sie dann nach, statt
+    den ganzen Index neu aufzubauen.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._trigrams: Dict[str, Set[str]] | None = None
+        # Geändert, aber noch nicht eingearbeitet (Index nicht geladen).
+        self._stale: Set[str] = set()
+        # Stand des Stores vor der ersten dieser Änderungen.
+        self._stale_since: Fingerprint | None = None
+        # Geändert seit der letzten Sicherung (vollständig oder als Delta).
+        self._unsaved: Set[str] = set()
+        # Stand des Stores bei der letzten Sicherung; bis zur nächsten
+        # Änderung muss `mark_stale` ihn nicht neu ermitteln.
+        self._saved_fingerprint: Fingerprint | None = None
+        self.dirty = False
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    @property
+    def delta_path(self) -> Path | None:
+        return self.path.with_suffix(".delta") if self.path is not None else None
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return bool(self._unsaved)
+
+    # ------------------------------------------------------------------
+    # Aufbau und Pflege
+    # ------------------------------------------------------------------
+    def open(self, store: NoteStore) -> bool:
+        """Lädt den gespeicherten Index oder baut ihn aus dem Store neu auf.
+
+        Passt der gespeicherte Fingerabdruck nicht zum Store (etwa nach einem
+        Absturz vor dem Speichern des Index), wird neu aufgebaut. Liefert
+        True, wenn der gespeicherte Index verwendet wurde.
+        """
+
+        fingerprint = store_fingerprint(store)
+        if self.path is not None and self._load(fingerprint, store):
+            return True
+        self.rebuild(
+            (note_id, entry.get("content", "")) for note_id, entry in store.items()
+        )
+        return False
+
+    def rebuild(self, notes: Iterable[Tuple[str, str]]) -> None:
+        """Baut den Index aus (Kennung, Inhalt)-Paaren neu auf."""
+
+        self._postings = {}
+        self._lengths = {}
+        self._total_length = 0
+        self._trigrams = None
+        for note_id, content in notes:
+            self._add(note_id, note_terms(content))
+        self._stale.clear()
+        self._stale_since = None
+        self.loaded = True
+        self.dirty = True
+
+    def update(self, note_id: str, content: str | None, previous: str | None) -> None:
+        """Ersetzt den Inhalt einer Notiz (`content` None = gelöscht)."""
+
+        if previous is not None or note_id in self._lengths:
+            self._remove(note_id, note_terms(previous or ""))
+        if content is not None:
+            self._add(note_id, note_terms(content))
+        self._unsaved.add(note_id)
+        self.dirty = True
+
+    def mark_stale(self, note_id: str, store: NoteStore) -> None:
+        """Merkt eine Änderung vor, ohne den Index zu laden.
+
+        Muss vor der Änderung im Store aufgerufen werden: Der gespeicherte
+        Index gilt für den Stand davor.
+        """
+
+        if self._stale_since is None:
+            self._stale_since = self._saved_fingerprint or store_fingerprint(store)
+        self._saved_fingerprint = None
+        self._stale.add(note_id)
+        self._unsaved.add(note_id)
+
+    def _forget(self, note_ids: Set[str]) -> None:
+        # Ohne die alten Texte: alle Wortlisten einmal durchgehen.
+        postings = self._postings
+        for word in list(postings):
+            documents = postings[word]
+            for note_id in note_ids:
+                documents.pop(note_id, None)
+            if not documents:
+                del postings[word]
+        for note_id in note_ids:
+            self._total_length -= self._lengths.pop(note_id, 0)
+
+    def _add(self, note_id: str, terms: Counter[str]) -> None:
+        postings = self._postings
+        trigrams = self._trigrams
+        for word, count in terms.items():
+            documents = postings.get(word)
+            if documents is None:
+                documents = postings[word] = {}
+                if trigrams is not None:
+                    for trigram in _trigrams(word):
+                        trigrams.setdefault(trigram, set()).add(word)
+            documents[note_id] = count
+        length = sum(terms.values())
+        self._lengths[note_id] = length
+        self._total_length += length
+
+    def _remove(self, note_id: str, terms: Counter[str]) -> None:
+        postings = self._postings
+        for word in terms:
+            documents = postings.get(word)
+            if documents is None or documents.pop(note_id, None) is None:
+                continue
+            if not documents:
+                del postings[word]
+                if self._trigrams is not None:
+                    for trigram in _trigrams(word):
+                        bucket = self._trigrams.get(trigram)
+                        if bucket is not None:
+                            bucket.discard(word)
+                            if not bucket:
+                                del self._trigrams[trigram]
+        self._total_length -= self._lengths.pop(note_id, 0)
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+    def search(self, query: str, *, limit: int = 20) -> List[Tuple[str, float]]:
+        """(Kennung, Punktzahl) der besten Treffer, beste zuerst."""
+
+        terms = list(dict.fromkeys(_WORD_PATTERN.findall(query.lower())))
+        if not terms or limit <= 0 or not self._lengths:
+            return []
+        matches = [self._term_sources(term) for term in terms]
+        if not all(matches):
+            return []
+        # Erst die Kennungen schneiden (schnell, ohne Punktzahlen), dann nur
+        # die verbleibenden Notizen bewerten.
+        candidates = sorted((self._term_keys(sources) for sources in matches), key=len)
+        common = candidates[0]
+        for keys in candidates[1:]:
+            common = common & keys
+            if not common:
+                return []
+        scores = dict.fromkeys(common, 0.0)
+        for sources in matches:
+            for documents, weight in sources:
+                self._accumulate(scores, documents, weight)
+        best = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        return [(note_id, round(score, 4)) for note_id, score in best]
+
+    def _term_sources(self, term: str) -> List[Tuple[Dict[str, int], float]]:
+        """Notizlisten, die ein Begriff trifft, mit Gewicht.
+
+        Alle Wörter, die den Begriff nur enthalten, zählen zusammen wie ein
+        Wort (mit halbem Gewicht).
+        """
+
+        sources: List[Tuple[Dict[str, int], float]] = []
+        exact = self._postings.get(term)
+        if exact is not None:
+            sources.append((exact, 1.0))
+        if len(term) >= 3:
+            partial: Dict[str, int] = {}
+            for word in self._words_containing(term):
+                if word != term:
+                    partial.update(self._postings[word])
+            if partial:
+                sources.append((partial, _SUBSTRING_WEIGHT))
+        return sources
+
+    @staticmethod
+    def _term_keys(sources: List[Tuple[Dict[str, int], float]]) -> AbstractSet[str]:
+        if len(sources) == 1:
+            return sources[0][0].keys()
+        return sources[0][0].keys() | sources[1][0].keys()
+
+    def _accumulate(
+        self, scores: Dict[str, float], documents: Dict[str, int], weight: float
+    ) -> None:
+        count = len(self._lengths)
+        average = self._total_length / count if count else 1.0
+        frequency = len(documents)
+        idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5)) * weight
+        lengths = self._lengths
+        norm = _K1 * (1 - _B)
+        scale = _K1 * _B / (average or 1.0)
+        if len(documents) < len(scores):
+            pairs = ((key, tf) for key, tf in documents.items() if key in scores)
+        else:
+            pairs = ((key, documents[key]) for key in scores if key in documents)
+        # Notizen haben meist ähnliche Längen; der Beitrag wird je (Häufigkeit,
+        # Länge) nur einmal berechnet.
+        gains: Dict[Tuple[int, int], float] = {}
+        for note_id, tf in pairs:
+            key = (tf, lengths[note_id])
+            gain = gains.get(key)
+            if gain is None:
+                gain = gains[key] = idf * tf * (_K1 + 1) / (tf + norm + scale * key[1])
+            scores[note_id] += gain
+
+    def _words_containing(self, term: str) -> List[str]:
+        trigrams = self._trigram_index()
+        buckets = [trigrams.get(trigram) for trigram in _trigrams(term)]
+        if not all(buckets):
+            return []
+        buckets.sort(key=len)  # type: ignore[arg-type]
+        candidates = set(buckets[0])  # type: ignore[arg-type]
+        for bucket in buckets[1:]:
+            candidates &= bucket  # type: ignore[operator]
+            if not candidates:
+                return []
+        # Trigramme können in anderer Reihenfolge vorkommen; daher prüfen.
+        return [word for word in candidates if term in word]
+
+    def _trigram_index(self) -> Dict[str, Set[str]]:
+        if self._trigrams is None:
+            trigrams: Dict[str, Set[str]] = {}
+            for word in self._postings:
+                for trigram in _trigrams(word):
+                    trigrams.setdefault(trigram, set()).add(word)
+            self._trigrams = trigrams
+        return self._trigrams
+
+    # ------------------------------------------------------------------
+    # Persistenz
+    # ------------------------------------------------------------------
+    def save(self, fingerprint: Fingerprint) -> None:
+        """Schreibt den Index samt Fingerabdruck des Stores (atomar)."""
+
+        if self.path is None:
+            return
+        payload = {
+            "version": _INDEX_VERSION,
+            "fingerprint": list(fingerprint),
+            "lengths": self._lengths,
+            "postings": self._postings,
+        }
+        write_atomically(
+            self.path,
+            json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(
+                "utf-8"
+            ),
+        )
+        assert self.delta_path is not None
+        self.delta_path.unlink(missing_ok=True)
+        self._unsaved.clear()
+        self._saved_fingerprint = fingerprint
+        self.dirty = False
+
+    def save_changes(self, fingerprint: Fingerprint) -> None:
+        """Hängt die Kennungen geänderter Notizen an ``notes.search.delta`` an.
+
+        Günstig genug für jedes Speichern; `save` fasst später alles zusammen.
+        Ohne gespeicherten Index gibt es nichts zu ergänzen – `open` baut
+        dann ohnehin neu auf.
+        """
+
+        if self.path is None or not self._unsaved:
+            return
+        if self.path.exists():
+            line = json.dumps(
+                {"ids": sorted(self._unsaved), "fingerprint": list(fingerprint)},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            assert self.delta_path is not None
+            with self.delta_path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+        # Die Änderungen stehen jetzt in der Datei; `open` liest sie von dort.
+        self._unsaved.clear()
+        self._stale.clear()
+        self._stale_since = None
+        self._saved_fingerprint = fingerprint
+
+    def _load(self, fingerprint: Fingerprint, store: NoteStore) -> bool:
+        assert self.path is not None and self.delta_path is not None
+        try:
+            payload = json.loads(self.path.read_bytes())
+        except (OSError, ValueError):
+            return False
+        if not isinstance(payload, dict) or payload.get("version") != _INDEX_VERSION:
+            return False
+        saved = payload.get("fingerprint")
+        changed = set(self._stale)
+        try:
+            with self.delta_path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # abgebrochene letzte Zeile
+                    changed.update(entry["ids"])
+                    saved = entry["fingerprint"]
+        except FileNotFoundError:
+            pass
+        # Vorgemerkte Änderungen fehlen noch auf der Platte.
+        expected = self._stale_since or fingerprint
+        if saved != list(expected):
+            return False
+        self._postings = payload["postings"]
+        self._lengths = payload["lengths"]
+        self._total_length = sum(self._lengths.values())
+        self._trigrams = None
+        if changed:
+            self._forget(changed)
+            for note_id in changed:
+                entry = store.get(note_id)
+                if entry is not None:
+                    self._add(note_id, note_terms(str(entry.get("content", ""))))
+        self._stale.clear()
+        self._stale_since = None
+        self.loaded = True
+        # Nachgelesene Änderungen beim nächsten `save` einarbeiten.
+        self.dirty = bool(changed)
+        return True
+
+
+def make_snippet(
+    content: str, query: str, *, width: int = _SNIPPET_WIDTH
+) -> Dict[str, Any] | None:
+    """Textauszug um den ersten Treffer samt Markierungen (Start, Ende).
+
+    Liefert None, wenn keiner der Begriffe im Text vorkommt.
+    """
+
+    lowered = content.lower()
+    positions = [
+        (position, len(term))
+        for term in dict.fromkeys(_WORD_PATTERN.findall(query.lower()))
+        if (position := lowered.find(term)) >= 0
+    ]
+    if not positions:
+        return None
+    first = min(position for position, _ in positions)
+    start = max(0, first - width // 3)
+    end = min(len(content), start + width)
+    text = content[start:end]
+    prefix = "…" if start > 0 else ""
+    highlights: List[List[int]] = []
+    window = lowered[start:end]
+    for term in dict.fromkeys(_WORD_PATTERN.findall(query.lower())):
+        position = window.find(term)
+        while position >= 0:
+            highlights.append(
+                [len(prefix) + position, len(prefix) + position + len(term)]
+            )
+            position = window.find(term, position + len(term))
+    highlights.sort()
+    return {
+        "text": prefix + text + ("…" if end < len(content) else ""),
+        "highlights": highlights,
+    }
+
+
+def search_notes(
+    index: NoteSearchIndex, store: NoteStore, query: str, *, limit: int = 20
+) -> List[Dict[str, Any]]:
+    """Treffer mit Punktzahl, Zeitstempel und Textauszug, beste zuerst.
+
+    Inhalte werden nur für die gelieferten Treffer gelesen.
+    """
+
+    results: List[Dict[str, Any]] = []
+    for note_id, score in index.search(query, limit=limit):
+        entry: NoteRecord | None = store.get(note_id)
+        if entry is None:
+            continue
+        snippet = make_snippet(str(entry.get("content", "")), query)
+        if snippet is None:
+            continue  # Index war veraltet; Treffer nicht mehr im Text.
+        results.append(
+            {
+                "id": note_id,
+                "score": score,
+                "timestamp": entry.get("timestamp"),
+                "snippet": snippet["text"],
+                "highlights": snippet["highlights"],
+            }
+        )
+    return results
+
+
+__all__ = [
+    "NoteSearchIndex",
+    "make_snippet",
+    "note_terms",
+    "search_index_path",
+    "search_notes",
+    "store_fingerprint",
+]
@@ -0,0 +1,910 @@
+"""Speicherverfahren für Notizen ("Store": Ablage).
+
+`JsonNoteStore` schreibt bei jedem Speichern die komplette `notes.json` neu.
+`JournalNoteStore` hängt stattdessen pro Änderung nur einen Datensatz an ein
+Journal ("Journal": fortlaufendes Änderungsprotokoll) an; die Kosten eines
+Speichervorgangs hängen damit von der Größe der Änderung ab, nicht von der
+Anzahl aller Notizen. Beim Laden wird das Journal über den letzten
+Schnappschuss ("Snapshot": vollständiger Stand) gelegt. Wird das Journal zu
+groß, schreibt ein Hintergrund-Thread einen neuen Schnappschuss
+("Verdichtung"). `SqliteNoteStore` legt jede Notiz als Zeile einer
+SQLite-Datenbank ab und lädt beim Start nichts vorab. `ShardedNoteStore` liest
+beim Start nur eine kleine Indexdatei und lädt Inhalte erst beim Lesen.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+
+NOTE_STORAGE_KINDS: tuple[str, ...] = ("json", "journal", "sqlite", "sharded")
+
+NoteRecord = Dict[str, Any]
+
+
+def write_atomically(path: Path, data: bytes, *, durable: bool = False) -> None:
+    """Ersetzt eine Datei so, dass Leser nie eine halb geschriebene sehen.
+
+    Geschrieben wird erst in eine Nachbardatei (``.tmp``), die dann die alte
+    ersetzt. Mit `durable` landet beides auf dem Datenträger, bevor man sich
+    darauf verlässt (z.B. ein Journal löscht).
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    with temporary.open("wb") as handle:
+        handle.write(data)
+        if durable:
+            handle.flush()
+            os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    if durable:
+        _fsync_directory(path.parent)
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Macht das Umbenennen dauerhaft; nicht jedes System erlaubt das.
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - z.B. Windows
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def _serializable(notes: Dict[str, Any]) -> Dict[str, NoteRecord]:
+    return {
+        note_id: {
+            "content": entry.get("content", ""),
+            "timestamp": entry.get("timestamp", datetime.utcnow().isoformat()),
+        }
+        for note_id, entry in notes.items()
+        if isinstance(entry, dict)
+    }
+
+
+class NoteStore:
+    """Gemeinsame Schnittstelle aller Notizspeicher.
+
+    Notizen sind Wörterbücher mit ``content`` und ``timestamp`` (ISO-Text).
+    `put`/`delete` speichern sofort; `stage` ändert den Stand nur vorläufig
+    und merkt die Notiz vor, bis `flush` alles Vorgemerkte auf einmal
+    schreibt. Lesezugriffe sehen vorgemerkte Änderungen bereits.
+    """
+
+    kind = "base"
+    notes: Mapping[str, Any]
+
+    @property
+    def pending(self) -> int:
+        """Anzahl vorgemerkter, noch nicht geschriebener Änderungen."""
+
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def load(self) -> None:
+        """Öffnet den Speicher bzw. liest den gespeicherten Stand ein."""
+
+        raise NotImplementedError
+
+    def get(self, note_id: str) -> NoteRecord | None:
+        raise NotImplementedError
+
+    def ids(self) -> List[str]:
+        """Alle Kennungen, sortiert."""
+
+        raise NotImplementedError
+
+    def latest_timestamp(self) -> str | None:
+        """Jüngster Zeitstempel aller Notizen (ISO-Text) oder None."""
+
+        raise NotImplementedError
+
+    def items(self) -> Iterator[Tuple[str, NoteRecord]]:
+        """Alle Notizen als (Kennung, Notiz), sortiert nach Kennung."""
+
+        for note_id in self.ids():
+            entry = self.get(note_id)
+            if entry is not None:
+                yield note_id, entry
+
+    def stage(self, note_id: str, entry: NoteRecord | None) -> bool:
+        """Ändert eine Notiz vorläufig (None = löschen).
+
+        Liefert False, wenn eine zu löschende Notiz nicht existierte.
+        """
+
+        raise NotImplementedError
+
+    def put(self, note_id: str, entry: NoteRecord) -> None:
+        self.stage(note_id, entry)
+        self.flush()
+
+    def delete(self, note_id: str) -> bool:
+        if not self.stage(note_id, None):
+            return False
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Schreibt Vorgemerktes und gibt Dateien frei."""
+
+        self.flush()
+
+
+class JsonNoteStore(NoteStore):
+    """Alle Notizen im Speicher, dauerhaft als eine JSON-Datei.
+
+    `notes` ist das Wörterbuch, das der Store füllt und pflegt; übergibt der
+    Aufrufer ein eigenes (z.B. `storage_backend`), wird dieses verwendet.
+    """
+
+    kind = "json"
+
+    def __init__(self, path: Path, *, notes: Dict[str, Any] | None = None) -> None:
+        self.path = Path(path)
+        self.notes: Dict[str, Any] = notes if notes is not None else {}
+        # Vorgemerkte Änderungen: Kennung → neuer Eintrag (None = gelöscht).
+        self._pending: Dict[str, NoteRecord | None] = {}
+        # Jüngster Zeitstempel, in `stage` mitgeführt (ohne Durchlauf aller
+        # Notizen); ungültig nach `load` oder wenn die jüngste Notiz wegfällt.
+        self._latest: str | None = None
+        self._latest_known = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    def load(self) -> None:
+        self._latest_known = False
+        if self.path.exists():
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(raw, dict):
+                self.notes.update(raw)
+
+    def get(self, note_id: str) -> NoteRecord | None:
+        return self.notes.get(note_id)
+
+    def ids(self) -> List[str]:
+        return sorted(self.notes)
+
+    def latest_timestamp(self) -> str | None:
+        if not self._latest_known:
+            timestamps = [
+                entry["timestamp"]
+                for entry in self.notes.values()
+                if isinstance(entry, dict) and "timestamp" in entry
+            ]
+            self._latest = (
+                max(timestamps, key=datetime.fromisoformat) if timestamps else None
+            )
+            self._latest_known = True
+        return self._latest
+
+    def stage(self, note_id: str, entry: NoteRecord | None) -> bool:
+        if entry is None:
+            previous = self.notes.pop(note_id, None)
+            if previous is None:
+                return False
+        else:
+            previous = self.notes.get(note_id)
+            self.notes[note_id] = entry
+        self._pending[note_id] = entry
+        self._track_latest(previous, entry)
+        return True
+
+    def _track_latest(
+        self, previous: NoteRecord | None, entry: NoteRecord | None
+    ) -> None:
+        if not self._latest_known:
+            return
+        latest = self._latest
+        timestamp = entry.get("timestamp") if isinstance(entry, dict) else None
+        if timestamp and (
+            latest is None
+            or datetime.fromisoformat(timestamp) >= datetime.fromisoformat(latest)
+        ):
+            self._latest = timestamp
+        elif isinstance(previous, dict) and previous.get("timestamp") == latest:
+            # Die bisher jüngste Notiz ist weg oder älter: beim nächsten Mal prüfen.
+            self._latest_known = False
+
+    def flush(self) -> None:
+        """Schreibt den vollständigen Stand."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(_serializable(self.notes), indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        self._pending.clear()
+
+
+class JournalNoteStore(JsonNoteStore):
+    """Schnappschuss plus Journal aus JSON-Zeilen (``notes.json.journal``).
+
+    Jede Zeile ist ein Datensatz ``{"op": "put" | "delete", "id": ...,
+    "timestamp": ...}``, bei ``put`` zusätzlich mit ``content``. Eine
+    unvollständige letzte Zeile (Absturz beim Schreiben) wird übergangen.
+
+    Überschreitet das Journal `compact_bytes`, wird es in
+    ``notes.json.journal.1`` umbenannt und ein frisches begonnen; ein
+    Hintergrund-Thread schreibt dann eine Kopie des Stands als neuen
+    Schnappschuss, zwingt ihn auf den Datenträger und löscht erst dann das
+    alte Journal. Stürzt das Programm dazwischen ab, werden beim Laden beide
+    Journale nacheinander eingespielt – das Ergebnis ist dasselbe, da jeder
+    Datensatz den vollständigen Wert trägt. Liegt ``.journal.1`` von einer
+    gescheiterten Verdichtung noch vor, wird das Journal daran angehängt statt
+    es zu ersetzen.
+    """
+
+    kind = "journal"
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        notes: Dict[str, Any] | None = None,
+        compact_bytes: int = 1024 * 1024,
+    ) -> None:
+        if compact_bytes <= 0:
+            raise ValueError("compact_bytes muss größer als 0 sein.")
+        super().__init__(path, notes=notes)
+        self.compact_bytes = compact_bytes
+        self.journal = self.path.with_name(self.path.name + ".journal")
+        self.previous_journal = self.journal.with_name(self.journal.name + ".1")
+        self.errors: List[BaseException] = []
+        self.skipped_records = 0
+        self._handle: Any = None
+        self._journal_size = 0
+        self._compaction: threading.Thread | None = None
+
+    @property
+    def journal_size(self) -> int:
+        """Größe des aktiven Journals in Byte."""
+
+        return self._journal_size
+
+    def load(self, *, repair: bool = True) -> None:
+        """Liest Schnappschuss und Journale.
+
+        Mit `repair` wird ein abgebrochener letzter Datensatz aus dem Journal
+        entfernt, damit weitere Einträge sauber anschließen. Ohne (etwa beim
+        Umzug in einen anderen Store) bleiben alle Dateien unverändert.
+        """
+
+        super().load()
+        if self.previous_journal.exists():
+            self._replay(self.previous_journal.read_bytes())
+        data = self.journal.read_bytes() if self.journal.exists() else b""
+        self._replay(data)
+        complete = data.rfind(b"\n") + 1
+        if repair and complete < len(data):
+            # Abgebrochenen Datensatz abschneiden, sonst hinge der nächste an.
+            with self.journal.open("r+b") as handle:
+                handle.truncate(complete)
+        self._journal_size = complete
+
+    def flush(self) -> None:
+        """Hängt alle vorgemerkten Änderungen in einem Schreibvorgang an."""
+
+        if not self._pending:
+            return
+        deleted_at = datetime.utcnow().isoformat()
+        records = [
+            (
+                {"op": "delete", "id": note_id, "timestamp": deleted_at}
+                if entry is None
+                else {
+                    "op": "put",
+                    "id": note_id,
+                    "content": entry.get("content", ""),
+                    "timestamp": entry.get("timestamp"),
+                }
+            )
+            for note_id, entry in self._pending.items()
+        ]
+        self._pending.clear()
+        self._append(records)
+
+    def compact(self, *, background: bool = True) -> None:
+        """Schreibt einen neuen Schnappschuss und beginnt ein leeres Journal."""
+
+        self.flush()
+        self.wait_for_compaction()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self.journal.exists():
+            if self.previous_journal.exists():
+                self._merge_into_previous_journal()
+            else:
+                os.replace(self.journal, self.previous_journal)
+        self._journal_size = 0
+        snapshot = dict(self.notes)
+        if not background:
+            self._write_snapshot(snapshot)
+            return
+        self._compaction = threading.Thread(
+            target=self._write_snapshot,
+            args=(snapshot,),
+            name="dashboardtool-notes-compaction",
+            daemon=True,
+        )
+        self._compaction.start()
+
+    def wait_for_compaction(self) -> None:
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+            self._compaction = None
+
+    def close(self) -> None:
+        """Schreibt Vorgemerktes, wartet auf eine Verdichtung, schließt das Journal."""
+
+        self.flush()
+        self.wait_for_compaction()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _append(self, records: List[NoteRecord]) -> None:
+        data = b"".join(
+            (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            for record in records
+        )
+        if self._handle is None:
+            self.journal.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.journal.open("ab")
+        self._handle.write(data)
+        self._handle.flush()
+        self._journal_size += len(data)
+        if self._journal_size >= self.compact_bytes and not self._compacting():
+            self.compact()
+
+    def _merge_into_previous_journal(self) -> None:
+        # Das alte Journal wird noch gebraucht (sein Schnappschuss fehlt):
+        # anhängen, dauerhaft machen und erst dann das aktive entfernen.
+        data = self.journal.read_bytes()
+        with self.previous_journal.open("r+b") as handle:
+            handle.seek(0, os.SEEK_END)
+            if handle.tell() > 0:
+                handle.seek(-1, os.SEEK_END)
+                if handle.read(1) != b"\n":
+                    handle.write(b"\n")  # abgebrochene Zeile abschließen
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.journal.unlink()
+
+    def _compacting(self) -> bool:
+        return self._compaction is not None and self._compaction.is_alive()
+
+    def _write_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        try:
+            write_atomically(
+                self.path,
+                json.dumps(_serializable(snapshot), ensure_ascii=False).encode("utf-8"),
+                durable=True,
+            )
+            self.previous_journal.unlink(missing_ok=True)
+        except Exception as exc:  # pragma: no cover - Schreibschutz
+            # Das alte Journal bleibt liegen und wird beim Laden eingespielt.
+            self.errors.append(exc)
+
+    def _replay(self, data: bytes) -> None:
+        for raw in data.splitlines():
+            try:
+                record = json.loads(raw)
+                operation = record["op"]
+                note_id = record["id"]
+            except (ValueError, TypeError, KeyError):
+                self.skipped_records += 1
+                continue
+            if operation == "put":
+                self.notes[note_id] = {
+                    "content": record.get("content", ""),
+                    "timestamp": record.get("timestamp")
+                    or datetime.utcnow().isoformat(),
+                }
+            elif operation == "delete":
+                self.notes.pop(note_id, None)
+            else:
+                self.skipped_records += 1
+
+
+def _read_legacy_notes(path: Path) -> Dict[str, Any]:
+    """Notizen aus ``notes.json`` samt Journalen, ohne die Dateien anzufassen."""
+
+    legacy = JournalNoteStore(path)
+    legacy.load(repair=False)
+    return legacy.notes
+
+
+class _NotesView(Mapping[str, NoteRecord]):
+    """Nur-Lese-Sicht auf einen Store im Stil eines Wörterbuchs."""
+
+    def __init__(self, store: NoteStore) -> None:
+        self._store = store
+
+    def __getitem__(self, note_id: str) -> NoteRecord:
+        entry = self._store.get(note_id)
+        if entry is None:
+            raise KeyError(note_id)
+        return entry
+
+    def __contains__(self, note_id: object) -> bool:
+        return isinstance(note_id, str) and self._store.get(note_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.ids())
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS notes ("
+    " id TEXT PRIMARY KEY, content TEXT NOT NULL, timestamp TEXT NOT NULL"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS notes_by_timestamp ON notes (timestamp)",
+)
+_PRAGMAS = (
+    # WAL: Leser blockieren Schreiber nicht, ein Commit hängt nur Seiten an.
+    "PRAGMA journal_mode=WAL",
+    # In WAL-Betrieb sicher gegen Programmabstürze, fsync nur beim Checkpoint.
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+_SCHEMA_VERSION = 1
+
+
+class SqliteNoteStore(NoteStore):
+    """Notizen als Zeilen einer SQLite-Datenbank (``notes.db``).
+
+    Lesen, Auflisten und Speichern gehen direkt an die Datenbank; beim Start
+    wird keine Notiz geladen, und ein Speichern ändert genau eine Zeile.
+    Kennung und Zeitstempel sind indiziert (`latest_timestamp` ist damit eine
+    Indexabfrage). Beim ersten Öffnen werden vorhandene Notizen aus
+    ``notes.json`` samt Journal übernommen ("Migration"); die JSON-Dateien
+    bleiben unverändert liegen. Die Verbindung wird mit einer Sperre
+    geschützt und darf aus mehreren Threads genutzt werden.
+    """
+
+    kind = "sqlite"
+
+    def __init__(self, path: Path, *, database: Path | None = None) -> None:
+        self.path = Path(path)
+        self.database = (
+            Path(database) if database is not None else self.path.with_suffix(".db")
+        )
+        self.notes = _NotesView(self)
+        self.migrated = 0
+        self._pending: Dict[str, NoteRecord | None] = {}
+        self._lock = threading.RLock()
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._pending:
+                return len(self.ids())
+            (count,) = self._db().execute("SELECT COUNT(*) FROM notes").fetchone()
+            return count
+
+    def load(self) -> None:
+        with self._lock:
+            connection = self._db()
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            if version < _SCHEMA_VERSION:
+                self.migrated = self._migrate(connection)
+                connection.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+
+    def get(self, note_id: str) -> NoteRecord | None:
+        with self._lock:
+            if note_id in self._pending:
+                return self._pending[note_id]
+            row = (
+                self._db()
+                .execute(
+                    "SELECT content, timestamp FROM notes WHERE id = ?", (note_id,)
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        return {"content": row[0], "timestamp": row[1]}
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            stored = [
+                row[0] for row in self._db().execute("SELECT id FROM notes ORDER BY id")
+            ]
+            if not self._pending:
+                return stored
+            present = set(stored)
+            for note_id, entry in self._pending.items():
+                if entry is None:
+                    present.discard(note_id)
+                else:
+                    present.add(note_id)
+            return sorted(present)
+
+    def items(self) -> Iterator[Tuple[str, NoteRecord]]:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT id, content, timestamp FROM notes ORDER BY id"
+            )
+            notes = {row[0]: {"content": row[1], "timestamp": row[2]} for row in rows}
+            pending = dict(self._pending)
+        for note_id, entry in pending.items():
+            if entry is None:
+                notes.pop(note_id, None)
+            else:
+                notes[note_id] = entry
+        for note_id in sorted(notes):
+            yield note_id, notes[note_id]
+
+    def latest_timestamp(self) -> str | None:
+        with self._lock:
+            (latest,) = (
+                self._db().execute("SELECT MAX(timestamp) FROM notes").fetchone()
+            )
+            staged = [entry["timestamp"] for entry in self._pending.values() if entry]
+        candidates = [value for value in (latest, *staged) if value]
+        return max(candidates, key=datetime.fromisoformat) if candidates else None
+
+    def stage(self, note_id: str, entry: NoteRecord | None) -> bool:
+        with self._lock:
+            if entry is None and self.get(note_id) is None:
+                return False
+            self._pending[note_id] = entry
+            return True
+
+    def flush(self) -> None:
+        """Schreibt alle vorgemerkten Änderungen in einer Transaktion."""
+
+        with self._lock:
+            if not self._pending:
+                return
+            upserts = [
+                (note_id, entry.get("content", ""), _timestamp_of(entry))
+                for note_id, entry in self._pending.items()
+                if entry is not None
+            ]
+            deletes = [
+                (note_id,) for note_id, entry in self._pending.items() if entry is None
+            ]
+            connection = self._db()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO notes (id, content, timestamp)"
+                    " VALUES (?, ?, ?)",
+                    upserts,
+                )
+                connection.executemany("DELETE FROM notes WHERE id = ?", deletes)
+            self._pending.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.database.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.database, check_same_thread=False)
+            for pragma in _PRAGMAS:
+                connection.execute(pragma)
+            with connection:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+            self._connection = connection
+        return self._connection
+
+    def _migrate(self, connection: sqlite3.Connection) -> int:
+        rows = [
+            (note_id, entry.get("content", ""), _timestamp_of(entry))
+            for note_id, entry in _read_legacy_notes(self.path).items()
+            if isinstance(entry, dict)
+        ]
+        with connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO notes (id, content, timestamp) VALUES (?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+
+class ShardedNoteStore(NoteStore):
+    """Kleine Indexdatei plus Inhalte in Teildateien ("Shards").
+
+    ``notes.index.json`` hält je Notiz Zeitstempel, Größe in Byte und die
+    Nummer der Teildatei; die Inhalte liegen in ``notes.shards/NN.json``.
+    Welche Teildatei eine Notiz bekommt, folgt aus einer Prüfsumme der
+    Kennung. Beim Start wird nur der Index gelesen – Anzahl, Kennungen und
+    jüngster Zeitstempel kommen von dort. Inhalte werden beim ersten Lesen
+    geladen, immer eine ganze Teildatei; die zuletzt benutzten
+    `cache_shards` Teildateien bleiben im Speicher ("LRU": die am längsten
+    unbenutzte wird zuerst verworfen). Ein Speichern schreibt die
+    betroffenen Teildateien und den Index neu.
+
+    Beim ersten Öffnen werden Notizen aus ``notes.json`` samt Journal
+    übernommen; die JSON-Dateien bleiben unverändert liegen.
+    """
+
+    kind = "sharded"
+
+    def __init__(self, path: Path, *, shards: int = 64, cache_shards: int = 8) -> None:
+        if shards <= 0 or cache_shards <= 0:
+            raise ValueError("shards und cache_shards müssen größer als 0 sein.")
+        self.path = Path(path)
+        self.index_file = self.path.with_suffix(".index.json")
+        self.shard_directory = self.path.with_suffix(".shards")
+        self.shards = shards
+        self.cache_shards = cache_shards
+        self.notes = _NotesView(self)
+        self.migrated = 0
+        self.shard_reads = 0
+        # Kennung -> [Zeitstempel, Größe, Teildatei]
+        self._index: Dict[str, List[Any]] = {}
+        self._latest: str | None = None
+        self._pending: Dict[str, NoteRecord | None] = {}
+        self._cache: OrderedDict[int, Dict[str, str]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def cached_shards(self) -> List[int]:
+        """Teildateien im Speicher, die zuletzt benutzte zuletzt."""
+
+        return list(self._cache)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.ids()) if self._pending else len(self._index)
+
+    def load(self) -> None:
+        with self._lock:
+            if self.index_file.exists():
+                payload = json.loads(self.index_file.read_bytes())
+                # Die Zuordnung zu Teildateien hängt an der gespeicherten Anzahl.
+                self.shards = int(payload.get("shards", self.shards))
+                self._index = payload.get("notes", {})
+                self._latest = payload.get("latest")
+                return
+            for note_id, entry in _read_legacy_notes(self.path).items():
+                if isinstance(entry, dict):
+                    self._pending[note_id] = {
+                        "content": entry.get("content", ""),
+                        "timestamp": _timestamp_of(entry),
+                    }
+            self.migrated = len(self._pending)
+            self.flush()
+
+    def get(self, note_id: str) -> NoteRecord | None:
+        with self._lock:
+            if note_id in self._pending:
+                return self._pending[note_id]
+            meta = self._index.get(note_id)
+            if meta is None:
+                return None
+            content = self._shard(meta[2]).get(note_id, "")
+        return {"content": content, "timestamp": meta[0]}
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            if not self._pending:
+                return sorted(self._index)
+            present = set(self._index)
+            for note_id, entry in self._pending.items():
+                if entry is None:
+                    present.discard(note_id)
+                else:
+                    present.add(note_id)
+            return sorted(present)
+
+    def items(self) -> Iterator[Tuple[str, NoteRecord]]:
+        with self._lock:
+            notes: Dict[str, NoteRecord] = {}
+            for shard in sorted({meta[2] for meta in self._index.values()}):
+                # Ohne Cache lesen, damit ein Durchlauf ihn nicht verdrängt.
+                contents = self._cache.get(shard)
+                if contents is None:
+                    contents = self._read_shard(shard)
+                for note_id, content in contents.items():
+                    meta = self._index.get(note_id)
+                    if meta is not None:
+                        notes[note_id] = {"content": content, "timestamp": meta[0]}
+            for note_id, entry in self._pending.items():
+                if entry is None:
+                    notes.pop(note_id, None)
+                else:
+                    notes[note_id] = entry
+        for note_id in sorted(notes):
+            yield note_id, notes[note_id]
+
+    def latest_timestamp(self) -> str | None:
+        with self._lock:
+            staged = [entry["timestamp"] for entry in self._pending.values() if entry]
+            candidates = [value for value in (self._latest, *staged) if value]
+        return max(candidates, key=datetime.fromisoformat) if candidates else None
+
+    def size_of(self, note_id: str) -> int | None:
+        """Gespeicherte Größe des Inhalts in Byte (aus dem Index)."""
+
+        with self._lock:
+            meta = self._index.get(note_id)
+            return meta[1] if meta is not None else None
+
+    def stage(self, note_id: str, entry: NoteRecord | None) -> bool:
+        with self._lock:
+            if entry is None and self.get(note_id) is None:
+                return False
+            self._pending[note_id] = entry
+            return True
+
+    def flush(self) -> None:
+        """Schreibt betroffene Teildateien und danach den Index."""
+
+        with self._lock:
+            if not self._pending:
+                return
+            changes: Dict[int, Dict[str, NoteRecord | None]] = {}
+            for note_id, entry in self._pending.items():
+                changes.setdefault(self.shard_of(note_id), {})[note_id] = entry
+            replaced_latest = False
+            written: List[str] = []
+            for shard, entries in sorted(changes.items()):
+                contents = dict(self._shard(shard))
+                for note_id, entry in entries.items():
+                    previous = self._index.pop(note_id, None)
+                    replaced_latest |= (
+                        previous is not None and previous[0] == self._latest
+                    )
+                    if entry is None:
+                        contents.pop(note_id, None)
+                        continue
+                    content = str(entry.get("content", ""))
+                    timestamp = _timestamp_of(entry)
+                    contents[note_id] = content
+                    self._index[note_id] = [
+                        timestamp,
+                        len(content.encode("utf-8")),
+                        shard,
+                    ]
+                    written.append(timestamp)
+                write_atomically(
+                    self._shard_path(shard),
+                    json.dumps(contents, ensure_ascii=False).encode("utf-8"),
+                )
+                self._remember(shard, contents)
+            self._latest = self._next_latest(written, replaced_latest)
+            write_atomically(
+                self.index_file,
+                json.dumps(
+                    {
+                        "shards": self.shards,
+                        "latest": self._latest,
+                        "notes": self._index,
+                    },
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                ).encode("utf-8"),
+            )
+            self._pending.clear()
+
+    def shard_of(self, note_id: str) -> int:
+        return zlib.crc32(note_id.encode("utf-8")) % self.shards
+
+    def _next_latest(self, written: List[str], replaced_latest: bool) -> str | None:
+        candidates = [value for value in (self._latest, *written) if value]
+        latest = max(candidates, key=datetime.fromisoformat) if candidates else None
+        if replaced_latest and latest == self._latest:
+            # Die bisher jüngste Notiz ist weg oder älter: einmal alles prüfen.
+            return max(
+                (meta[0] for meta in self._index.values()),
+                key=datetime.fromisoformat,
+                default=None,
+            )
+        return latest
+
+    def _shard_path(self, shard: int) -> Path:
+        return self.shard_directory / f"{shard:02d}.json"
+
+    def _shard(self, shard: int) -> Dict[str, str]:
+        contents = self._cache.get(shard)
+        if contents is not None:
+            self._cache.move_to_end(shard)
+            return contents
+        contents = self._read_shard(shard)
+        self._remember(shard, contents)
+        return contents
+
+    def _read_shard(self, shard: int) -> Dict[str, str]:
+        path = self._shard_path(shard)
+        if not path.exists():
+            return {}
+        self.shard_reads += 1
+        return json.loads(path.read_bytes())
+
+    def _remember(self, shard: int, contents: Dict[str, str]) -> None:
+        self._cache[shard] = contents
+        self._cache.move_to_end(shard)
+        while len(self._cache) > self.cache_shards:
+            self._cache.popitem(last=False)
+
+
+def _timestamp_of(entry: NoteRecord) -> str:
+    return str(entry.get("timestamp") or datetime.utcnow().isoformat())
+
+
+def create_note_store(
+    kind: str,
+    path: Path,
+    *,
+    notes: Dict[str, Any] | None = None,
+    compact_bytes: int = 1024 * 1024,
+    shards: int = 64,
+    cache_shards: int = 8,
+) -> NoteStore:
+    """Erzeugt den Store für das gewünschte Speicherverfahren.
+
+    `path` ist die JSON-Datei (``notes.json``); die Datenbank liegt daneben.
+    """
+
+    if kind == "json":
+        return JsonNoteStore(path, notes=notes)
+    if kind == "journal":
+        return JournalNoteStore(path, notes=notes, compact_bytes=compact_bytes)
+    if kind in ("sqlite", "sharded") and notes is not None:
+        raise ValueError(
+            f"Ein eigenes storage_backend-Wörterbuch passt nicht zu {kind}."
+        )
+    if kind == "sqlite":
+        return SqliteNoteStore(path)
+    if kind == "sharded":
+        return ShardedNoteStore(path, shards=shards, cache_shards=cache_shards)
+    raise ValueError(
+        "Unbekanntes Speicherverfahren. Erlaubt sind: " + ", ".join(NOTE_STORAGE_KINDS)
+    )
+
+
+__all__ = [
+    "NOTE_STORAGE_KINDS",
+    "JournalNoteStore",
+    "JsonNoteStore",
+    "NoteStore",
+    "ShardedNoteStore",
+    "SqliteNoteStore",
+    "create_note_store",
+    "write_atomically",
+]
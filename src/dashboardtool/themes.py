@@ -2,56 +2,120 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Tuple
 
 
-def _hex_to_rgb(value: str) -> Tuple[float, float, float]:
-    """Konvertiert HEX-Farben in RGB-Werte zwischen 0 und 1."""
+# Paare (Vordergrund, Hintergrund), die `validate_theme_accessibility` prüft.
+ACCESSIBILITY_PAIRS: Tuple[Tuple[str, str], ...] = (
+    ("text_primary", "background"),
+    ("text_primary", "surface"),
+    ("text_secondary", "background"),
+)
 
+
+def _channel_to_linear(channel: float) -> float:
+    """Wandelt einen sRGB-Kanal (0–1) in linearen Lichtanteil um (WCAG 2.1)."""
+
+    if channel <= 0.03928:
+        return channel / 12.92
+    return ((channel + 0.055) / 1.055) ** 2.4
+
+
+# Nachschlagetabelle ("LUT": vorab berechnete Werte) für alle 256 Kanalwerte
+# einer #RRGGBB-Farbe; spart die Potenzrechnung bei jedem Aufruf.
+_SRGB_TO_LINEAR: Tuple[float, ...] = tuple(
+    _channel_to_linear(value / 255) for value in range(256)
+)
+
+
+def _hex_channels(value: str) -> Tuple[int, int, int]:
     value = value.lstrip("#")
     if len(value) != 6:
         raise ValueError("Farben müssen im Format #RRGGBB vorliegen, z.B. '#112233'.")
-    return tuple(int(value[i : i + 2], 16) / 255 for i in (0, 2, 4))  # type: ignore[misc]
+    return tuple(int(value[i : i + 2], 16) for i in (0, 2, 4))  # type: ignore[return-value]
 
 
-def _relative_luminance(rgb: Tuple[float, float, float]) -> float:
-    """Berechnet die relative Helligkeit gemäß WCAG 2.1."""
+@lru_cache(maxsize=4096)
+def _hex_luminance(color: str) -> float:
+    """Relative Helligkeit einer HEX-Farbe über die Nachschlagetabelle."""
 
-    def transform(channel: float) -> float:
-        if channel <= 0.03928:
-            return channel / 12.92
-        return ((channel + 0.055) / 1.055) ** 2.4
-
-    r, g, b = map(transform, rgb)
+    r, g, b = (_SRGB_TO_LINEAR[channel] for channel in _hex_channels(color))
     return 0.2126 * r + 0.7152 * g + 0.0722 * b
 
 
+def _ratio(lum_a: float, lum_b: float) -> float:
+    lighter, darker = max(lum_a, lum_b), min(lum_a, lum_b)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
 def contrast_ratio(color_a: str, color_b: str) -> float:
     """Berechnet den Kontrast zwischen zwei HEX-Farben."""
 
-    lum_a = _relative_luminance(_hex_to_rgb(color_a))
-    lum_b = _relative_luminance(_hex_to_rgb(color_b))
-    lighter, darker = max(lum_a, lum_b), min(lum_a, lum_b)
-    return (lighter + 0.05) / (darker + 0.05)
+    return _ratio(_hex_luminance(color_a), _hex_luminance(color_b))
+
+
+def validate_theme_accessibility(theme: Mapping[str, str]) -> Dict[str, float]:
+    """Prüft wichtige Kontrastverhältnisse und liefert sie zurück.
+
+    Ergebnisse werden nach den geprüften Farben zwischengespeichert; gleiche
+    Themes werden also nur einmal berechnet. Jeder Aufruf liefert ein neues
+    Wörterbuch.
+    """
+
+    key = tuple(theme.get(name) for pair in ACCESSIBILITY_PAIRS for name in pair)
+    return dict(_accessibility_report(key))
 
 
-def validate_theme_accessibility(theme: Dict[str, str]) -> Dict[str, float]:
-    """Prüft wichtige Kontrastverhältnisse und liefert sie zurück."""
+@lru_cache(maxsize=256)
+def _accessibility_report(
+    colors: Tuple[str | None, ...]
+) -> Tuple[Tuple[str, float], ...]:
+    report = []
+    for index, (foreground, background) in enumerate(ACCESSIBILITY_PAIRS):
+        color_fg, color_bg = colors[2 * index], colors[2 * index + 1]
+        if color_fg is not None and color_bg is not None:
+            report.append(
+                (f"{foreground}_vs_{background}", contrast_ratio(color_fg, color_bg))
+            )
+    return tuple(report)
 
-    pairs: Iterable[Tuple[str, str]] = (
-        ("text_primary", "background"),
-        ("text_primary", "surface"),
-        ("text_secondary", "background"),
-    )
+
+def contrast_matrix(colors: Mapping[str, str]) -> Dict[str, Dict[str, float]]:
+    """Kontrast jeder Farbe zu jeder anderen ("Matrix": Tabelle aller Paare).
+
+    `colors` ordnet Namen HEX-Farben zu, z.B. ein Theme. Das Ergebnis ist
+    symmetrisch; jede Helligkeit wird nur einmal berechnet.
+    """
+
+    luminance = {name: _hex_luminance(color) for name, color in colors.items()}
     return {
-        f"{foreground}_vs_{background}": contrast_ratio(
-            theme[foreground], theme[background]
-        )
-        for foreground, background in pairs
-        if foreground in theme and background in theme
+        name: {other: _ratio(lum, lum_other) for other, lum_other in luminance.items()}
+        for name, lum in luminance.items()
     }
 
 
+def validate_theme_catalog(
+    themes: Mapping[str, Mapping[str, str]],
+    *,
+    minimum: float = 4.5,
+) -> Dict[str, Dict[str, Any]]:
+    """Prüft viele Themes auf einmal ("Katalog": Sammlung von Themes).
+
+    Liefert je Theme die Kontrastwerte (wie `validate_theme_accessibility`)
+    unter ``report`` und die Paare unter `minimum` (WCAG AA: 4,5) unter
+    ``failures``. Farben, die in mehreren Themes vorkommen, werden nur
+    einmal umgerechnet.
+    """
+
+    catalog: Dict[str, Dict[str, Any]] = {}
+    for name, theme in themes.items():
+        report = validate_theme_accessibility(theme)
+        failures = sorted(pair for pair, ratio in report.items() if ratio < minimum)
+        catalog[name] = {"report": report, "failures": failures}
+    return catalog
+
+
 THEME_PRESETS: Dict[str, Dict[str, str]] = {
     "aurora": {
         "background": "#0b132b",
@@ -1,4 +1,12 @@
-from src.dashboardtool import DEFAULT_CONFIG, validate_theme_accessibility
+import pytest
+
+from src.dashboardtool import (
+    DEFAULT_CONFIG,
+    contrast_matrix,
+    contrast_ratio,
+    validate_theme_accessibility,
+    validate_theme_catalog,
+)
 
 
 def test_has_four_theme_presets():
@@ -38,3 +46,47 @@ def test_theme_accessibility_is_above_minimum():
         report = validate_theme_accessibility(theme)
         assert report, "Es sollten Kontrastwerte berechnet werden"
         assert all(value >= 4.5 for value in report.values())
+
+
+def test_contrast_lookup_table_matches_wcag_formula():
+    from src.dashboardtool.themes import _SRGB_TO_LINEAR
+
+    for value in (0, 10, 11, 128, 255):
+        channel = value / 255
+        expected = (
+            channel / 12.92
+            if channel <= 0.03928
+            else ((channel + 0.055) / 1.055) ** 2.4
+        )
+        assert _SRGB_TO_LINEAR[value] == expected
+    assert contrast_ratio("#000000", "#FFFFFF") == pytest.approx(21.0)
+
+
+def test_theme_reports_are_memoized_but_independent():
+    theme = DEFAULT_CONFIG.themes["aurora"]
+    first = validate_theme_accessibility(theme)
+    first["text_primary_vs_background"] = 0.0
+
+    assert validate_theme_accessibility(dict(theme)) != first
+
+
+def test_contrast_matrix_and_catalog():
+    matrix = contrast_matrix(
+        {"hell": "#ffffff", "dunkel": "#000000", "grau": "#777777"}
+    )
+    assert matrix["hell"]["dunkel"] == matrix["dunkel"]["hell"]
+    assert matrix["grau"]["grau"] == 1.0
+
+    catalog = validate_theme_catalog(
+        {
+            **DEFAULT_CONFIG.themes,
+            "blass": {
+                "background": "#ffffff",
+                "surface": "#ffffff",
+                "text_primary": "#000000",
+                "text_secondary": "#dddddd",
+            },
+        }
+    )
+    assert catalog["aurora"]["failures"] == []
+    assert catalog["blass"]["failures"] == ["text_secondary_vs_background"]
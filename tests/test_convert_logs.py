@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+from tools.convert_logs import main
+
+
+def test_convert_logs_round_trip(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "debug.log"
+    lines = [
+        {
+            "timestamp": "2024-05-01T10:00:00",
+            "level": "info",
+            "message": "Start",
+            "source": "ui",
+        },
+        {
+            "timestamp": "2024-05-01T10:00:01",
+            "level": "ERROR",
+            "message": "Grüße",
+            "source": "api",
+        },
+    ]
+    source.write_text(
+        "\n".join(json.dumps(line, ensure_ascii=False) for line in lines)
+        + "\nkein json\n",
+        encoding="utf-8",
+    )
+
+    assert main(["to-binary", str(source), str(tmp_path / "debug.logb")]) == 0
+    assert "2 Einträge umgewandelt, 1 Zeilen übersprungen" in capsys.readouterr().out
+    assert (
+        main(["to-jsonl", str(tmp_path / "debug.logb"), str(tmp_path / "back.log")])
+        == 0
+    )
+
+    restored = [
+        json.loads(line)
+        for line in (tmp_path / "back.log").read_text(encoding="utf-8").splitlines()
+    ]
+    lines[1]["level"] = "error"
+    assert restored == lines
+    assert main(["to-jsonl", str(source), str(tmp_path / "kaputt.log")]) == 1
@@ -1,3 +1,9 @@
+import logging
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
 from dataclasses import replace
 from pathlib import Path
 
@@ -6,6 +12,8 @@ import pytest
 from modules.base import ModuleContext
 from modules.debug import DebugModule
 from src.dashboardtool import DEFAULT_CONFIG
+from src.dashboardtool.logfiles import wait_for_compression
+from src.dashboardtool.logging import decode_binary_log
 
 
 @pytest.fixture()
@@ -45,3 +53,375 @@ def test_debug_module_restores_existing_log(tmp_context: ModuleContext) -> None:
     module.log_event("Alt", level="info")
     module2 = DebugModule(context=tmp_context)
     assert module2.render()["loaded_entries"] >= 1
+
+
+def test_debug_module_restores_only_newest_entries(
+    tmp_context: ModuleContext,
+) -> None:
+    module = DebugModule(context=tmp_context)
+    for index in range(20):
+        module.log_event(f"Eintrag {index}", level="info")
+    with module.log_file.open("a", encoding="utf-8") as handle:
+        handle.write("kein json\n")
+
+    restored = DebugModule(context=tmp_context, max_entries=5)
+    messages = [entry["message"] for entry in restored.get_recent()]
+    assert messages == [f"Eintrag {index}" for index in range(15, 20)]
+    assert restored.render()["loaded_entries"] == 5
+
+
+def test_debug_module_group_commit_flushes_on_demand(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG,
+        log_directory=tmp_path / "logs",
+        log_batch_max_lines=100,
+        log_batch_max_delay_seconds=60,
+    )
+    module = DebugModule(
+        context=ModuleContext(config=config, storage_path=tmp_path / "data")
+    )
+    module.log_event("Gepuffert")
+    assert not module.log_file.exists()
+
+    module.flush()
+    assert "Gepuffert" in module.log_file.read_text(encoding="utf-8")
+
+
+def test_debug_module_rotation_keeps_history_readable(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG,
+        log_directory=tmp_path / "logs",
+        log_rotation_max_bytes=400,
+        log_rotation_max_segments=10,
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    module = DebugModule(context=context)
+    for index in range(30):
+        module.log_event(f"Eintrag {index}")
+    module.close()
+    wait_for_compression()
+
+    assert module.log_segments()
+    assert module.log_file.stat().st_size <= 400
+
+    restored = DebugModule(context=context, max_entries=25)
+    assert restored.get_recent()[0]["message"] == "Eintrag 5"
+
+    history = restored.export_history(tmp_path / "export" / "history.jsonl")
+    lines = history.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 30
+
+    restored.clear_events()
+    assert restored.log_segments() == []
+
+
+def test_debug_module_filters_recent_by_level(tmp_context: ModuleContext) -> None:
+    module = DebugModule(context=tmp_context)
+    module.log_event("Start", level="debug")
+    module.log_event("Langsam", level="warning")
+    module.log_event("Abbruch", level="error")
+
+    recent = module.get_recent(minimum_level="warning")
+    assert [entry["message"] for entry in recent] == ["Langsam", "Abbruch"]
+    assert module.render()["status"]["level_counts"]["error"] == 1
+
+
+def test_debug_module_since_feeds_deltas(tmp_context: ModuleContext) -> None:
+    module = DebugModule(context=tmp_context)
+    module.log_event("Alt")
+    cursor = module.render()["stream"]["cursor"]
+    module.log_event("Neu")
+
+    feed = module.since(cursor)
+    assert [entry["message"] for entry in feed["entries"]] == ["Neu"]
+    assert feed["entries"][0]["sequence"] == feed["cursor"]
+    assert module.since(feed["cursor"])["entries"] == []
+
+
+def test_debug_module_background_ingestion(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG, log_directory=tmp_path / "logs", log_ingestion="background"
+    )
+    module = DebugModule(
+        context=ModuleContext(config=config, storage_path=tmp_path / "data")
+    )
+    threads = [
+        threading.Thread(
+            target=lambda n=n: [module.log_event(f"{n}-{i}") for i in range(50)]
+        )
+        for n in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    module.flush()
+
+    assert len(module.get_recent()) == 250
+    assert len(module.log_file.read_text(encoding="utf-8").splitlines()) == 400
+    with pytest.raises(ValueError):
+        module.log_event("Fehler", level="fatal")
+    module.close()
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_debug_module_search(tmp_context: ModuleContext, indexed: bool) -> None:
+    config = replace(tmp_context.config, log_search_index=indexed)
+    module = DebugModule(context=replace(tmp_context, config=config))
+    assert (module.search_index is not None) == indexed
+    module.log_event("Timeout bei req-7", level="error", source="api")
+    module.log_event("Start abgeschlossen", level="info")
+
+    found = module.search("timeout", minimum_level="warning")
+    assert [entry["message"] for entry in found] == ["Timeout bei req-7"]
+    assert module.render()["stream"]["available_filters"]["search"]
+
+
+def test_debug_module_recent_time_window(tmp_context: ModuleContext) -> None:
+    module = DebugModule(context=tmp_context)
+    base_time = datetime(2024, 5, 1, 14, 0, 0)
+    for minute, level in enumerate(["info", "error", "warning", "error", "info"]):
+        module.buffer.add(
+            f"Minute {minute}",
+            level=level,
+            timestamp=base_time + timedelta(minutes=minute),
+        )
+
+    window = module.get_recent(
+        start="2024-05-01T14:01:00", end=base_time + timedelta(minutes=3)
+    )
+    assert [entry["message"] for entry in window] == [f"Minute {n}" for n in (1, 2, 3)]
+    errors = module.get_recent(minimum_level="error", start=base_time)
+    assert [entry["message"] for entry in errors] == ["Minute 1", "Minute 3"]
+    with pytest.raises(ValueError):
+        module.get_recent(start="gestern")
+
+
+def test_debug_module_exposes_rates(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG, log_directory=tmp_path / "logs", log_rate_aggregates=True
+    )
+    module = DebugModule(
+        context=ModuleContext(config=config, storage_path=tmp_path / "data")
+    )
+    module.log_event("Timeout", level="error", source="api")
+    module.log_event("Timeout", level="error", source="api")
+
+    assert module.render()["status"]["rates"]["1m"]["error"] == 2
+    rates = module.rates("1h")
+    assert rates["sources"]["api"]["error"] == 2
+    assert len(rates["series"]) == 24
+
+
+def test_debug_module_history_reads_log_files(tmp_context: ModuleContext) -> None:
+    module = DebugModule(context=tmp_context, max_entries=2)
+    for index in range(5):
+        module.log_event(f"Eintrag {index}", level="info")
+
+    history = module.history(start=datetime.utcnow() - timedelta(minutes=1))
+    assert [entry["message"] for entry in history] == [f"Eintrag {n}" for n in range(5)]
+    assert [entry["message"] for entry in module.history(limit=1)] == ["Eintrag 4"]
+    assert module.history(end=datetime(2000, 1, 1)) == []
+
+
+def test_debug_module_export_snapshot_reuses_lines(
+    tmp_context: ModuleContext, tmp_path: Path
+) -> None:
+    module = DebugModule(context=tmp_context)
+    module.log_event("Eins")
+    module.log_event("Zwei", level="error")
+
+    target = module.export_snapshot(tmp_path / "export" / "snapshot.jsonl")
+    lines = target.read_text(encoding="utf-8").splitlines()
+    assert lines == [line.decode().rstrip("\n") for line in module.buffer.json_lines()]
+    assert module.log_file.read_text(encoding="utf-8").splitlines() == lines
+
+
+def test_debug_module_binary_log_continues_after_torn_tail(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG, log_directory=tmp_path / "logs", log_file_format="binary"
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    module = DebugModule(context=context)
+    for index in range(3):
+        module.log_event(f"Eintrag {index}", source="app")
+    module.close()
+    # Absturz mitten im letzten Datensatz.
+    data = module.log_file.read_bytes()
+    module.log_file.write_bytes(data[:-4])
+
+    reopened = DebugModule(context=context)
+    reopened.log_event("Nach dem Neustart", source="neu")
+    reopened.close()
+    entries = list(decode_binary_log(module.log_file.read_bytes()))
+    assert [(entry.message, entry.source) for entry in entries] == [
+        ("Eintrag 0", "app"),
+        ("Eintrag 1", "app"),
+        ("Nach dem Neustart", "neu"),
+    ]
+
+
+def test_debug_module_binary_log_format(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG,
+        log_directory=tmp_path / "logs",
+        log_file_format="binary",
+        log_rotation_max_bytes=300,
+        log_rotation_max_segments=10,
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    module = DebugModule(context=context)
+    for index in range(30):
+        module.log_event(f"Eintrag {index}", source=f"quelle-{index % 3}")
+    module.close()
+    wait_for_compression()
+
+    assert module.log_file.name == "debug.logb"
+    assert module.log_segments()
+    restored = DebugModule(context=context, max_entries=25)
+    recent = restored.get_recent()
+    assert [entry["message"] for entry in recent] == [
+        f"Eintrag {index}" for index in range(5, 30)
+    ]
+    assert recent[-1]["source"] == "quelle-2"
+    assert len(restored.history(limit=100)) == 30
+    assert restored.history(end=datetime(2000, 1, 1)) == []
+
+    with pytest.raises(ValueError):
+        DebugModule(
+            context=ModuleContext(
+                config=replace(config, log_file_format="xml"),
+                storage_path=tmp_path / "data",
+            )
+        )
+
+
+def test_debug_module_log_handler(tmp_context: ModuleContext) -> None:
+    module = DebugModule(context=tmp_context)
+    logger = logging.getLogger("dashboardtool.tests.debugmodule")
+    logger.propagate = False
+    handler = module.create_log_handler(rate_per_second=1)
+    logger.addHandler(handler)
+    try:
+        logger.error("Dienst antwortet nicht")
+        logger.error("Dienst antwortet nicht")
+    finally:
+        logger.removeHandler(handler)
+
+    recent = module.get_recent()
+    assert recent[-1]["source"] == "dashboardtool.tests.debugmodule"
+    assert recent[-1]["level"] == "error"
+    assert module.render()["status"]["dropped_records"] == 1
+    assert "Dienst antwortet nicht" in module.log_file.read_text(encoding="utf-8")
+
+
+def test_debug_module_coalesces_repeated_messages(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG,
+        log_directory=tmp_path / "logs",
+        log_coalesce_window_seconds=60.0,
+        log_rate_aggregates=True,
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    module = DebugModule(context=context, max_entries=5)
+    module.log_event("Start", source="app")
+    for _ in range(500):
+        module.log_event("DB nicht erreichbar", level="error", source="db")
+    module.log_event("Wieder verbunden", source="db")
+
+    recent = module.get_recent()
+    assert [(entry["message"], entry.get("repeat_count", 1)) for entry in recent] == [
+        ("Start", 1),
+        ("DB nicht erreichbar", 500),
+        ("Wieder verbunden", 1),
+    ]
+    assert module.render()["status"]["coalesced_records"] == 499
+    assert module.rates("1m")["levels"]["error"] == 500
+    module.close()
+
+    lines = module.log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    restored = DebugModule(context=context)
+    assert restored.get_recent()[1]["repeat_count"] == 500
+
+
+def test_debug_module_reads_do_not_close_open_runs(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG,
+        log_directory=tmp_path / "logs",
+        log_coalesce_window_seconds=60.0,
+        log_rate_aggregates=True,
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    module = DebugModule(context=context)
+    for round_number in range(3):
+        for _ in range(10):
+            module.log_event("DB nicht erreichbar", level="error", source="db")
+        version = module.render_version()
+        recent = module.get_recent()
+        assert [entry["repeat_count"] for entry in recent] == [10 * (round_number + 1)]
+        assert module.search("erreichbar", minimum_level="error") == recent
+        assert module.since(0)["pending"] == recent
+        assert module.render_version() == version
+    assert len(module.buffer) == 0
+    module.log_event("DB nicht erreichbar", level="error", source="db")
+    assert module.render_version() != version
+
+    module.close()
+    assert [entry.repeat_count for entry in module.buffer.entries()] == [31]
+
+
+def test_debug_module_writes_open_runs_by_time_and_at_exit(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG,
+        log_directory=tmp_path / "logs",
+        log_coalesce_window_seconds=0.05,
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    module = DebugModule(context=context)
+    module.log_event("Einzige Meldung", source="app")
+    # Ohne Folgemeldung: Der Zeitgeber schreibt die Serie nach dem Fenster aus.
+    deadline = time.monotonic() + 5
+    while not len(module.buffer) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [entry.message for entry in module.buffer.entries()] == ["Einzige Meldung"]
+    module.close()
+
+    # Beim Beenden ohne `close()` geht die offene Serie nicht verloren.
+    script = (
+        "import sys; from dataclasses import replace; from pathlib import Path\n"
+        "import src.dashboardtool as tool\n"
+        "from modules.base import ModuleContext\n"
+        "from modules.debug import DebugModule\n"
+        "folder = Path(sys.argv[1])\n"
+        "config = replace(tool.DEFAULT_CONFIG, log_directory=folder / 'logs',\n"
+        "    log_coalesce_window_seconds=60.0, log_batch_max_lines=100)\n"
+        "module = DebugModule(context=ModuleContext(config=config,\n"
+        "    storage_path=folder / 'data'))\n"
+        "module.log_event('Letzte Worte', source='app')\n"
+    )
+    folder = tmp_path / "exit"
+    subprocess.run(
+        [sys.executable, "-c", script, str(folder)],
+        check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    log_text = (folder / "logs" / "debug.log").read_text(encoding="utf-8")
+    assert "Letzte Worte" in log_text
+
+
+def test_debug_module_export_includes_queued_entries(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG,
+        log_directory=tmp_path / "logs",
+        log_ingestion="background",
+        log_coalesce_window_seconds=60.0,
+    )
+    module = DebugModule(
+        context=ModuleContext(config=config, storage_path=tmp_path / "data")
+    )
+    module.log_event("Gerade eben", source="app")
+
+    exported = module.export_history(tmp_path / "export" / "debug.log")
+    assert "Gerade eben" in exported.read_text(encoding="utf-8")
+    module.close()
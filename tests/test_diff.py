@@ -0,0 +1,52 @@
+import pytest
+
+from src.dashboardtool.diff import (
+    SectionHasher,
+    apply_patch,
+    content_hash,
+    json_patch,
+)
+
+
+def test_json_patch_roundtrip() -> None:
+    old = {
+        "a/b": 1,
+        "list": [1, 2, 3],
+        "nested": {"flag": True, "gone": "x"},
+        "short": [1, 2],
+    }
+    new = {
+        "a/b": 2,
+        "list": [1, 5],
+        "nested": {"flag": 1, "new": [None]},
+        "short": [1, 2, {"k": "v"}],
+        "added": "y",
+    }
+
+    patch = json_patch(old, new)
+
+    assert apply_patch(old, patch) == new
+    assert {"op": "replace", "path": "/a~1b", "value": 2} in patch
+    # True und 1 sind in JSON verschieden.
+    assert {"op": "replace", "path": "/nested/flag", "value": 1} in patch
+    assert json_patch(new, new) == []
+
+
+def test_apply_patch_rejects_unknown_operations() -> None:
+    with pytest.raises(ValueError):
+        apply_patch({}, [{"op": "move", "from": "/a", "path": "/b"}])
+
+
+def test_section_hasher_is_stable_and_reuses_unchanged_objects() -> None:
+    tile = {"id": "notes", "entries": 3}
+    hasher = SectionHasher()
+
+    first = hasher.hashes({"modules": [tile], "header": {"title": "A"}})
+    second = hasher.hashes({"modules": [tile], "header": {"title": "B"}})
+
+    assert first["modules"] == second["modules"]
+    assert first["header"] != second["header"]
+    assert second["header"] == content_hash({"title": "B"})
+    assert SectionHasher().hashes({"modules": [dict(tile)]}) == {
+        "modules": first["modules"]
+    }
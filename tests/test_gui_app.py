@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
@@ -6,6 +10,8 @@ from modules.base import DashboardModule, ModuleContext
 from modules.debug import DebugModule
 from modules.notes import NotesModule
 from src.dashboardtool import DashboardApp
+from src.dashboardtool.autosave import AutosaveScheduler
+from src.dashboardtool.config import DEFAULT_CONFIG
 
 
 @pytest.fixture()
@@ -80,3 +86,174 @@ def test_self_healing_deduplicates_repeated_solutions(
 
     assert sum("Hinweise zur Optimierung" in action for action in actions) == 2
     assert sum("context.config.get_theme" in action for action in actions) == 1
+
+
+def test_dashboard_app_registers_modules_for_autosave(
+    module_context: ModuleContext,
+) -> None:
+    scheduler = AutosaveScheduler(exit_hooks=False)
+    notes = NotesModule(context=module_context)
+    app = DashboardApp([notes, DebugModule(context=module_context)], autosave=scheduler)
+
+    assert notes.autosave_scheduler is scheduler
+    notes.write("id1", "Entwurf")
+    assert app.render()["status"]["autosave"]["unsaved_modules"] == ["notes"]
+    scheduler.flush()
+    assert app.render()["status"]["autosave"]["unsaved_modules"] == []
+
+
+def test_dashboard_app_reuses_unchanged_tiles(tmp_path: Path) -> None:
+    config = replace(
+        DEFAULT_CONFIG, log_rate_aggregates=False, log_directory=tmp_path / "log"
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    notes = NotesModule(context=context)
+    debug = DebugModule(context=context)
+    app = DashboardApp([notes, debug, BrokenModule(context=context)])
+
+    first = app.render()
+    assert first["status"]["tile_cache"] == {"rendered": 3, "reused": 0}
+    second = app.render()
+    # Module ohne render_version() werden immer neu gerendert.
+    assert second["status"]["tile_cache"] == {"rendered": 1, "reused": 2}
+    assert second["modules"][0] is first["modules"][0]
+    assert second["self_healing"] == first["self_healing"]
+
+    notes.write("id1", "neu")
+    debug.log_event("Hallo")
+    third = app.render()
+    assert third["status"]["tile_cache"] == {"rendered": 3, "reused": 0}
+    assert third["modules"][0]["payload"]["notes_index"] == ["id1"]
+    assert third["modules"][1]["payload"]["entries"][-1]["message"] == "Hallo"
+
+    app.invalidate_tiles("notes")
+    assert app.render()["status"]["tile_cache"]["rendered"] == 2
+    uncached = DashboardApp([notes], cache_tiles=False)
+    uncached.render()
+    assert uncached.render()["status"]["tile_cache"] == {"rendered": 1, "reused": 0}
+
+
+class SlowModule(DashboardModule):
+    identifier = "slow"
+    display_name = "Langsames Modul"
+    description = "Wartet auf eine Freigabe"
+    render_deadline_seconds = 0.05
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+        self.calls = 0
+
+    def render(self) -> dict[str, object]:
+        self.calls += 1
+        self.release.wait(5)
+        return {"component": "slow", "title": "Langsam", "calls": self.calls}
+
+
+class AsyncModule(DashboardModule):
+    identifier = "remote"
+    display_name = "Entfernter Status"
+    description = "Rendert asynchron"
+
+    async def render(self) -> dict[str, object]:
+        await asyncio.sleep(0)
+        return {"component": "remote", "title": "Entfernt", "online": True}
+
+
+def test_dashboard_app_threads_fall_back_to_stale_tiles(tmp_path: Path) -> None:
+    config = replace(DEFAULT_CONFIG, dashboard_render_mode="threads")
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    slow = SlowModule(context=context)
+    app = DashboardApp(
+        [NotesModule(context=context), slow, AsyncModule(context=context)],
+        config=config,
+    )
+    try:
+        started = time.perf_counter()
+        first = app.render()
+        assert time.perf_counter() - started < 1.0
+        timings = first["status"]["render"]["modules"]
+        assert timings["slow"]["source"] == "placeholder"
+        assert timings["notes"]["source"] == "rendered"
+        assert first["modules"][1]["stale"] is True
+        assert first["validation"]["stale_modules"] == ["slow"]
+        assert first["modules"][2]["payload"]["online"] is True
+
+        # Der verspätete Aufruf läuft weiter und liefert beim nächsten Mal.
+        slow.release.set()
+        second = app.render()
+        assert second["status"]["render"]["modules"]["slow"]["source"] == "rendered"
+        assert second["validation"]["stale_modules"] == []
+        assert "stale" not in second["modules"][1]
+
+        slow.release.clear()
+        third = app.render()
+        assert third["status"]["render"]["modules"]["slow"]["source"] == "stale"
+        stale_tile = third["modules"][1]
+        assert stale_tile["payload"] == second["modules"][1]["payload"]
+        assert any(
+            "letzte bekannte Stand" in w for w in stale_tile["validation"]["warnings"]
+        )
+        assert third["status"]["tile_cache"]["reused"] == 1  # Notizen unverändert
+    finally:
+        slow.release.set()
+        app.close()
+
+    with pytest.raises(ValueError):
+        DashboardApp([], config=replace(DEFAULT_CONFIG, dashboard_render_mode="x"))
+    # Asynchrones render() funktioniert auch beim Rendern nacheinander.
+    assert DashboardApp([AsyncModule(context=context)]).render()["modules"][0][
+        "payload"
+    ]["online"]
+
+
+class TimeoutModule(DashboardModule):
+    identifier = "timeout"
+    display_name = "Zeitüberschreitung"
+    description = "Meldet selbst eine Zeitüberschreitung"
+
+    def render(self) -> dict[str, object]:
+        raise TimeoutError("Gegenstelle antwortet nicht")
+
+
+def test_dashboard_app_threads_report_module_timeouts_as_errors(
+    tmp_path: Path,
+) -> None:
+    config = replace(DEFAULT_CONFIG, dashboard_render_mode="threads")
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    app = DashboardApp([TimeoutModule(context=context)], config=config)
+    try:
+        # Ein Fehler im Modul, keine verpasste Frist: kein Platzhalter.
+        with pytest.raises(TimeoutError, match="Gegenstelle"):
+            app.render()
+        assert app._inflight == {}
+    finally:
+        app.close()
+
+
+def test_dashboard_app_render_diff(module_context: ModuleContext) -> None:
+    from src.dashboardtool.diff import apply_patch
+
+    notes = NotesModule(context=module_context)
+    app = DashboardApp([notes, DebugModule(context=module_context)])
+
+    first = app.render_diff()
+    assert first["base"] is None
+    assert set(first["sections"]) == set(first["full"])
+
+    notes.write("idee", "Neue Notiz")
+    second = app.render_diff(first["fingerprint"])
+    assert second["base"] == first["fingerprint"]
+    assert "modules" in second["changed_sections"]
+    assert "themes" not in second["changed_sections"]
+    model = apply_patch(first["full"], second["patch"])
+    assert model["modules"][0]["payload"]["notes_index"] == ["idee"]
+
+    third = app.render_diff(second["fingerprint"], style="sections")
+    assert set(third["delta"]) == set(third["changed_sections"])
+    assert "modules" not in third["changed_sections"]
+    assert third["removed_sections"] == []
+
+    assert "full" in app.render_diff("unbekannt")
+    with pytest.raises(ValueError):
+        app.render_diff(style="xml")
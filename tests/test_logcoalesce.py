@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.dashboardtool.logcoalesce import LogCoalescer
+from src.dashboardtool.logging import LogBuffer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_coalescer_folds_consecutive_repeats() -> None:
+    buffer = LogBuffer(max_entries=10)
+    clock = FakeClock()
+    coalescer = LogCoalescer(buffer.add, window_seconds=5, clock=clock)
+    base = datetime(2024, 5, 1, 12, 0)
+
+    for second in range(4):
+        coalescer.submit(
+            "DB nicht erreichbar",
+            level="error",
+            source="db",
+            timestamp=base + timedelta(seconds=second),
+        )
+    assert len(buffer) == 0
+    coalescer.submit("Wieder verbunden", source="db", timestamp=base)
+
+    (run,) = buffer.entries()
+    assert run.repeat_count == 4
+    assert run.first_timestamp == base
+    assert run.timestamp == base + timedelta(seconds=3)
+    assert run.to_dict()["repeat_count"] == 4
+    assert coalescer.folded == 3
+
+    assert coalescer.flush() == 1
+    single = buffer.entries()[-1]
+    assert single.repeat_count == 1
+    assert "repeat_count" not in single.to_dict()
+
+
+def test_coalescer_window_mode_and_timeout() -> None:
+    buffer = LogBuffer(max_entries=10)
+    clock = FakeClock()
+    coalescer = LogCoalescer(
+        buffer.add, window_seconds=5, mode="window", max_pending=2, clock=clock
+    )
+
+    for _ in range(3):
+        coalescer.submit("A", level="warning")
+        coalescer.submit("B", level="warning")
+    assert coalescer.pending == 2
+    coalescer.submit("C")  # verdrängt die älteste Serie
+    assert [(entry.message, entry.repeat_count) for entry in buffer.entries()] == [
+        ("A", 3)
+    ]
+
+    clock.now = 4.0
+    assert coalescer.poll() == 0
+    clock.now = 5.0
+    assert coalescer.poll() == 2
+    assert [(entry.message, entry.repeat_count) for entry in buffer.entries()] == [
+        ("A", 3),
+        ("B", 3),
+        ("C", 1),
+    ]
+    coalescer.submit("D")
+    coalescer.discard()
+    assert coalescer.pending == 0
+    assert len(buffer) == 3
+
+    with pytest.raises(ValueError):
+        LogCoalescer(buffer.add, mode="sometimes")
+    with pytest.raises(ValueError):
+        LogCoalescer(buffer.add, window_seconds=0)
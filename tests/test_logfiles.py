@@ -0,0 +1,144 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.dashboardtool.logfiles import (
+    LogFileWriter,
+    LogRotationPolicy,
+    iter_lines_reversed,
+    iter_log_lines_reversed,
+    list_log_segments,
+    log_created_path,
+    wait_for_compression,
+)
+
+
+def test_iter_lines_reversed_handles_small_chunks(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    lines = [f"Zeile {index} äöü" for index in range(50)]
+    log_file.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+    result = list(iter_lines_reversed(log_file, chunk_size=7))
+
+    assert result == list(reversed(lines))
+
+
+def test_iter_lines_reversed_is_lazy(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    log_file.write_text("erste\nzweite\nletzte", encoding="utf-8")
+
+    iterator = iter_lines_reversed(log_file)
+
+    assert next(iterator) == "letzte"
+    assert next(iterator) == "zweite"
+
+
+def test_log_file_writer_batches_until_limit(tmp_path: Path) -> None:
+    log_file = tmp_path / "logs" / "debug.log"
+    writer = LogFileWriter(log_file, max_batch_lines=3, max_delay_seconds=60)
+
+    writer.write(b"eins\n")
+    writer.write(b"zwei\n")
+    assert not log_file.exists()
+    assert writer.pending_lines == 2
+
+    writer.write(b"drei\n")
+    assert log_file.read_bytes() == b"eins\nzwei\ndrei\n"
+    writer.close()
+
+
+def test_log_file_writer_flushes_by_age_and_on_close(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    now = [0.0]
+    writer = LogFileWriter(
+        log_file, max_batch_lines=100, max_delay_seconds=1.0, clock=lambda: now[0]
+    )
+
+    writer.write(b"alt\n")
+    now[0] = 1.5
+    writer.write(b"neu\n")
+    assert log_file.read_bytes() == b"alt\nneu\n"
+
+    writer.write(b"rest\n")
+    writer.close()
+    assert log_file.read_bytes().endswith(b"rest\n")
+
+
+def test_log_file_writer_flushes_by_deadline_without_next_write(
+    tmp_path: Path,
+) -> None:
+    log_file = tmp_path / "debug.log"
+    writer = LogFileWriter(log_file, max_batch_lines=100, max_delay_seconds=0.05)
+
+    writer.write(b"letzte zeile\n")
+    assert writer.pending_lines == 1
+    deadline = time.monotonic() + 5
+    while writer.pending_lines and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert writer.pending_lines == 0
+    assert log_file.read_bytes() == b"letzte zeile\n"
+    writer.close()
+
+
+def test_log_file_writer_rejects_unknown_durability(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        LogFileWriter(tmp_path / "debug.log", durability="sometimes")
+
+
+def test_log_file_writer_rotates_and_compresses_segments(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    policy = LogRotationPolicy(max_bytes=20, max_segments=2)
+    writer = LogFileWriter(log_file, rotation=policy)
+
+    for index in range(8):
+        writer.write(f"zeile-{index}\n".encode("utf-8"))
+    writer.close()
+    wait_for_compression()
+
+    segments = list_log_segments(log_file)
+    assert len(segments) == 2
+    assert all(segment.suffix == ".gz" for segment in segments)
+    assert log_file.stat().st_size <= 20
+    newest_first = list(iter_log_lines_reversed(log_file))
+    assert newest_first[0] == "zeile-7"
+    assert newest_first == sorted(newest_first, reverse=True)
+
+
+def test_rotation_policy_respects_age() -> None:
+    policy = LogRotationPolicy(max_age_seconds=60)
+    assert not policy.should_rotate(size=10, age_seconds=30, incoming=5)
+    assert policy.should_rotate(size=10, age_seconds=61, incoming=5)
+    assert not policy.should_rotate(size=0, age_seconds=61, incoming=5)
+
+
+def test_log_file_writer_rotates_old_file_after_restart(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    policy = LogRotationPolicy(max_age_seconds=3600, compress=False)
+    writer = LogFileWriter(log_file, rotation=policy)
+    writer.write(b"erster start\n")
+    writer.close()
+    assert log_created_path(log_file).exists()
+    assert list_log_segments(log_file) == []
+
+    # Die Datei wurde vor zwei Tagen angelegt; das Programm startet neu.
+    two_days_ago = time.time() - 2 * 24 * 3600
+    log_created_path(log_file).write_text(repr(two_days_ago), encoding="utf-8")
+    restarted = LogFileWriter(log_file, rotation=policy)
+    restarted.write(b"nach neustart\n")
+    restarted.close()
+
+    segments = list_log_segments(log_file)
+    assert len(segments) == 1
+    assert segments[0].read_bytes() == b"erster start\n"
+    assert log_file.read_bytes() == b"nach neustart\n"
+
+    # Ohne Beidatei zählt das Dateisystem (hier: letzte Änderung).
+    log_created_path(log_file).unlink()
+    os.utime(log_file, (two_days_ago, two_days_ago))
+    again = LogFileWriter(log_file, rotation=policy)
+    again.write(b"dritter start\n")
+    again.close()
+    assert len(list_log_segments(log_file)) == 2
@@ -1,9 +1,21 @@
 import json
+import threading
 from datetime import datetime, timedelta
 
 import pytest
 
-from src.dashboardtool.logging import LOG_LEVELS, LogBuffer
+from src.dashboardtool.logging import (
+    LEVEL_SEVERITY,
+    LOG_BUFFER_LAYOUTS,
+    LOG_LEVELS,
+    BinaryLogEncoder,
+    ColumnarLogBuffer,
+    LogBuffer,
+    LogEntry,
+    LogIngestor,
+    create_log_buffer,
+    decode_binary_log,
+)
 
 
 def test_logbuffer_stores_entries_in_order():
@@ -54,3 +66,239 @@ def test_logbuffer_exports_json_lines():
     loaded = [json.loads(line) for line in exported.splitlines() if line]
     assert loaded[0]["message"] == "A"
     assert loaded[0]["level"] in LOG_LEVELS
+
+
+def test_logbuffer_level_counts_follow_eviction():
+    buffer = LogBuffer(max_entries=3)
+    buffer.add("Fehler", level="error")
+    buffer.add("Info", level="info")
+    buffer.add("Kritisch", level="CRITICAL")
+    buffer.add("Warnung", level="warning")
+
+    assert buffer.count_by_level("error") == 0
+    assert buffer.count_at_least("warning") == 2
+    assert buffer.level_counts()["info"] == 1
+    assert [entry.message for entry in buffer.filter_by_level("warning")] == [
+        "Kritisch",
+        "Warnung",
+    ]
+    assert buffer.entries()[1].severity == LEVEL_SEVERITY["critical"]
+
+
+def test_logbuffer_since_returns_only_new_entries():
+    buffer = LogBuffer(max_entries=3)
+    first = buffer.add("Eins")
+    buffer.add("Zwei")
+
+    feed = buffer.since(first.sequence)
+    assert [entry.message for entry in feed.entries] == ["Zwei"]
+    assert not feed.truncated
+    assert buffer.since(feed.cursor).entries == []
+
+    for message in ("Drei", "Vier", "Fünf", "Sechs"):
+        buffer.add(message)
+    lagging = buffer.since(feed.cursor, limit=2)
+    assert lagging.truncated
+    assert lagging.has_more
+    assert [entry.message for entry in lagging.entries] == ["Vier", "Fünf"]
+    assert [entry.message for entry in buffer.since(lagging.cursor).entries] == [
+        "Sechs"
+    ]
+
+
+def test_columnar_buffer_matches_deque_buffer():
+    reference = LogBuffer(max_entries=4)
+    columnar = ColumnarLogBuffer(max_entries=4)
+    base_time = datetime(2024, 5, 1, 12, 0, 0)
+    for index, level in enumerate(["debug", "error", "info", "warning", "error"]):
+        for buffer in (reference, columnar):
+            buffer.add(
+                f"Meldung {index}",
+                level=level,
+                source=f"quelle-{index % 2}",
+                timestamp=base_time + timedelta(seconds=index),
+            )
+
+    assert columnar.as_dicts() == reference.as_dicts()
+    assert columnar.level_counts() == reference.level_counts()
+    assert [e.sequence for e in columnar.filter_by_level("warning")] == [
+        e.sequence for e in reference.filter_by_level("warning")
+    ]
+    assert columnar.since(3).to_dict() == reference.since(3).to_dict()
+
+    columnar.clear()
+    assert columnar.entries() == []
+    assert columnar.count_at_least("debug") == 0
+
+
+def test_create_log_buffer_rejects_unknown_layout():
+    assert isinstance(create_log_buffer(10, layout="columnar"), ColumnarLogBuffer)
+    with pytest.raises(ValueError):
+        create_log_buffer(10, layout="tree")
+
+
+def test_log_ingestor_handles_many_producer_threads():
+    buffer = ColumnarLogBuffer(max_entries=10_000)
+    written: list[int] = []
+    ingestor = LogIngestor(buffer, sinks=[lambda entry: written.append(entry.sequence)])
+    producers, per_thread = 16, 300
+
+    def produce(worker: int) -> None:
+        for index in range(per_thread):
+            ingestor.submit(f"{worker}:{index}", source=f"worker-{worker}")
+
+    threads = [threading.Thread(target=produce, args=(n,)) for n in range(producers)]
+    for thread in threads:
+        thread.start()
+    snapshots = [len(buffer.entries()) for _ in range(20)]
+    for thread in threads:
+        thread.join()
+    assert ingestor.flush(timeout=10)
+    ingestor.close()
+
+    entries = buffer.entries()
+    assert len(entries) == producers * per_thread
+    assert written == [entry.sequence for entry in entries]
+    assert snapshots == sorted(snapshots)
+    for worker in range(producers):
+        own = [e.message for e in entries if e.source == f"worker-{worker}"]
+        assert own == [f"{worker}:{index}" for index in range(per_thread)]
+    with pytest.raises(RuntimeError):
+        ingestor.submit("zu spät")
+
+
+def test_log_ingestor_survives_failing_buffer_add():
+    buffer = LogBuffer(max_entries=10)
+    ingestor = LogIngestor(buffer)
+    with pytest.raises(ValueError):
+        ingestor.submit("Doppelt", repeat_count=0)
+
+    add = buffer.add
+
+    def failing_add(message: str, **kwargs):
+        if message == "kaputt":
+            raise TypeError("kaputt")
+        return add(message, **kwargs)
+
+    buffer.add = failing_add  # type: ignore[method-assign]
+    ingestor.submit("vorher")
+    ingestor.submit("kaputt")
+    ingestor.submit("nachher")
+    assert ingestor.flush(timeout=5)
+    assert ingestor.running
+    assert [entry.message for entry in buffer.entries()] == ["vorher", "nachher"]
+    assert [str(error) for error in ingestor.take_errors()] == ["kaputt"]
+    ingestor.close()
+
+
+@pytest.mark.parametrize("layout", LOG_BUFFER_LAYOUTS)
+def test_between_handles_late_entries_and_eviction(layout: str) -> None:
+    buffer = create_log_buffer(max_entries=5, layout=layout)
+    base_time = datetime(2024, 5, 1, 14, 0, 0)
+    # Minuten in Einfügereihenfolge; 1 und 2 kommen verspätet an.
+    for minute in (0, 3, 1, 4, 2, 5, 6):
+        buffer.add(f"Minute {minute}", timestamp=base_time + timedelta(minutes=minute))
+
+    def window(start: int, end: int, **kwargs: int) -> list[str]:
+        found = buffer.between(
+            base_time + timedelta(minutes=start),
+            base_time + timedelta(minutes=end),
+            **kwargs,
+        )
+        return [entry.message for entry in found]
+
+    # "Minute 0" und "Minute 3" sind bereits verdrängt.
+    assert window(1, 4) == ["Minute 1", "Minute 4", "Minute 2"]
+    assert window(1, 4, limit=1) == ["Minute 2"]
+    assert window(5, 9) == ["Minute 5", "Minute 6"]
+    assert [e.message for e in buffer.between(end=base_time)] == []
+    assert len(buffer.between()) == 5
+
+    buffer.add("Minute 7", timestamp=base_time + timedelta(minutes=7))
+    buffer.add("Minute 8", timestamp=base_time + timedelta(minutes=8))
+    assert window(0, 9) == ["Minute 2", "Minute 5", "Minute 6", "Minute 7", "Minute 8"]
+    buffer.clear()
+    assert window(0, 9) == []
+
+
+@pytest.mark.parametrize("layout", LOG_BUFFER_LAYOUTS)
+def test_entries_are_serialized_once(layout: str) -> None:
+    buffer = create_log_buffer(max_entries=2, layout=layout)
+    entry = buffer.add("Grüße", level="warning", source="api")
+
+    assert (
+        entry.json_line
+        == (json.dumps(entry.to_dict(), ensure_ascii=False) + "\n").encode()
+    )
+    assert entry.json_line is entry.json_line
+    copy = entry.to_dict()
+    copy["message"] = "verändert"
+    assert entry.to_dict()["message"] == "Grüße"
+
+    first = buffer.json_lines()
+    assert [line is again for line, again in zip(first, buffer.json_lines())] == [True]
+    assert buffer.export_json_lines() == first[0].decode().rstrip("\n")
+    buffer.add("Zwei")
+    buffer.add("Drei")
+    assert [json.loads(line)["message"] for line in buffer.json_lines()] == [
+        "Zwei",
+        "Drei",
+    ]
+
+
+def test_binary_log_round_trip_and_truncated_tail() -> None:
+    encoder = BinaryLogEncoder()
+    moment = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    first = encoder.preamble() + encoder.encode(
+        LogEntry(timestamp=moment, level="error", message="Grüße", source="api")
+    )
+    # Nach einer Rotation erklärt der Dateikopf die bekannte Quelle erneut.
+    second = encoder.preamble() + encoder.encode(
+        LogEntry(timestamp=moment, level="debug", message="Zwei", source="api")
+    )
+
+    decoded = list(decode_binary_log(first))
+    assert decoded == [
+        LogEntry(timestamp=moment, level="error", message="Grüße", source="api")
+    ]
+    assert [entry.message for entry in decode_binary_log(second)] == ["Zwei"]
+    assert [entry.message for entry in decode_binary_log(first + second[:-3])] == [
+        "Grüße"
+    ]
+    assert list(decode_binary_log(b"")) == []
+    with pytest.raises(ValueError):
+        list(decode_binary_log(b'{"level": "info"}\n'))
+
+
+@pytest.mark.parametrize("layout", LOG_BUFFER_LAYOUTS)
+def test_repeat_counts_survive_buffer_and_formats(layout: str) -> None:
+    first = datetime(2024, 5, 1, 12, 0)
+    buffer = create_log_buffer(max_entries=3, layout=layout)
+    buffer.add("Einzeln")
+    run = buffer.add(
+        "Zeitüberschreitung",
+        level="error",
+        source="api",
+        timestamp=first + timedelta(minutes=2),
+        repeat_count=812,
+        first_timestamp=first,
+    )
+
+    stored = buffer.entries()[-1]
+    assert (stored.repeat_count, stored.first_timestamp) == (812, first)
+    assert buffer.entries()[0].repeat_count == 1
+    payload = json.loads(run.json_line)
+    assert payload["repeat_count"] == 812
+    assert payload["first_timestamp"] == first.isoformat()
+    assert LogEntry.from_dict(payload) == run
+
+    encoder = BinaryLogEncoder()
+    data = encoder.preamble() + b"".join(map(encoder.encode, buffer.entries()))
+    assert list(decode_binary_log(data)) == buffer.entries()
+
+    # Das Fach wird beim Überschreiben wieder zu einem einfachen Eintrag.
+    for index in range(3):
+        buffer.add(f"Neu {index}")
+    assert [entry.repeat_count for entry in buffer.entries()] == [1, 1, 1]
+    with pytest.raises(ValueError):
+        buffer.add("Ungültig", repeat_count=0)
@@ -0,0 +1,106 @@
+import logging
+from collections import Counter
+
+import pytest
+
+from src.dashboardtool.logging import LogBuffer
+from src.dashboardtool.loghandler import LogBufferHandler, map_std_level
+
+
+@pytest.fixture
+def bridge_logger():
+    logger = logging.getLogger("dashboardtool.tests.bridge")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+def test_map_std_level() -> None:
+    assert map_std_level(logging.DEBUG) == "debug"
+    assert map_std_level(5) == "debug"
+    assert map_std_level(25) == "info"
+    assert map_std_level(logging.ERROR) == "error"
+    assert map_std_level(90) == "critical"
+
+
+def test_handler_rate_limits_per_logger(bridge_logger: logging.Logger) -> None:
+    buffer = LogBuffer(max_entries=100)
+    now = [0.0]
+    handler = LogBufferHandler(
+        buffer.add,
+        rate_per_second=2,
+        logger_rates={"dashboardtool.tests.bridge.leise": 1},
+        clock=lambda: now[0],
+    )
+    bridge_logger.addHandler(handler)
+    quiet = bridge_logger.getChild("leise")
+
+    for index in range(5):
+        bridge_logger.warning("Verbindung %s abgelaufen", index)
+        quiet.error("Fehler %s", index)
+    now[0] = 1.0
+    bridge_logger.warning("Wieder da")
+
+    messages = [entry.message for entry in buffer.entries()]
+    assert messages == [
+        "Verbindung 0 abgelaufen",
+        "Fehler 0",
+        "Verbindung 1 abgelaufen",
+        "Wieder da",
+    ]
+    assert buffer.entries()[1].source == "dashboardtool.tests.bridge.leise"
+    assert buffer.entries()[1].level == "error"
+    stats = handler.stats()
+    assert stats["accepted"] == 4
+    assert stats["dropped"] == {"rate_limited": 7}
+    assert stats["dropped_by_logger"]["dashboardtool.tests.bridge.leise"] == 4
+
+
+def test_handler_uses_configured_burst_per_logger(
+    bridge_logger: logging.Logger,
+) -> None:
+    buffer = LogBuffer(max_entries=100)
+    handler = LogBufferHandler(
+        buffer.add,
+        rate_per_second=1,
+        burst=3,
+        logger_rates={
+            "dashboardtool.tests.bridge.leise": 1,
+            "dashboardtool.tests.bridge.laut": (1, 6),
+        },
+        clock=lambda: 0.0,
+    )
+    bridge_logger.addHandler(handler)
+
+    for index in range(10):
+        bridge_logger.warning("Haupt %s", index)
+        bridge_logger.getChild("leise").warning("Leise %s", index)
+        bridge_logger.getChild("laut").warning("Laut %s", index)
+
+    counts = Counter(entry.message.split()[0] for entry in buffer.entries())
+    # Ohne eigene Spitze gilt die des Handlers; sonst die des Loggers.
+    assert counts == {"Haupt": 3, "Leise": 3, "Laut": 6}
+
+
+def test_handler_samples_debug_records(bridge_logger: logging.Logger) -> None:
+    buffer = LogBuffer(max_entries=100)
+    draws = iter([0.1, 0.9, 0.2, 0.95])
+    handler = LogBufferHandler(
+        buffer.add, debug_sample_rate=0.5, sample=lambda: next(draws)
+    )
+    bridge_logger.addHandler(handler)
+
+    for index in range(4):
+        bridge_logger.debug("Detail %s", index)
+    bridge_logger.info("Immer übernommen")
+
+    assert [entry.message for entry in buffer.entries()] == [
+        "Detail 0",
+        "Detail 2",
+        "Immer übernommen",
+    ]
+    assert handler.stats()["dropped"] == {"sampled": 2}
+    with pytest.raises(ValueError):
+        LogBufferHandler(buffer.add, debug_sample_rate=2)
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.dashboardtool.logging import LogBuffer, _to_epoch
+from src.dashboardtool.logrates import LogRateAggregator, RateWindow
+
+
+def test_rate_aggregator_counts_per_window_and_expires() -> None:
+    buffer = LogBuffer(max_entries=2)
+    now = datetime(2024, 5, 1, 14, 0, 30)
+    clock = [_to_epoch(now)]
+    rates = LogRateAggregator(buffer, clock=lambda: clock[0])
+
+    buffer.add("Timeout", level="error", source="api", timestamp=now)
+    buffer.add("Timeout", level="error", source="api", timestamp=now)
+    buffer.add("Start", level="info", source="ui", timestamp=now - timedelta(minutes=5))
+    buffer.add("Uralt", level="error", source="api", timestamp=now - timedelta(days=2))
+
+    assert rates.totals("1s")["levels"]["error"] == 2
+    assert rates.totals("1m")["levels"] == {
+        "debug": 0,
+        "info": 1,
+        "warning": 0,
+        "error": 2,
+        "critical": 0,
+    }
+    assert rates.totals("1h")["sources"]["api"]["error"] == 2
+    series = rates.series("1m")
+    assert len(series) == 60
+    assert series[-1]["levels"]["error"] == 2
+    assert series[-6]["levels"]["info"] == 1
+
+    clock[0] += 90
+    assert rates.summary()["1s"]["error"] == 0
+    assert rates.summary()["1m"]["error"] == 2
+    assert "api" not in rates.totals("1s")["sources"]
+
+    buffer.clear()
+    assert rates.totals("1h")["levels"]["error"] == 0
+    with pytest.raises(ValueError):
+        rates.totals("1d")
+
+
+def test_rate_ring_reuses_slots_after_wraparound() -> None:
+    buffer = LogBuffer()
+    start = datetime(2024, 5, 1)
+    clock = [_to_epoch(start)]
+    rates = LogRateAggregator(
+        buffer, windows=(RateWindow("5s", 1, 5),), clock=lambda: clock[0]
+    )
+    for second in range(12):
+        buffer.add("Tick", source="uhr", timestamp=start + timedelta(seconds=second))
+    clock[0] += 11
+    assert rates.totals("5s")["levels"]["info"] == 5
+    assert [point["levels"]["info"] for point in rates.series("5s")] == [1] * 5
+
+
+def test_rate_aggregator_version_changes_only_with_totals() -> None:
+    buffer = LogBuffer()
+    now = datetime(2024, 5, 1, 14, 0, 0)
+    clock = [_to_epoch(now)]
+    rates = LogRateAggregator(
+        buffer, windows=(RateWindow("5s", 1, 5),), clock=lambda: clock[0]
+    )
+    empty = rates.version()
+    clock[0] += 30
+    assert rates.version() == empty
+
+    buffer.add("Tick", source="uhr", timestamp=now + timedelta(seconds=30))
+    added = rates.version()
+    assert added != empty
+    clock[0] += 4
+    assert rates.version() == added
+    clock[0] += 1
+    # Das Fach mit dem Eintrag fällt aus dem Fenster: Die Summen ändern sich.
+    assert rates.version() != added
+    assert rates.totals("5s")["levels"]["info"] == 0
@@ -0,0 +1,114 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.dashboardtool.logfiles import (
+    LogRotationPolicy,
+    log_index_path,
+    rotate_log_file,
+)
+from src.dashboardtool.logscan import (
+    LogTimeIndex,
+    iter_mapped_lines,
+    scan_file_time_range,
+    scan_time_range,
+)
+
+BASE_TIME = datetime(2024, 5, 1, 10, 0, 0)
+
+
+def _write_minutes(path: Path, minutes: range, *, mode: str = "w") -> None:
+    with path.open(mode, encoding="utf-8") as handle:
+        for minute in minutes:
+            stamp = (BASE_TIME + timedelta(minutes=minute)).isoformat()
+            handle.write(
+                json.dumps({"timestamp": stamp, "message": f"Minute {minute}"}) + "\n"
+            )
+
+
+def _minutes(lines: list[str]) -> list[int]:
+    return [int(json.loads(line)["message"].split()[1]) for line in lines]
+
+
+def test_iter_mapped_lines_yields_offsets(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    log_file.write_bytes(b"eins\nzwei\ndrei")
+    assert [(offset, bytes(line)) for offset, line in iter_mapped_lines(log_file)] == [
+        (0, b"eins"),
+        (5, b"zwei"),
+        (10, b"drei"),
+    ]
+    (tmp_path / "leer.log").write_bytes(b"")
+    assert list(iter_mapped_lines(tmp_path / "leer.log")) == []
+
+
+def test_time_index_seeks_and_extends(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    _write_minutes(log_file, range(0, 100))
+    # Ein Nachzügler mitten in der Datei muss trotzdem gefunden werden.
+    _write_minutes(log_file, [5], mode="a")
+    _write_minutes(log_file, range(100, 103), mode="a")
+
+    window = list(
+        scan_file_time_range(
+            log_file,
+            BASE_TIME + timedelta(minutes=4),
+            BASE_TIME + timedelta(minutes=6),
+            stride=8,
+        )
+    )
+    assert _minutes(window) == [4, 5, 6, 5]
+
+    index = LogTimeIndex.load(log_file, stride=8)
+    assert index.blocks == 13
+    # Gelesen werden nur der Block mit Minute 48–55 und der Block mit dem
+    # Nachzügler (Minute 5–103), nicht die Blöcke dazwischen.
+    assert index.byte_ranges(_epoch(50), _epoch(52)) == [
+        (index.offsets[6], index.offsets[7]),
+        (index.offsets[12], index.covered),
+    ]
+    assert len(index.byte_ranges(_epoch(5), _epoch(5))) == 2
+
+    _write_minutes(log_file, range(103, 120), mode="a")
+    late = scan_file_time_range(log_file, BASE_TIME + timedelta(minutes=118), stride=8)
+    assert _minutes(list(late)) == [118, 119]
+    assert LogTimeIndex.load(log_file, stride=8).blocks == 15
+
+
+def test_time_index_rebuilds_for_new_file(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    _write_minutes(log_file, range(0, 40))
+    assert len(list(scan_file_time_range(log_file, stride=4))) == 40
+    assert log_index_path(log_file).exists()
+
+    _write_minutes(log_file, range(200, 240))
+    found = scan_file_time_range(log_file, BASE_TIME + timedelta(minutes=230), stride=4)
+    assert _minutes(list(found))[:2] == [230, 231]
+
+
+def test_scan_time_range_covers_packed_segments(tmp_path: Path) -> None:
+    log_file = tmp_path / "debug.log"
+    _write_minutes(log_file, range(0, 30))
+    segment = rotate_log_file(log_file, LogRotationPolicy(compress=False))
+    with (
+        segment.open("rb") as source,
+        gzip.open(segment.with_name(segment.name + ".gz"), "wb") as packed,
+    ):
+        packed.write(source.read())
+    segment.unlink()
+    _write_minutes(log_file, range(30, 60))
+
+    window = scan_time_range(
+        log_file,
+        BASE_TIME + timedelta(minutes=28),
+        BASE_TIME + timedelta(minutes=31),
+        stride=4,
+    )
+    assert _minutes(list(window)) == [28, 29, 30, 31]
+
+
+def _epoch(minute: int) -> float:
+    return (
+        BASE_TIME + timedelta(minutes=minute) - datetime(1970, 1, 1)
+    ).total_seconds()
@@ -0,0 +1,49 @@
+import pytest
+
+from src.dashboardtool.logging import ColumnarLogBuffer, LogBuffer
+from src.dashboardtool.logsearch import LogSearchIndex, scan_entries
+
+
+@pytest.mark.parametrize("buffer_type", [LogBuffer, ColumnarLogBuffer])
+def test_search_index_supports_terms_prefixes_and_filters(buffer_type) -> None:
+    buffer = buffer_type(max_entries=4)
+    index = LogSearchIndex(buffer)
+    buffer.add("Verbindung timeout req-41", level="warning", source="api")
+    buffer.add("Timeout beim Speichern req-42", level="error", source="db")
+    buffer.add("Alles gut", level="info", source="api")
+    buffer.add("timed out req-43", level="error", source="api")
+
+    def messages(query: str, **filters) -> list[str]:
+        return [entry.message for entry in index.search(query, **filters)]
+
+    assert messages("timeout") == [
+        "Verbindung timeout req-41",
+        "Timeout beim Speichern req-42",
+    ]
+    assert messages("time*") == [
+        "Verbindung timeout req-41",
+        "Timeout beim Speichern req-42",
+        "timed out req-43",
+    ]
+    assert messages("req-42 timeout") == ["Timeout beim Speichern req-42"]
+    assert messages("time* req", minimum_level="error", source="api") == [
+        "timed out req-43"
+    ]
+    assert messages("time*", limit=1) == ["timed out req-43"]
+    for query in ("timeout", "time* req", "gut", "fehlt"):
+        assert index.search(query) == scan_entries(buffer.entries(), query)
+
+
+def test_search_index_forgets_evicted_entries() -> None:
+    buffer = LogBuffer(max_entries=2)
+    index = LogSearchIndex(buffer)
+    buffer.add("einmalig abc123")
+    buffer.add("zwei")
+    buffer.add("drei")
+
+    assert index.search("abc123") == []
+    assert index.search("abc*") == []
+    assert index.vocabulary_size == 2
+
+    buffer.clear()
+    assert index.vocabulary_size == 0
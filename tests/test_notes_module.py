@@ -1,9 +1,15 @@
 import json
+import time
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
+from modules.base import ModuleContext
 from modules.notes import NotesModule
+from src.dashboardtool.autosave import AutosaveScheduler
+from src.dashboardtool.config import DEFAULT_CONFIG
+from src.dashboardtool.notesearch import NoteSearchIndex
 
 
 def test_notes_module_respects_theme():
@@ -47,3 +53,450 @@ def test_notes_module_persists_notes(tmp_path: Path):
 
     second = NotesModule(storage_file=storage_file)
     assert second.read("id1")["content"] == "Inhalt"
+
+
+def test_notes_module_journal_replays_and_compacts(tmp_path: Path):
+    config = replace(
+        DEFAULT_CONFIG, notes_storage="journal", notes_journal_compact_bytes=2_000
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    storage_file = tmp_path / "notes.json"
+    module = NotesModule(storage_file=storage_file, context=context)
+    module.write("a", "erste Fassung")
+    module.write("b", "bleibt")
+    module.write("a", "zweite Fassung")
+    assert module.delete("b") is True
+    assert module.delete("b") is False
+    journal = storage_file.with_name("notes.json.journal")
+    assert not storage_file.exists()
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 4
+
+    module.close()
+
+    # Ein abgebrochener letzter Datensatz wird beim Laden übergangen.
+    with journal.open("a", encoding="utf-8") as handle:
+        handle.write('{"op": "put", "id": "kaputt"')
+    reloaded = NotesModule(storage_file=storage_file, context=context)
+    assert reloaded.list_note_ids() == ["a"]
+    assert reloaded.read("a")["content"] == "zweite Fassung"
+
+    for index in range(40):
+        reloaded.write(f"n{index}", "x" * 40)
+    reloaded.close()
+    snapshot = json.loads(storage_file.read_text(encoding="utf-8"))
+    # Die erste Verdichtung hat den Stand bis dahin in den Schnappschuss gelegt.
+    assert snapshot["a"]["content"] == "zweite Fassung"
+    assert "n0" in snapshot
+    assert not journal.with_name("notes.json.journal.1").exists()
+    again = NotesModule(storage_file=storage_file, context=context)
+    assert len(again.list_note_ids()) == 41
+
+
+def test_journal_compaction_keeps_journal_of_failed_compaction(
+    tmp_path: Path, monkeypatch
+):
+    from src.dashboardtool import storage
+
+    path = tmp_path / "notes.json"
+    store = storage.JournalNoteStore(path)
+    store.load()
+    store.stage("a", {"content": "eins", "timestamp": "2024-01-01T00:00:00"})
+    store.flush()
+
+    def crash(*args, **kwargs):
+        raise OSError("Datenträger voll")
+
+    # Zwei Verdichtungen scheitern beim Schnappschuss (wie bei einem Absturz).
+    monkeypatch.setattr(storage, "write_atomically", crash)
+    store.compact(background=False)
+    previous_journal = path.with_name("notes.json.journal.1")
+    assert previous_journal.exists() and not path.exists()
+    store.stage("b", {"content": "zwei", "timestamp": "2024-01-02T00:00:00"})
+    store.flush()
+    store.compact(background=False)
+    assert len(store.errors) == 2
+    store.close()
+
+    reloaded = storage.JournalNoteStore(path)
+    reloaded.load()
+    assert reloaded.ids() == ["a", "b"]
+
+    monkeypatch.undo()
+    reloaded.compact(background=False)
+    reloaded.close()
+    assert not previous_journal.exists()
+    assert sorted(json.loads(path.read_text(encoding="utf-8"))) == ["a", "b"]
+
+
+def test_notes_module_autosave_scheduler_debounces_changes(tmp_path: Path):
+    clock = [0.0]
+    scheduler = AutosaveScheduler(
+        interval_seconds=60,
+        debounce_seconds=2,
+        max_delay_seconds=5,
+        clock=lambda: clock[0],
+        exit_hooks=False,
+    )
+    storage_file = tmp_path / "notes.json"
+    module = NotesModule(storage_file=storage_file)
+    scheduler.register(module)
+
+    for second in range(4):
+        clock[0] = float(second)
+        module.write("id1", f"Fassung {second}")
+    assert module.dirty and not storage_file.exists()
+    clock[0] = 4.5
+    assert scheduler.run_pending() == 0  # noch innerhalb der Entprellzeit
+    clock[0] = 5.0
+    assert scheduler.run_pending() == 1  # spätestens 5 s nach der ersten Änderung
+    assert json.loads(storage_file.read_text(encoding="utf-8"))["id1"]["content"] == (
+        "Fassung 3"
+    )
+    assert not module.dirty
+
+    # Ohne Änderungen überspringt der Timer das Modul.
+    clock[0] = 61.0
+    assert scheduler.run_pending() == 0
+    assert scheduler.skipped == 1
+    module.delete("id1")
+    assert scheduler.flush() == 1
+    assert json.loads(storage_file.read_text(encoding="utf-8")) == {}
+
+    with pytest.raises(ValueError):
+        AutosaveScheduler(triggers=["sometimes"])
+
+
+def test_autosave_scheduler_thread_and_exit_flush(tmp_path: Path):
+    scheduler = AutosaveScheduler(
+        interval_seconds=3600, debounce_seconds=0.01, exit_hooks=False
+    )
+    module = NotesModule(storage_file=tmp_path / "notes.json")
+    scheduler.register(module)
+    scheduler.start()
+    try:
+        module.write("id1", "Inhalt")
+        deadline = time.monotonic() + 5
+        while module.dirty and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not module.dirty
+    finally:
+        module.write("id2", "beim Beenden")
+        scheduler.stop()
+    assert not scheduler.running
+    saved = json.loads((tmp_path / "notes.json").read_text(encoding="utf-8"))
+    assert sorted(saved) == ["id1", "id2"]
+
+
+def test_autosave_scheduler_restores_foreign_signal_handlers(
+    tmp_path: Path, monkeypatch
+):
+    import signal
+
+    from src.dashboardtool import autosave
+
+    installed = {}
+
+    def fake_signal(signum, handler):
+        # Wie `signal.signal`: None als Handler ist nicht erlaubt, und ohne
+        # Python-Handler liefert der erste Aufruf None.
+        if handler is None:
+            raise TypeError("handler must be callable, SIG_IGN or SIG_DFL")
+        previous = installed.get(signum)
+        installed[signum] = handler
+        return previous
+
+    killed = []
+    monkeypatch.setattr(autosave.signal, "signal", fake_signal)
+    monkeypatch.setattr(autosave.os, "kill", lambda pid, signum: killed.append(signum))
+    scheduler = AutosaveScheduler()
+    module = NotesModule(storage_file=tmp_path / "notes.json")
+    scheduler.register(module)
+    module.write("id1", "Inhalt")
+
+    scheduler._handle_signal(signal.SIGTERM, None)
+    assert installed[signal.SIGTERM] == signal.SIG_DFL
+    assert killed == [signal.SIGTERM]  # Standardverhalten: erneut auslösen
+    saved = json.loads((tmp_path / "notes.json").read_text(encoding="utf-8"))
+    assert sorted(saved) == ["id1"]
+    scheduler.stop()
+
+
+def test_notes_module_sqlite_migrates_and_persists(tmp_path: Path):
+    storage_file = tmp_path / "notes.json"
+    storage_file.write_text(
+        json.dumps(
+            {
+                "alt": {"content": "aus JSON", "timestamp": "2024-01-01T10:00:00"},
+                "neu": {"content": "später", "timestamp": "2024-03-01T08:30:00"},
+            }
+        ),
+        encoding="utf-8",
+    )
+    context = ModuleContext(
+        config=replace(DEFAULT_CONFIG, notes_storage="sqlite"),
+        storage_path=tmp_path / "data",
+    )
+    module = NotesModule(storage_file=storage_file, context=context)
+    assert module.list_note_ids() == ["alt", "neu"]
+    assert module.read("alt")["content"] == "aus JSON"
+    assert module.render()["status"]["last_saved"] == "2024-03-01T08:30:00Z"
+    assert (tmp_path / "notes.db").exists()
+
+    module.write("alt", "überarbeitet")
+    assert module.delete("neu") is True
+    assert module.delete("neu") is False
+    assert "alt" in module.storage and "neu" not in module.storage
+    module.close()
+
+    # Die Migration läuft nur einmal; die JSON-Datei bleibt unverändert.
+    reopened = NotesModule(storage_file=storage_file, context=context)
+    assert reopened.list_note_ids() == ["alt"]
+    assert reopened.read("alt")["content"] == "überarbeitet"
+    assert reopened.render()["status"]["entries"] == 1
+    assert "neu" in json.loads(storage_file.read_text(encoding="utf-8"))
+
+    # Mit Autosave-Planer werden Änderungen vorgemerkt, aber sofort gelesen.
+    scheduler = AutosaveScheduler(exit_hooks=False)
+    scheduler.register(reopened)
+    reopened.write("entwurf", "noch nicht gespeichert")
+    assert reopened.list_note_ids() == ["alt", "entwurf"]
+    assert scheduler.flush() == 1
+    reopened.close()
+    assert NotesModule(storage_file=storage_file, context=context).read("entwurf")
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "sharded"])
+def test_notes_module_migration_leaves_legacy_files_untouched(
+    tmp_path: Path, kind: str
+):
+    storage_file = tmp_path / "notes.json"
+    storage_file.write_text(
+        json.dumps(
+            {
+                "alt": {
+                    "content": "aus dem Schnappschuss",
+                    "timestamp": "2024-01-01T00:00:00",
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    journal = tmp_path / "notes.json.journal"
+    journal.write_text(
+        '{"op": "put", "id": "neu", "content": "aus dem Journal",'
+        ' "timestamp": "2024-02-01T00:00:00"}\n'
+        '{"op": "put", "id": "kaputt"',  # abgebrochener letzter Datensatz
+        encoding="utf-8",
+    )
+    before = {path.name: path.read_bytes() for path in (storage_file, journal)}
+
+    config = replace(DEFAULT_CONFIG, notes_storage=kind, notes_search_index=False)
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    module = NotesModule(storage_file=storage_file, context=context)
+    assert module.list_note_ids() == ["alt", "neu"]
+    module.close()
+
+    assert {path.name: path.read_bytes() for path in (storage_file, journal)} == before
+
+
+def test_notes_module_search_ranks_and_persists_index(tmp_path: Path, monkeypatch):
+    storage_file = tmp_path / "notes.json"
+    module = NotesModule(storage_file=storage_file)
+    module.write("einkauf", "Milch, Brot und Kaffee kaufen")
+    module.write("server", "Netzverbindung zum Server prüfen; Server neu starten")
+    module.write("urlaub", "Urlaub planen, Server-Wartung vorher abklären")
+
+    hits = module.search("server")
+    assert [hit["id"] for hit in hits] == ["server", "urlaub"]
+    assert hits[0]["score"] > hits[1]["score"]
+    start, end = hits[0]["highlights"][0]
+    assert hits[0]["snippet"][start:end] == "Server"
+    # Teilwörter ab drei Zeichen; mehrere Begriffe müssen alle vorkommen.
+    assert [hit["id"] for hit in module.search("verbind")] == ["server"]
+    assert module.search("server kaffee") == []
+    module.write("server", "erledigt")
+    module.delete("einkauf")
+    assert [hit["id"] for hit in module.search("server")] == ["urlaub"]
+    assert module.search("kaffee") == []
+    module.close()
+    assert (tmp_path / "notes.search.json").exists()
+
+    # Beim nächsten Start wird der gespeicherte Index verwendet ...
+    def no_rebuild(self, notes):
+        raise AssertionError("Index sollte nicht neu aufgebaut werden")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(NoteSearchIndex, "rebuild", no_rebuild)
+        reopened = NotesModule(storage_file=storage_file)
+        assert [hit["id"] for hit in reopened.search("wartung")] == ["urlaub"]
+
+    # ... außer die Notizen wurden inzwischen ohne Index geändert.
+    data = json.loads(storage_file.read_text(encoding="utf-8"))
+    data["neu"] = {"content": "Wartung am Freitag", "timestamp": "2030-01-01T00:00:00"}
+    storage_file.write_text(json.dumps(data), encoding="utf-8")
+    fresh = NotesModule(storage_file=storage_file)
+    assert sorted(hit["id"] for hit in fresh.search("wartung")) == ["neu", "urlaub"]
+
+
+def test_notes_module_sharded_store_loads_content_on_demand(tmp_path: Path):
+    storage_file = tmp_path / "notes.json"
+    storage_file.write_text(
+        json.dumps(
+            {
+                f"n{number}": {
+                    "content": f"Inhalt {number}",
+                    "timestamp": f"2024-01-{number + 1:02d}T08:00:00",
+                }
+                for number in range(20)
+            }
+        ),
+        encoding="utf-8",
+    )
+    config = replace(
+        DEFAULT_CONFIG,
+        notes_storage="sharded",
+        notes_shard_count=4,
+        notes_shard_cache=2,
+        notes_search_index=False,
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    NotesModule(storage_file=storage_file, context=context).close()
+    assert (tmp_path / "notes.index.json").exists()
+    assert len(list((tmp_path / "notes.shards").glob("*.json"))) == 4
+
+    module = NotesModule(storage_file=storage_file, context=context)
+    store = module._store
+    # Beim Start nur der Index: Anzahl, Kennungen und Zeitstempel ohne Inhalte.
+    assert store.shard_reads == 0
+    assert module.render()["status"]["entries"] == 20
+    assert module.render()["status"]["last_saved"] == "2024-01-20T08:00:00Z"
+    assert store.size_of("n3") == len("Inhalt 3")
+    assert store.shard_reads == 0
+
+    assert module.read("n3")["content"] == "Inhalt 3"
+    assert store.shard_reads == 1
+    module.read("n3")
+    assert store.shard_reads == 1  # aus dem Cache
+    for note_id in module.list_note_ids():
+        module.read(note_id)
+    # Nur zwei Teildateien bleiben im Speicher; verdrängte werden neu gelesen.
+    assert len(store.cached_shards) == 2 and store.shard_reads >= 4
+
+    # Wird die jüngste Notiz gelöscht, kommt der Zeitstempel der nächsten.
+    assert module.delete("n19") is True
+    module.close()
+    reopened = NotesModule(storage_file=storage_file, context=context)
+    assert reopened.read("n19") is None
+    assert reopened.render()["status"]["last_saved"] == "2024-01-19T08:00:00Z"
+    reopened.write("n3", "geändert")
+    reopened.close()
+    again = NotesModule(storage_file=storage_file, context=context)
+    assert again.read("n3")["content"] == "geändert"
+
+
+def test_notes_module_batch_writes_flush_once(tmp_path: Path, monkeypatch):
+    storage_file = tmp_path / "notes.json"
+    module = NotesModule(storage_file=storage_file)
+    flushes = []
+    original_flush = module._store.flush
+    monkeypatch.setattr(
+        module._store, "flush", lambda: flushes.append(1) or original_flush()
+    )
+
+    assert module.write_many({f"n{number}": f"Import {number}" for number in range(50)})
+    assert len(flushes) == 1
+    saved = json.loads(storage_file.read_text(encoding="utf-8"))
+    assert len(saved) == 50
+    assert len({entry["timestamp"] for entry in saved.values()}) == 1
+    assert module.delete_many(["n1", "n2", "fehlt"]) == 2
+    assert len(flushes) == 2
+
+    with module.transaction():
+        module.write("neu", "im Block")
+        module.delete("n3")
+        assert module.read("neu")["content"] == "im Block"
+        assert "neu" not in json.loads(storage_file.read_text(encoding="utf-8"))
+    assert len(flushes) == 3
+    assert "neu" in json.loads(storage_file.read_text(encoding="utf-8"))
+
+    # Bei einer Ausnahme wird der vorherige Stand wiederhergestellt.
+    with pytest.raises(RuntimeError):
+        with module.transaction():
+            module.write("n0", "überschrieben")
+            module.write("kurz", "gleich wieder weg")
+            module.delete("n4")
+            raise RuntimeError("Abbruch")
+    assert len(flushes) == 3
+    assert module.read("n0")["content"] == "Import 0"
+    assert module.read("kurz") is None and module.read("n4") is not None
+    assert [hit["id"] for hit in module.search("überschrieben")] == []
+    with pytest.raises(ValueError):
+        module.write_many([("", "ohne Kennung")])
+
+
+def test_notes_module_search_index_survives_unclean_exit(tmp_path: Path, monkeypatch):
+    storage_file = tmp_path / "notes.json"
+    config = replace(
+        DEFAULT_CONFIG,
+        notes_storage="sharded",
+        notes_shard_count=16,
+        notes_shard_cache=2,
+    )
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    module = NotesModule(storage_file=storage_file, context=context)
+    module.write_many({f"n{number}": f"Inhalt {number}" for number in range(200)})
+    assert [hit["id"] for hit in module.search("inhalt 7")] == ["n7"]
+    module.write("a", "Apfelkuchen backen")
+    # Kein `close()`: Der Prozess endet einfach.
+
+    def no_rebuild(self, notes):
+        raise AssertionError("Index sollte nicht neu aufgebaut werden")
+
+    def no_scan(self):
+        raise AssertionError("Store sollte nicht ganz gelesen werden")
+
+    monkeypatch.setattr(NoteSearchIndex, "rebuild", no_rebuild)
+    reopened = NotesModule(storage_file=storage_file, context=context)
+    store = reopened._store
+    monkeypatch.setattr(type(store), "items", no_scan)
+    reopened.write("y", "Birnen pflücken")
+    assert store.shard_reads == 1
+    assert reopened.search_index is not None
+    assert not reopened.search_index.loaded
+
+    assert [hit["id"] for hit in reopened.search("apfelkuchen")] == ["a"]
+    assert [hit["id"] for hit in reopened.search("birnen")] == ["y"]
+    assert [hit["id"] for hit in reopened.search("inhalt 12")] == ["n12"]
+    assert store.shard_reads <= 3
+
+
+def test_journal_store_tracks_latest_timestamp_without_scan(
+    tmp_path: Path, monkeypatch
+):
+    storage_file = tmp_path / "notes.json"
+    config = replace(DEFAULT_CONFIG, notes_storage="journal")
+    context = ModuleContext(config=config, storage_path=tmp_path / "data")
+    module = NotesModule(storage_file=storage_file, context=context)
+    module.write_many({f"n{number}": f"Inhalt {number}" for number in range(50)})
+    module.close()
+
+    reopened = NotesModule(storage_file=storage_file, context=context)
+    store = reopened._store
+    scans = []
+    values = type(store.notes).values
+
+    class CountingDict(dict):
+        def values(self):
+            scans.append(1)
+            return values(self)
+
+    store.notes = CountingDict(store.notes)
+    reopened.write("a", "Apfel")
+    reopened.write("b", "Birne")
+    # Höchstens einmal alles durchgehen, danach nur mitführen.
+    assert len(scans) <= 1
+    assert store.latest_timestamp() == store.get("b")["timestamp"]
+
+    reopened.delete("b")
+    assert store.latest_timestamp() == store.get("a")["timestamp"]
+    reopened.close()
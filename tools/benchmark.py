@@ -0,0 +1,662 @@
+"""Kleine Messreihen ("Benchmark": Leistungsmessung) für zeitkritische Pfade.
+
+Aufruf z.B. mit `python -m tools.benchmark log-writer`. Jede Messreihe gibt
+eine kurze Tabelle mit den gemessenen Werten aus.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from src.dashboardtool.logcoalesce import LogCoalescer
+from src.dashboardtool.logfiles import LogFileWriter
+from src.dashboardtool.logging import (
+    LOG_BUFFER_LAYOUTS,
+    BinaryLogEncoder,
+    ColumnarLogBuffer,
+    LogEntry,
+    create_log_buffer,
+    decode_binary_log,
+)
+from src.dashboardtool.logscan import scan_time_range
+from src.dashboardtool.logsearch import LogSearchIndex
+from src.dashboardtool.notesearch import NoteSearchIndex, note_terms
+from src.dashboardtool.storage import NOTE_STORAGE_KINDS, create_note_store
+
+Result = Tuple[str, float, str]
+
+
+def _encode_event(index: int) -> Dict[str, str]:
+    return {
+        "timestamp": datetime.utcnow().replace(microsecond=0).isoformat(),
+        "level": "info",
+        "message": f"Integrationsereignis {index}",
+        "source": "benchmark",
+    }
+
+
+def bench_log_writer(events: int) -> List[Result]:
+    """Vergleicht Einzel-Öffnen pro Ereignis mit dem gepufferten Writer."""
+
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_file = Path(tmp) / "legacy.log"
+        start = time.perf_counter()
+        for index in range(events):
+            legacy_file.parent.mkdir(parents=True, exist_ok=True)
+            with legacy_file.open("a", encoding="utf-8") as handle:
+                handle.write(
+                    json.dumps(_encode_event(index), ensure_ascii=False) + "\n"
+                )
+        elapsed = time.perf_counter() - start
+        results.append(("open-pro-ereignis", events / elapsed, "events/s"))
+
+        variants = (
+            ("writer batch=1 flush", 1, "flush"),
+            ("writer batch=256 flush", 256, "flush"),
+            ("writer batch=256 none", 256, "none"),
+            ("writer batch=256 fsync", 256, "fsync"),
+        )
+        for label, batch, durability in variants:
+            target = Path(tmp) / f"{batch}-{durability}.log"
+            writer = LogFileWriter(target, max_batch_lines=batch, durability=durability)
+            start = time.perf_counter()
+            for index in range(events):
+                line = json.dumps(_encode_event(index), ensure_ascii=False) + "\n"
+                writer.write(line.encode("utf-8"))
+            writer.close()
+            elapsed = time.perf_counter() - start
+            results.append((label, events / elapsed, "events/s"))
+    return results
+
+
+def bench_log_buffer_memory(entries: int) -> List[Result]:
+    """Misst den Speicherbedarf pro Eintrag für beide Puffer-Formen.
+
+    Meldungstexte stammen aus einem festen Vorrat, damit der Vergleich den
+    Verwaltungsaufwand pro Eintrag zeigt und nicht die Textlänge.
+    """
+
+    messages = [f"Verbindung {index} abgelaufen" for index in range(1_000)]
+    sources = [f"integration-{index}" for index in range(16)]
+    levels = ("debug", "info", "warning", "error")
+    base_time = datetime(2024, 1, 1)
+    results: List[Result] = []
+    for layout in LOG_BUFFER_LAYOUTS:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        buffer = create_log_buffer(max_entries=entries, layout=layout)
+        for index in range(entries):
+            buffer.add(
+                messages[index % len(messages)],
+                level=levels[index % len(levels)],
+                source=sources[index % len(sources)],
+                timestamp=base_time + timedelta(microseconds=index),
+            )
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        results.append((layout, used / entries, "bytes/entry"))
+        del buffer
+    return results
+
+
+def bench_log_search(entries: int) -> List[Result]:
+    """Misst die Antwortzeit des Suchindex bei voll gefülltem Puffer."""
+
+    buffer = ColumnarLogBuffer(max_entries=entries)
+    index = LogSearchIndex(buffer)
+    words = ("timeout", "verbindung", "speichern", "cache", "anfrage", "fehler")
+    for number in range(entries):
+        buffer.add(
+            f"{words[number % len(words)]} req-{number} {words[number % 5]}",
+            level="error" if number % 97 == 0 else "info",
+            source=f"integration-{number % 8}",
+        )
+    newest = entries - 1
+    queries = (
+        ("begriff (1 treffer)", f"req-{newest}", {}),
+        ("und-verknüpfung", f"req-{newest} {words[newest % len(words)]}", {}),
+        ("präfix (1 treffer)", f"req-{newest}*", {}),
+        ("begriff + limit 50", "timeout", {"limit": 50}),
+        ("begriff + stufe + limit", "cache", {"minimum_level": "error", "limit": 20}),
+    )
+    results: List[Result] = []
+    repetitions = 200
+    for label, query, filters in queries:
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            index.search(query, **filters)
+        elapsed = time.perf_counter() - start
+        results.append((label, elapsed / repetitions * 1e6, "µs/abfrage"))
+    return results
+
+
+def bench_log_range(entries: int) -> List[Result]:
+    """Vergleicht Zeitraum-Abfragen per Binärsuche mit dem Filtern aller Einträge."""
+
+    base_time = datetime(2024, 1, 1)
+    results: List[Result] = []
+    for layout in LOG_BUFFER_LAYOUTS:
+        buffer = create_log_buffer(max_entries=entries, layout=layout)
+        for index in range(entries):
+            buffer.add(
+                f"Ereignis {index}", timestamp=base_time + timedelta(seconds=index)
+            )
+        start = base_time + timedelta(seconds=entries // 2)
+        end = start + timedelta(seconds=60)
+        repetitions = 20
+        begin = time.perf_counter()
+        for _ in range(repetitions):
+            buffer.between(start, end)
+        elapsed = time.perf_counter() - begin
+        results.append(
+            (
+                f"{layout} between (61 treffer)",
+                elapsed / repetitions * 1e6,
+                "µs/abfrage",
+            )
+        )
+        begin = time.perf_counter()
+        for _ in range(repetitions):
+            [e for e in buffer.entries() if start <= e.timestamp <= end]
+        elapsed = time.perf_counter() - begin
+        results.append(
+            (f"{layout} entries() + filter", elapsed / repetitions * 1e6, "µs/abfrage")
+        )
+    return results
+
+
+def bench_log_history(lines: int) -> List[Result]:
+    """Zeitraum-Abfrage auf einer Logdatei: alles einlesen vs. Zeitindex."""
+
+    base_time = datetime(2024, 1, 1)
+    start = base_time + timedelta(seconds=lines // 2)
+    end = start + timedelta(seconds=900)
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "debug.log"
+        with log_file.open("w", encoding="utf-8") as handle:
+            for index in range(lines):
+                payload = _encode_event(index)
+                payload["timestamp"] = (
+                    base_time + timedelta(seconds=index)
+                ).isoformat()
+                handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+        begin = time.perf_counter()
+        found = [
+            payload
+            for payload in map(json.loads, log_file.read_text("utf-8").splitlines())
+            if start <= datetime.fromisoformat(payload["timestamp"]) <= end
+        ]
+        results.append(
+            ("read_text + splitlines", (time.perf_counter() - begin) * 1e3, "ms")
+        )
+
+        begin = time.perf_counter()
+        indexed = list(scan_time_range(log_file, start, end))
+        results.append(
+            ("zeitindex (erster aufruf)", (time.perf_counter() - begin) * 1e3, "ms")
+        )
+        begin = time.perf_counter()
+        indexed = list(scan_time_range(log_file, start, end))
+        results.append(
+            ("zeitindex (beidatei)", (time.perf_counter() - begin) * 1e3, "ms")
+        )
+        assert len(indexed) == len(found)
+    return results
+
+
+def bench_log_serialize(entries: int) -> List[Result]:
+    """Wiederholtes Rendern und Exportieren: stets neu kodieren vs. Zwischenspeicher."""
+
+    repetitions = 10
+    results: List[Result] = []
+    for layout in LOG_BUFFER_LAYOUTS:
+        buffer = create_log_buffer(max_entries=entries, layout=layout)
+        for index in range(entries):
+            buffer.add(f"Integrationsereignis {index}", source="benchmark")
+
+        begin = time.perf_counter()
+        for _ in range(repetitions):
+            for entry in buffer.entries():
+                payload = {
+                    "timestamp": entry.timestamp.replace(microsecond=0).isoformat(),
+                    "level": entry.level,
+                    "message": entry.message,
+                    "source": entry.source,
+                }
+                json.dumps(payload, ensure_ascii=False)
+        elapsed = time.perf_counter() - begin
+        results.append(
+            (f"{layout} neu kodieren", elapsed / repetitions * 1e3, "ms/export")
+        )
+
+        begin = time.perf_counter()
+        for _ in range(repetitions):
+            buffer.json_lines()
+        elapsed = time.perf_counter() - begin
+        results.append(
+            (f"{layout} json_lines()", elapsed / repetitions * 1e3, "ms/export")
+        )
+    return results
+
+
+def bench_log_formats(entries: int) -> List[Result]:
+    """Einlesen einer Logdatei: JSON-Zeilen vs. Binärformat (Größe und Zeit)."""
+
+    base_time = datetime(2024, 1, 1)
+    encoder = BinaryLogEncoder()
+    sample = [
+        LogEntry(
+            timestamp=base_time + timedelta(seconds=index),
+            level="info",
+            message=f"Integrationsereignis {index}",
+            source=f"integration-{index % 16}",
+        )
+        for index in range(entries)
+    ]
+    json_data = b"".join(entry.json_line for entry in sample)
+    binary_data = encoder.preamble() + b"".join(map(encoder.encode, sample))
+
+    begin = time.perf_counter()
+    for raw in json_data.splitlines():
+        LogEntry.from_dict(json.loads(raw))
+    json_elapsed = time.perf_counter() - begin
+    begin = time.perf_counter()
+    for _ in decode_binary_log(binary_data):
+        pass
+    binary_elapsed = time.perf_counter() - begin
+    return [
+        ("jsonl bytes/eintrag", len(json_data) / entries, "bytes"),
+        ("binär bytes/eintrag", len(binary_data) / entries, "bytes"),
+        ("jsonl einlesen", entries / json_elapsed, "entries/s"),
+        ("binär einlesen", entries / binary_elapsed, "entries/s"),
+    ]
+
+
+def bench_log_coalesce(events: int) -> List[Result]:
+    """Fehlerflut: jede Meldung einzeln vs. zusammengefasste Serien.
+
+    Jede 50. Meldung ist eine andere, so dass Serien regelmäßig enden.
+    """
+
+    base_time = datetime(2024, 1, 1)
+    results: List[Result] = []
+    for label, coalesce in (("einzeln", False), ("zusammengefasst", True)):
+        buffer = create_log_buffer(max_entries=250)
+        written: List[bytes] = []
+
+        def append(message: str, **fields: object) -> None:
+            written.append(buffer.add(message, **fields).json_line)
+
+        coalescer = LogCoalescer(append, window_seconds=60.0)
+        submit = coalescer.submit if coalesce else append
+        start = time.perf_counter()
+        for index in range(events):
+            message = f"Neustart {index}" if index % 50 == 0 else "DB nicht erreichbar"
+            submit(
+                message,
+                level="error",
+                source="db",
+                timestamp=base_time + timedelta(milliseconds=index),
+            )
+        coalescer.flush()
+        elapsed = time.perf_counter() - start
+        results.append((f"{label} meldungen", events / elapsed, "events/s"))
+        results.append((f"{label} zeilen", len(written), "lines"))
+        results.append((f"{label} bytes", sum(len(line) for line in written), "bytes"))
+    return results
+
+
+def bench_notes_save(notes: int) -> List[Result]:
+    """Einzelnes Speichern bei `notes` vorhandenen Notizen je Speicherverfahren."""
+
+    saves = 200
+    timestamp = datetime(2024, 1, 1).isoformat()
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in NOTE_STORAGE_KINDS:
+            store = create_note_store(
+                kind, Path(tmp) / f"{kind}.json", compact_bytes=64 * 1024 * 1024
+            )
+            for index in range(notes):
+                store.stage(
+                    f"notiz-{index}", {"content": "x" * 200, "timestamp": timestamp}
+                )
+            store.flush()
+            start = time.perf_counter()
+            for index in range(saves):
+                store.put(
+                    f"notiz-{index}", {"content": "geändert", "timestamp": timestamp}
+                )
+            elapsed = time.perf_counter() - start
+            store.close()
+            results.append((f"{kind} speichern", elapsed / saves * 1e6, "µs/save"))
+    return results
+
+
+def bench_notes_import(notes: int) -> List[Result]:
+    """Import von `notes` Notizen: einzelnes `write` je Notiz vs. `write_many`.
+
+    Einzelschreiben wächst quadratisch (jedes Speichern schreibt alles neu)
+    und wird daher nur für höchstens 1000 Notizen gemessen.
+    """
+
+    # Erst hier importieren: `modules` setzt das geladene Paket voraus.
+    from modules.base import ModuleContext
+    from modules.notes import NotesModule
+    from src.dashboardtool.config import DEFAULT_CONFIG
+
+    single = min(notes, 1000)
+    contents = {
+        f"notiz-{index}": f"Import {index} " + "x" * 200 for index in range(notes)
+    }
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in NOTE_STORAGE_KINDS:
+            config = replace(DEFAULT_CONFIG, notes_storage=kind)
+            for label, count in (
+                (f"einzeln ({single})", single),
+                ("write_many", notes),
+            ):
+                folder = Path(tmp) / kind / label
+                module = NotesModule(
+                    storage_file=folder / "notes.json",
+                    context=ModuleContext(config=config, storage_path=folder),
+                )
+                batch = dict(list(contents.items())[:count])
+                start = time.perf_counter()
+                if label == "write_many":
+                    module.write_many(batch)
+                else:
+                    for note_id, content in batch.items():
+                        module.write(note_id, content)
+                elapsed = time.perf_counter() - start
+                module.close()
+                results.append((f"{kind} {label}", elapsed / count * 1e6, "µs/notiz"))
+    return results
+
+
+def bench_notes_open(notes: int) -> List[Result]:
+    """Start mit `notes` vorhandenen Notizen: Öffnen und erstes Lesen je Verfahren."""
+
+    timestamp = datetime(2024, 1, 1).isoformat()
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in NOTE_STORAGE_KINDS:
+            path = Path(tmp) / kind / "notes.json"
+            store = create_note_store(kind, path, compact_bytes=64 * 1024 * 1024)
+            store.load()
+            for index in range(notes):
+                store.stage(
+                    f"notiz-{index}", {"content": "x" * 500, "timestamp": timestamp}
+                )
+            store.close()
+            start = time.perf_counter()
+            store = create_note_store(kind, path, compact_bytes=64 * 1024 * 1024)
+            store.load()
+            store.latest_timestamp()
+            len(store)
+            opened = time.perf_counter()
+            store.get(f"notiz-{notes // 2}")
+            read = time.perf_counter()
+            store.close()
+            results.append((f"{kind} öffnen", (opened - start) * 1e3, "ms"))
+            results.append((f"{kind} erstes lesen", (read - opened) * 1e3, "ms"))
+    return results
+
+
+def bench_notes_search(notes: int) -> List[Result]:
+    """Suche über `notes` Notizen: alles durchsuchen vs. Index (inkl. Laden)."""
+
+    words = (
+        "projekt",
+        "besprechung",
+        "netzverbindung",
+        "rechnung",
+        "urlaub",
+        "einkauf",
+        "server",
+        "protokoll",
+        "termin",
+        "entwurf",
+    )
+    contents = {
+        f"notiz-{number}": " ".join(
+            (
+                words[number % len(words)],
+                words[(number * 7 + 3) % len(words)],
+                f"ticket{number}",
+                "notiert am dienstag mit weiteren details",
+            )
+        )
+        for number in range(notes)
+    }
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notes.search.json"
+        start = time.perf_counter()
+        index = NoteSearchIndex(path)
+        index.rebuild(contents.items())
+        results.append(("index aufbauen", (time.perf_counter() - start) * 1e3, "ms"))
+        fingerprint = (notes, None)
+        start = time.perf_counter()
+        index.save(fingerprint)
+        results.append(("index speichern", (time.perf_counter() - start) * 1e3, "ms"))
+        start = time.perf_counter()
+        loaded = NoteSearchIndex(path)
+        assert loaded._load(fingerprint)
+        results.append(("index laden", (time.perf_counter() - start) * 1e3, "ms"))
+        results.append(
+            ("index datei", path.stat().st_size / 1024 / 1024, "MiB"),
+        )
+
+    newest = f"ticket{notes - 1}"
+    start = time.perf_counter()
+    found = [
+        note_id for note_id, text in contents.items() if newest in note_terms(text)
+    ]
+    results.append(("alles durchsuchen", (time.perf_counter() - start) * 1e3, "ms"))
+    assert found
+    queries = (
+        ("begriff (1 treffer)", newest),
+        ("und-verknüpfung", "urlaub rechnung"),
+        ("teilwort", "verbind"),
+        ("häufiger begriff", "dienstag"),
+    )
+    loaded._trigram_index()  # einmaliger Aufbau, nicht Teil der Abfragezeit
+    repetitions = 20
+    for label, query in queries:
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            loaded.search(query, limit=20)
+        elapsed = time.perf_counter() - start
+        results.append((label, elapsed / repetitions * 1e3, "ms/abfrage"))
+    start = time.perf_counter()
+    for number in range(200):
+        note_id = f"notiz-{number}"
+        loaded.update(note_id, "geändert", previous=contents[note_id])
+    results.append(
+        ("index nachführen", (time.perf_counter() - start) / 200 * 1e6, "µs/notiz")
+    )
+    return results
+
+
+def bench_dashboard_render(renders: int) -> List[Result]:
+    """Wiederholtes `DashboardApp.render()` ohne Änderungen: mit/ohne Kachel-Cache."""
+
+    # Erst hier importieren: `modules` setzt das geladene Paket voraus.
+    from modules.base import ModuleContext
+    from modules.debug import DebugModule
+    from modules.notes import NotesModule
+    from src.dashboardtool.config import DEFAULT_CONFIG
+    from src.dashboardtool.gui import DashboardApp
+
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        config = replace(DEFAULT_CONFIG, log_directory=Path(tmp) / "log")
+        context = ModuleContext(config=config, storage_path=Path(tmp))
+        notes = NotesModule(context=context)
+        notes.write_many({f"notiz-{index}": "Inhalt" for index in range(200)})
+        debug = DebugModule(context=context)
+        for index in range(200):
+            debug.log_event(f"Ereignis {index}")
+        for label, cache_tiles in (("ohne cache", False), ("mit cache", True)):
+            app = DashboardApp([notes, debug], cache_tiles=cache_tiles)
+            app.render()
+            start = time.perf_counter()
+            for _ in range(renders):
+                app.render()
+            elapsed = time.perf_counter() - start
+            results.append((label, elapsed / renders * 1e6, "µs/render"))
+        debug.close()
+    return results
+
+
+def bench_dashboard_concurrency(modules: int) -> List[Result]:
+    """`modules` Module mit je 20 ms Wartezeit (z.B. Netz): nacheinander vs. Threads."""
+
+    # Erst hier importieren: `modules` setzt das geladene Paket voraus.
+    from modules.base import DashboardModule, ModuleContext
+    from src.dashboardtool.config import DEFAULT_CONFIG
+    from src.dashboardtool.gui import DashboardApp
+
+    class WaitingModule(DashboardModule):
+        def render(self) -> Dict[str, object]:
+            time.sleep(0.02)
+            return {"component": self.identifier, "title": self.display_name}
+
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("sequential", "threads"):
+            config = replace(
+                DEFAULT_CONFIG,
+                dashboard_render_mode=mode,
+                dashboard_render_workers=modules,
+            )
+            context = ModuleContext(config=config, storage_path=Path(tmp))
+            waiting = []
+            for index in range(modules):
+                module = WaitingModule(context=context)
+                module.identifier = f"modul-{index}"
+                waiting.append(module)
+            app = DashboardApp(waiting, config=config)
+            start = time.perf_counter()
+            app.render()
+            results.append((mode, (time.perf_counter() - start) * 1e3, "ms/render"))
+            app.close()
+    return results
+
+
+def bench_dashboard_diff(notes_count: int) -> List[Result]:
+    """Eine geänderte Notiz: volles Modell vs. `render_diff` (Größe in Bytes)."""
+
+    # Erst hier importieren: `modules` setzt das geladene Paket voraus.
+    from modules.base import ModuleContext
+    from modules.debug import DebugModule
+    from modules.notes import NotesModule
+    from src.dashboardtool.config import DEFAULT_CONFIG
+    from src.dashboardtool.gui import DashboardApp
+
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        config = replace(DEFAULT_CONFIG, log_directory=Path(tmp) / "log")
+        context = ModuleContext(config=config, storage_path=Path(tmp))
+        notes = NotesModule(context=context)
+        notes.write_many({f"notiz-{index}": "Inhalt" for index in range(notes_count)})
+        debug = DebugModule(context=context)
+        app = DashboardApp([notes, debug])
+        fingerprint = app.render_diff()["fingerprint"]
+        notes.write("notiz-neu", "Geändert")
+        start = time.perf_counter()
+        full = app.render()
+        results.append(("render", (time.perf_counter() - start) * 1e3, "ms"))
+        results.append(("volles modell", len(json.dumps(full, default=str)), "bytes"))
+        notes.write("notiz-neu-2", "Geändert")
+        for style in ("patch", "sections"):
+            start = time.perf_counter()
+            diff = app.render_diff(fingerprint, style=style)
+            elapsed = (time.perf_counter() - start) * 1e3
+            results.append((f"render_diff {style}", elapsed, "ms"))
+            body = diff.get("patch", diff.get("delta"))
+            size = len(json.dumps(body, default=str))
+            results.append((f"{style}", size, "bytes"))
+        debug.close()
+    return results
+
+
+def bench_theme_catalog(themes: int) -> List[Result]:
+    """Kontrastprüfung für `themes` zufällige Themes: erster und wiederholter Lauf."""
+
+    from src.dashboardtool.themes import (
+        _accessibility_report,
+        _hex_luminance,
+        validate_theme_catalog,
+    )
+
+    rng = random.Random(7)
+    names = ("background", "surface", "text_primary", "text_secondary")
+    catalog = {
+        f"theme-{index}": {name: f"#{rng.randrange(1 << 24):06x}" for name in names}
+        for index in range(themes)
+    }
+    _accessibility_report.cache_clear()
+    _hex_luminance.cache_clear()
+    results: List[Result] = []
+    for label in ("erster lauf", "wiederholt"):
+        start = time.perf_counter()
+        validate_theme_catalog(catalog)
+        elapsed = time.perf_counter() - start
+        results.append((label, elapsed / themes * 1e6, "µs/theme"))
+    return results
+
+
+SCENARIOS: Dict[str, Callable[[int], List[Result]]] = {
+    "dashboard-concurrency": bench_dashboard_concurrency,
+    "dashboard-diff": bench_dashboard_diff,
+    "dashboard-render": bench_dashboard_render,
+    "log-buffer-memory": bench_log_buffer_memory,
+    "log-coalesce": bench_log_coalesce,
+    "log-formats": bench_log_formats,
+    "log-history": bench_log_history,
+    "log-range": bench_log_range,
+    "log-search": bench_log_search,
+    "log-serialize": bench_log_serialize,
+    "log-writer": bench_log_writer,
+    "notes-import": bench_notes_import,
+    "notes-open": bench_notes_open,
+    "notes-save": bench_notes_save,
+    "notes-search": bench_notes_search,
+    "theme-catalog": bench_theme_catalog,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=20_000,
+        help="Anzahl der Datensätze pro Messung.",
+    )
+    args = parser.parse_args(argv)
+    print(f"Messreihe '{args.scenario}' mit {args.size} Datensätzen:")
+    for label, value, unit in SCENARIOS[args.scenario](args.size):
+        print(f"  {label:<32} {value:>14,.1f} {unit}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Wandelt Logdateien zwischen JSON-Zeilen und dem Binärformat um.
+
+Aufruf z.B. mit `python -m tools.convert_logs to-binary debug.log debug.logb`
+oder umgekehrt mit `to-jsonl`. Gepackte Segmente (`.gz`) werden entpackt
+gelesen; unlesbare JSON-Zeilen werden übersprungen und gezählt.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Tuple
+
+from src.dashboardtool.logfiles import read_log_file
+from src.dashboardtool.logging import BinaryLogEncoder, LogEntry, decode_binary_log
+
+
+def convert_to_binary(source: Path, destination: Path) -> Tuple[int, int]:
+    """Schreibt JSON-Zeilen als Binärdatei; liefert (übernommen, übersprungen)."""
+
+    encoder = BinaryLogEncoder()
+    converted = skipped = 0
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with destination.open("wb") as handle:
+        handle.write(encoder.preamble())
+        for raw in read_log_file(source).splitlines():
+            if not raw.strip():
+                continue
+            try:
+                payload = json.loads(raw)
+                if not isinstance(payload, dict):
+                    raise ValueError("Zeile ist kein JSON-Objekt.")
+                entry = LogEntry.from_dict(payload)
+            except ValueError:
+                skipped += 1
+                continue
+            handle.write(encoder.encode(entry))
+            converted += 1
+    return converted, skipped
+
+
+def convert_to_jsonl(source: Path, destination: Path) -> Tuple[int, int]:
+    """Schreibt eine Binärdatei als JSON-Zeilen; liefert (übernommen, 0)."""
+
+    converted = 0
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with destination.open("wb") as handle:
+        for entry in decode_binary_log(read_log_file(source)):
+            handle.write(entry.json_line)
+            converted += 1
+    return converted, 0
+
+
+CONVERSIONS = {"to-binary": convert_to_binary, "to-jsonl": convert_to_jsonl}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("direction", choices=sorted(CONVERSIONS))
+    parser.add_argument("source", type=Path, help="Zu lesende Logdatei.")
+    parser.add_argument("destination", type=Path, help="Zu schreibende Datei.")
+    args = parser.parse_args(argv)
+    if not args.source.exists():
+        print(f"Datei nicht gefunden: {args.source}", file=sys.stderr)
+        return 1
+    try:
+        converted, skipped = CONVERSIONS[args.direction](args.source, args.destination)
+    except ValueError as exc:
+        print(f"Umwandlung fehlgeschlagen: {exc}", file=sys.stderr)
+        return 1
+    print(f"{converted} Einträge umgewandelt, {skipped} Zeilen übersprungen.")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())